@@ -0,0 +1,29 @@
+"""
+Regressionstest für die Allokationen im eingeschwungenen Zustand (siehe tron_alloc).
+
+Spielt den Referenzfall (BUDGET_PLAYERS Spieler mit zerfallenden Spuren, gezeichnet mit
+dem FrameRenderer des Spiels) und prüft ihn gegen tron_alloc.BUDGETS. Schlägt der Test
+fehl, zeigt `python tron_alloc.py --check` die Aufrufstellen, die mehr anlegen als vorher.
+
+Aufruf: python -m pytest test_tron_alloc.py (oder python -m unittest test_tron_alloc)
+"""
+import unittest
+
+from tron_alloc import (BUDGET_DECAY, BUDGET_PLAYERS, BUDGET_TICKS, BUDGET_WARMUP, BUDGETS, check_budgets,
+                        measure)
+
+
+class AllocationBudgetTest(unittest.TestCase):
+    def test_steady_state_within_budget(self):
+        result = measure(BUDGET_PLAYERS, BUDGET_TICKS, BUDGET_WARMUP, 0, decay=BUDGET_DECAY)
+        self.assertEqual(check_budgets(result), [])
+
+    def test_budget_exceeded(self):
+        """check_budgets meldet jede Überschreitung (hier mit negativen Budgets)."""
+        result = measure(2, 20, 10, 0, render=False, decay=5, sample_every=5)
+        failures = check_budgets(result, {name: -1 for name in BUDGETS})
+        self.assertEqual(len(failures), len(BUDGETS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests für tron_engine: Die Kollisionsprüfung über das SpatialGrid bleibt billig,
+während die Spuren wachsen.
+
+Aufruf: python -m pytest test_tron_engine.py (oder python -m unittest test_tron_engine)
+Die Zeitmessung (test_tick_cost_flat) hängt von der Last der Maschine ab und läuft nur
+mit TRON_TIMING_TESTS=1.
+"""
+import os
+import random
+import unittest
+
+from tron_bench import run_case
+from tron_engine import GameState
+from tron_headless import STEERING, build_players
+
+
+class CollisionCostTest(unittest.TestCase):
+    # Ticks des Matches (rund 7 Minuten bei 15 Ticks pro Sekunde), alle Spieler bleiben am Leben
+    TICKS = 6000
+    PLAYERS = 8
+
+    def test_candidates_independent_of_trail_length(self):
+        """
+        Pro Kopf werden nur die Einträge der Zellen um den Kopf geprüft, nicht alle
+        Trail-Punkte. Gezählt wird die Arbeit statt der Zeit, damit der Test nicht von
+        der Maschine abhängt.
+        """
+        zoom = 0.5
+        width, height = 3840, 2160
+        random.seed(0)
+        rng = random.Random(1)
+        players = build_players(self.PLAYERS, width, height)
+        state = GameState(players, width, height, zoom)
+        steering = [STEERING[0]] * self.PLAYERS
+        candidates = []
+        for _ in range(self.TICKS):
+            for i in range(self.PLAYERS):
+                if rng.random() < 0.1:
+                    steering[i] = rng.choice(STEERING)
+            state.step(steering)
+            n = 0
+            for p in players:
+                p.alive = True
+                n += sum(1 for _ in p.grid.query(p.head, p.circle_size * zoom * 0.8))
+            candidates.append(n / self.PLAYERS)
+        trail_points = sum(len(p.trail) for p in players)
+        late = sum(candidates[-500:]) / 500
+        # Der vollständige Durchlauf prüft alle Punkte, das Gitter nur einen winzigen Bruchteil
+        self.assertGreater(trail_points, 30000)
+        self.assertLess(late, trail_points / 1000)
+
+    @unittest.skipUnless(os.environ.get("TRON_TIMING_TESTS"), "Zeitmessung nur mit TRON_TIMING_TESTS=1")
+    def test_tick_cost_flat(self):
+        """
+        Die Simulationszeit pro Tick (p50) im letzten Viertel des Matches ist höchstens
+        dreimal so hoch wie im ersten, obwohl die Spuren auf ein Vielfaches wachsen
+        (mit dem vollständigen Durchlauf wuchs sie etwa linear mit der Spurlänge).
+        """
+        case = run_case(self.PLAYERS, self.TICKS, 0, render=False)
+        first = case["phases"][0]["sim_ms"]["p50"]
+        last = case["phases"][-1]["sim_ms"]["p50"]
+        self.assertLess(last, 3 * first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+"""
+Tests für tron_resources: Ohne funktionierendes Audiogerät wartet der AudioController
+auf nichts, damit Menü und Endbildschirm im langsamen Leerlauf-Takt bleiben.
+
+Aufruf: python -m pytest test_tron_resources.py (oder python -m unittest test_tron_resources)
+"""
+import unittest
+from unittest import mock
+
+import pygame
+
+from tron_resources import AudioController
+
+
+class AudioWithoutMixerTest(unittest.TestCase):
+    def test_play_without_mixer_not_pending(self):
+        audio = AudioController()
+        with mock.patch.object(audio, "_ensure_mixer", side_effect=pygame.error("kein Audiogerät")):
+            audio.play("theme.mp3", fade_ms=500)
+        self.assertFalse(audio.pending)
+        self.assertIsNone(audio.requested)
+        self.assertEqual(audio.loading, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,383 @@
+"""
+Allokations-Messung für Simulation und Zeichnen (tracemalloc und gc).
+
+Spielt ein geskriptetes Match ohne Fenster (SDL-Dummy-Treiber, Zufallsbots wie in
+tron_bench) und zeichnet jedes Frame mit dem FrameRenderer aus game_loop: Trail-Ebene,
+Köpfe mit Kopfbild, Statusleiste und Timer. Nach einer Aufwärmphase (Caches gefüllt,
+Puffer angelegt) wird im eingeschwungenen Zustand gemessen:
+
+  - GC-Pausen je Generation (Anzahl, Summe, Maximum) über gc.callbacks, ohne tracemalloc,
+    damit dessen Aufwand die Pausen nicht verfälscht.
+  - Danach mit tracemalloc, getrennt für Tick (Simulation) und Frame (Zeichnen):
+    Snapshots vor und nach jeder Phase ergeben pro Aufrufstelle, wie viel die Phase
+    angelegt hat (neue Blöcke, die das Ende der Phase erleben, z. B. Tupel, die erst im
+    nächsten Tick ersetzt werden) und wie viel davon dauerhaft bleibt (angelegt minus
+    freigegeben). Weil ein Snapshot teuer ist, geschieht das nur in jedem
+    'sample_every'-ten Tick. Was innerhalb der Phase angelegt und wieder freigegeben
+    wird, zeigt der Spitzenbedarf der Phase über dem Stand davor (in jedem Tick).
+  - Der dauerhaft hinzugekommene Speicher pro Tick über das ganze Messfenster.
+
+tracemalloc sieht nur Speicher, den Python anlegt; Pixel von Surfaces holt SDL selbst.
+Die Python-Hüllen (Surface-, Rect-Objekte) werden aber mitgezählt.
+
+Mit --check wird der Referenzfall (BUDGET_PLAYERS Spieler, zerfallende Spuren) gegen
+BUDGETS geprüft; bei Überschreitung endet das Skript mit Exit-Code 1. Derselbe Fall
+läuft als Test in test_tron_alloc.py.
+
+    python tron_alloc.py --players 8 --decay
+    python tron_alloc.py --check
+"""
+import os
+
+# Muss vor dem Import von pygame gesetzt sein
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from tron_bench import load_game_module, percentiles
+from tron_engine import BLOCK_SIZE, DECAY_LENGTH, GameState
+from tron_headless import STEERING, build_players
+
+# Referenzfall für --check und test_tron_alloc.py: mit zerfallenden Spuren bleibt der
+# Speicher im eingeschwungenen Zustand konstant, jeder Zuwachs ist also eine Regression
+BUDGET_PLAYERS = 8
+BUDGET_DECAY = DECAY_LENGTH
+BUDGET_TICKS = 1500
+# Bis die Spuren ihre volle Länge erreicht haben
+BUDGET_WARMUP = BUDGET_DECAY + 100
+# Budgets in Bytes, etwa das Doppelte der höchsten Messung über mehrere Seeds
+# (angelegt ca. 250-450 B pro Tick und 650-700 B pro Frame, dauerhaft 55-130 B pro Tick,
+# Spitze p99 ca. 38 kB, meist vom Umkopieren eines Trail-Puffers):
+#   tick_allocated  - von der Simulation angelegt, pro Tick
+#   frame_allocated - vom Zeichnen angelegt, pro Frame
+#   retained        - dauerhaft hinzugekommen (Tick und Frame zusammen), pro Tick
+#   peak            - Spitzenbedarf innerhalb von Tick und Frame zusammen (p99)
+BUDGETS = {
+    "tick_allocated": 1024,
+    "frame_allocated": 1536,
+    "retained": 256,
+    "peak": 65536,
+}
+PHASES = ("tick", "frame")
+# Eigene Daten dieses Skripts und tracemalloc selbst (Snapshots) nicht mitzählen
+IGNORED_FILES = {os.path.abspath(__file__), tracemalloc.__file__}
+
+
+class GCWatch:
+    """Misst die Dauer jeder Garbage Collection je Generation über gc.callbacks."""
+    def __init__(self):
+        self.pauses = {0: [], 1: [], 2: []}
+        self.started = None
+
+    def __enter__(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self._callback)
+        return False
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+        elif self.started is not None:
+            self.pauses[info["generation"]].append(time.perf_counter() - self.started)
+            self.started = None
+
+    def summary(self, ticks):
+        """Je Generation: Anzahl, Läufe pro 1000 Ticks, Summe und Maximum in Millisekunden."""
+        result = {}
+        for gen, pauses in self.pauses.items():
+            result[gen] = {
+                "count": len(pauses),
+                "per_1000_ticks": len(pauses) * 1000 / ticks,
+                "total_ms": sum(pauses) * 1000,
+                "max_ms": max(pauses) * 1000 if pauses else 0.0,
+            }
+        return result
+
+
+class Match:
+    """
+    Ein geskriptetes Match, gezeichnet wie in game_loop (ohne Kamera, Eingaben und Overlays).
+    tick() führt einen Simulationsschritt aus, frame() zeichnet ein Frame.
+    """
+    def __init__(self, num_players, seed, width=1920, height=1080, zoom=0.5, snake_width=10,
+                 turn_speed=0.2, turn_chance=0.1, speed=15, render=True, decay=None):
+        game = load_game_module()
+        self.turn_chance = turn_chance
+        self.speed = speed
+        random.seed(seed)
+        self.rng = random.Random(seed + 1)
+        world_width = width / zoom
+        world_height = height / zoom
+        self.players = build_players(num_players, int(world_width), int(world_height), snake_width, turn_speed)
+        for i, p in enumerate(self.players):
+            p.color = game.COLORS[i % len(game.COLORS)]
+        self.state = GameState(self.players, world_width, world_height, zoom, decay=decay)
+        self.steering = [STEERING[0]] * num_players
+        self.prev_heads = [(p.head[0], p.head[1]) for p in self.players]
+        self.renderer = None
+        if render:
+            pygame.display.init()
+            pygame.font.init()
+            screen = pygame.display.set_mode((width, height))
+            # Wie in init_players bekommt der erste Spieler das Kopfbild
+            self.players[0].head_image = game.load_image("bike.png", (int(BLOCK_SIZE * 5), int(BLOCK_SIZE * 5)))
+            self.renderer = game.FrameRenderer(screen, self.players, world_width, world_height, zoom,
+                                               game.load_font("Arial", 30))
+
+    def tick(self):
+        players = self.players
+        for i, p in enumerate(players):
+            self.prev_heads[i] = (p.head[0], p.head[1])
+        rng = self.rng
+        steering = self.steering
+        for i in range(len(steering)):
+            if rng.random() < self.turn_chance:
+                steering[i] = rng.choice(STEERING)
+        self.state.step(steering)
+        # Alle bleiben am Leben, damit das Match beliebig lange läuft
+        for p in players:
+            p.alive = True
+
+    def frame(self):
+        renderer = self.renderer
+        if renderer is None:
+            return
+        players = self.players
+        renderer.draw_trails(players, None)
+        # Köpfe mitten zwischen zwei Ticks, wie bei einer Bildrate über der Tickrate
+        drawn_rects = renderer.draw_heads(players, self.prev_heads, 0.5)
+        drawn_rects.append(renderer.draw_status_bar(players, self.state.tick / self.speed))
+        renderer.present(drawn_rects)
+
+
+def _usage():
+    """
+    Belegter Speicher pro Aufrufstelle: {(Datei, Zeile): (Bytes, Blöcke)}. Schneller als
+    Snapshot.filter_traces() und compare_to(), die bei jedem Aufruf alle Traces durchgehen.
+    """
+    usage = {}
+    for stat in tracemalloc.take_snapshot().statistics("lineno"):
+        frame = stat.traceback[0]
+        if frame.filename not in IGNORED_FILES:
+            usage[(frame.filename, frame.lineno)] = (stat.size, stat.count)
+    return usage
+
+
+def _accumulate(sites, before, after):
+    """Addiert pro Aufrufstelle auf, was zwischen zwei _usage()-Ständen angelegt und freigegeben wurde."""
+    for key in before.keys() | after.keys():
+        size0, count0 = before.get(key, (0, 0))
+        size1, count1 = after.get(key, (0, 0))
+        if size0 == size1 and count0 == count1:
+            continue
+        entry = sites.get(key)
+        if entry is None:
+            # angelegte Bytes, angelegte Blöcke, freigegebene Bytes, freigegebene Blöcke
+            entry = sites[key] = [0, 0, 0, 0]
+        if size1 > size0:
+            entry[0] += size1 - size0
+        else:
+            entry[2] += size0 - size1
+        if count1 > count0:
+            entry[1] += count1 - count0
+        else:
+            entry[3] += count0 - count1
+
+
+def _phase_report(sites, retained, peaks, samples, ticks, top):
+    """
+    Werte einer Phase: angelegt pro Lauf aus den 'samples' Läufen mit Snapshots ('sites'),
+    dauerhaft pro Tick aus dem ganzen Messfenster ('retained': Aufrufstelle -> Bytes).
+    Die Aufrufstellen sind nach der Summe aus beidem sortiert.
+    """
+    def weight(key):
+        return sites.get(key, (0,))[0] / samples + abs(retained.get(key, 0)) / ticks
+
+    ranked = sorted(sites.keys() | retained.keys(), key=weight, reverse=True)[:top]
+    return {
+        "allocated_bytes": sum(e[0] for e in sites.values()) / samples,
+        "allocated_blocks": sum(e[1] for e in sites.values()) / samples,
+        "retained_bytes": sum(retained.values()) / ticks,
+        "peak_bytes": percentiles(peaks, scale=1),
+        "sites": [{
+            "site": f"{os.path.basename(key[0])}:{key[1]}",
+            "allocated_bytes": sites.get(key, (0,))[0] / samples,
+            "allocated_blocks": sites.get(key, (0, 0))[1] / samples,
+            "retained_bytes": retained.get(key, 0) / ticks,
+        } for key in ranked if weight(key) > 0],
+    }
+
+
+def measure(num_players, ticks, warmup, seed, zoom=0.5, render=True, decay=None, top=10, sample_every=50):
+    """
+    Führt die Abschnitte (Aufwärmen, GC-Messung, Aufwärmen und Messung mit tracemalloc)
+    nacheinander im selben Match aus, jeweils mit einem Frame pro Tick. Alle Werte im
+    Ergebnis sind pro Tick bzw. pro Frame. Was angelegt wird, stammt aus jedem
+    'sample_every'-ten Tick; was dauerhaft bleibt, aus dem ganzen Messfenster, und zählt
+    bei der Phase, die an der Aufrufstelle am meisten anlegt.
+    """
+    match = Match(num_players, seed, zoom=zoom, render=render, decay=decay)
+    for _ in range(warmup):
+        match.tick()
+        match.frame()
+
+    gc.collect()
+    with GCWatch() as watch:
+        for _ in range(ticks):
+            match.tick()
+            match.frame()
+    gc_stats = watch.summary(ticks)
+
+    runs = {"tick": match.tick, "frame": match.frame}
+    sites = {name: {} for name in PHASES}
+    # Vorab angelegt, damit das Füllen nichts allokiert
+    peaks = {name: [0] * ticks for name in PHASES}
+    tracemalloc.start()
+    # Noch einmal aufwärmen: erst danach sind alle lebenden Objekte, die im Lauf ersetzt
+    # werden (z. B. abgelaufene Spurstücke), selbst erfasst. Sonst zählt ihr Ersatz als Zuwachs.
+    for _ in range(warmup):
+        match.tick()
+        match.frame()
+    gc.collect()
+    start = _usage()
+    samples = 0
+    for k in range(ticks):
+        sampled = k % sample_every == 0
+        if sampled:
+            usage = _usage()
+            samples += 1
+        for name in PHASES:
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            runs[name]()
+            peaks[name][k] = tracemalloc.get_traced_memory()[1] - current
+            if sampled:
+                after = _usage()
+                _accumulate(sites[name], usage, after)
+                usage = after
+    gc.collect()
+    end = _usage()
+    tracemalloc.stop()
+    window = {}
+    _accumulate(window, start, end)
+    retained = {name: {} for name in PHASES}
+    for key, e in window.items():
+        allocated = {name: sites[name].get(key, (0,))[0] for name in PHASES}
+        owner = max(PHASES, key=allocated.get)
+        if allocated[owner] > 0:
+            retained[owner][key] = e[0] - e[2]
+
+    phases = {name: _phase_report(sites[name], retained[name], peaks[name], samples, ticks, top)
+              for name in PHASES}
+    combined_peaks = [t + f for t, f in zip(peaks["tick"], peaks["frame"])]
+    return {
+        "players": num_players,
+        "ticks": ticks,
+        "warmup": warmup,
+        "seed": seed,
+        "render": render,
+        "decay": decay,
+        "trail_points": sum(len(p.trail) for p in match.players),
+        "retained_bytes_per_tick": sum(e[0] - e[2] for e in window.values()) / ticks,
+        "peak_bytes": percentiles(combined_peaks, scale=1),
+        "phases": phases,
+        "gc": gc_stats,
+    }
+
+
+def print_result(r):
+    print(f"{r['players']} Spieler, {r['ticks']} Ticks nach {r['warmup']} Ticks Aufwärmen"
+          f"{', Zerfall ' + str(r['decay']) if r['decay'] else ''}:")
+    print(f"  Dauerhaft: {r['retained_bytes_per_tick']:.1f} Bytes pro Tick")
+    labels = {"tick": "Tick (Simulation)", "frame": "Frame (Zeichnen)"}
+    for name in PHASES:
+        ph = r["phases"][name]
+        if name == "frame" and not r["render"]:
+            continue
+        peak = ph["peak_bytes"]
+        print(f"  {labels[name]}: angelegt {ph['allocated_bytes']:.1f} B / {ph['allocated_blocks']:.2f} Blöcke, "
+              f"dauerhaft {ph['retained_bytes']:.1f} B, Spitze p50 {peak['p50']} B p99 {peak['p99']} B "
+              f"max {peak['max']} B")
+        for s in ph["sites"]:
+            print(f"    angelegt {s['allocated_bytes']:9.1f} B {s['allocated_blocks']:7.2f} Blöcke, "
+                  f"dauerhaft {s['retained_bytes']:9.1f} B  {s['site']}")
+    for gen, g in r["gc"].items():
+        print(f"  GC Generation {gen}: {g['count']} Läufe ({g['per_1000_ticks']:.1f} pro 1000 Ticks), "
+              f"Summe {g['total_ms']:.2f} ms, max {g['max_ms']:.3f} ms")
+
+
+def check_budgets(r, budgets=BUDGETS):
+    """Gibt die Liste der überschrittenen Budgets zurück (leer, wenn alles passt)."""
+    values = {
+        "tick_allocated": r["phases"]["tick"]["allocated_bytes"],
+        "frame_allocated": r["phases"]["frame"]["allocated_bytes"],
+        "retained": r["retained_bytes_per_tick"],
+        "peak": r["peak_bytes"]["p99"],
+    }
+    return [f"{name}: {values[name]:.1f} B > Budget {limit} B"
+            for name, limit in budgets.items() if values[name] > limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Allokationen pro Tick und Frame messen (tracemalloc, gc)")
+    parser.add_argument("--players", type=int, default=BUDGET_PLAYERS)
+    parser.add_argument("--ticks", type=int, default=BUDGET_TICKS, help="Ticks pro Messabschnitt")
+    parser.add_argument("--warmup", type=int, default=None,
+                        help="Ticks vor der Messung (Standard: Zerfallslänge + 100 bzw. 500)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zoom", type=float, default=0.5)
+    parser.add_argument("--no-render", action="store_true", help="Nur die Simulation messen")
+    parser.add_argument("--decay", type=int, nargs="?", const=DECAY_LENGTH, default=None, metavar="PUNKTE",
+                        help=f"Zerfallende Spuren mit höchstens PUNKTE Punkten (Standard {DECAY_LENGTH})")
+    parser.add_argument("--sample-every", type=int, default=50,
+                        help="Aufrufstellen nur in jedem N-ten Tick erfassen (Snapshots sind teuer)")
+    parser.add_argument("--top", type=int, default=10, help="Anzahl der ausgegebenen Aufrufstellen pro Phase")
+    parser.add_argument("--check", action="store_true",
+                        help=f"Referenzfall ({BUDGET_PLAYERS} Spieler, Zerfall {BUDGET_DECAY}, {BUDGET_TICKS} Ticks) "
+                             "messen und gegen BUDGETS prüfen; Exit-Code 1 bei Überschreitung")
+    parser.add_argument("--out", help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+    if args.check:
+        # Die Budgets gelten nur für den Referenzfall (ein kürzeres Messfenster schwankt stärker)
+        args.players = BUDGET_PLAYERS
+        args.decay = BUDGET_DECAY
+        args.ticks = BUDGET_TICKS
+        args.warmup = BUDGET_WARMUP
+        args.zoom = 0.5
+        args.no_render = False
+    if args.decay is not None and args.decay < 1:
+        parser.error("--decay braucht mindestens 1 Punkt")
+
+    # Mit Zerfall erst messen, wenn die Spuren ihre volle Länge erreicht haben
+    warmup = args.warmup if args.warmup is not None else (args.decay + 100 if args.decay else 500)
+    result = measure(args.players, args.ticks, warmup, args.seed, zoom=args.zoom,
+                     render=not args.no_render, decay=args.decay, top=args.top,
+                     sample_every=args.sample_every)
+    print_result(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.check:
+        failures = check_budgets(result)
+        for failure in failures:
+            print(f"Budget überschritten: {failure}")
+        if failures:
+            sys.exit(1)
+        print("Budgets eingehalten")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Reproduzierbare Benchmarks für Simulation und Darstellung.
+
+Spielt geskriptete Matches (feste Seeds, Zufallsbots wie in tron_headless) mit
+unterschiedlich vielen Spielern und misst pro Tick die Simulationszeit
+(GameState.step) und pro Frame die Renderzeit (Trail-Ebene, Köpfe, Übertragung
+auf den Bildschirm). Zusätzlich wird in festen Abständen der komplette Trail mit
+draw_snake_line neu gezeichnet, um dessen Wachstum mit der Matchlänge zu zeigen.
+
+Jeder Fall läuft in einem eigenen Prozess (für eine saubere Spitzen-Speichermessung)
+mit dem SDL-Dummy-Treiber. Die Ergebnisse werden als JSON geschrieben und können
+mit --compare gegen eine frühere Messung (z. B. eines anderen Commits) verglichen werden.
+
+Beispiel:
+    python tron_bench.py --players 2 8 32 64 --out bench.json
+    python tron_bench.py --quick --compare bench.json
+"""
+import os
+
+# Muss vor dem Import von pygame gesetzt sein (auch in den Kind-Prozessen)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from tron_engine import DECAY_LENGTH, GAME_DURATION, GameState
+from tron_headless import STEERING, build_players
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Meta-Felder, die ein Lauf mit der Vergleichsdatei gemeinsam haben muss
+COMPARE_MODES = ("zoom", "batch", "simplify", "world_scale", "decay")
+
+
+def load_game_module():
+    """Lädt tron_v0.7.py als Modul (der Dateiname ist kein gültiger Modulname)."""
+    spec = importlib.util.spec_from_file_location("tron_game", os.path.join(HERE, "tron_v0.7.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentiles(samples, scale=1000):
+    """
+    p50/p90/p99/max/Mittelwert einer Liste von Sekunden, in Millisekunden. Mit 'scale'
+    werden die Werte anders umgerechnet (z. B. scale=1 für Bytes unverändert).
+    """
+    if not samples:
+        return None
+    s = sorted(samples)
+    n = len(s)
+
+    def pct(q):
+        return s[min(n - 1, int(q * n))] * scale
+
+    return {
+        "p50": pct(0.50),
+        "p90": pct(0.90),
+        "p99": pct(0.99),
+        "max": s[-1] * scale,
+        "mean": sum(s) / n * scale,
+    }
+
+
+def run_case(num_players, ticks, seed, width=1920, height=1080, zoom=0.5, snake_width=10,
+             turn_speed=0.2, turn_chance=0.1, phases=4, full_redraw_every=500, render=True, batch=False,
+             simplify=False, world_scale=1.0, decay=None):
+    """
+    Führt einen Benchmark-Fall aus. Alle Spieler bleiben am Leben (die Kollisionsprüfung
+    läuft trotzdem), damit die Spuren die volle Länge erreichen.
+
+    Die Startpositionen werden über die ganze Welt verteilt. Beim Standard-Zoom 0.5 (die
+    größte Welt, die das Menü erlaubt) finden so auch 64 Spieler Platz mit MIN_DISTANCE.
+
+    Mit 'world_scale' > 1 ist die Welt größer als der Bildschirm; gezeichnet wird dann
+    wie im Spiel über die Kamera, die dem ersten Spieler folgt (nur sichtbare Spurblöcke).
+
+    Mit 'decay' zerfallen die Spuren (siehe GameState); Zeiten und Speicher sollten dann
+    über alle Abschnitte gleich bleiben.
+    """
+    import pygame
+
+    game = load_game_module() if render else None
+    if render:
+        pygame.display.init()
+        screen = pygame.display.set_mode((width, height))
+
+    random.seed(seed)
+    rng = random.Random(seed + 1)
+    world_width = width * world_scale / zoom
+    world_height = height * world_scale / zoom
+    players = build_players(num_players, int(world_width), int(world_height), snake_width, turn_speed)
+    for i, p in enumerate(players):
+        p.color = game.COLORS[i % len(game.COLORS)] if render else None
+    state = GameState(players, world_width, world_height, zoom, batch=batch, simplify=simplify, decay=decay)
+    steering = [STEERING[0]] * num_players
+    if render:
+        camera = game.Camera((width, height), world_width, world_height, zoom)
+        layer = game.TrailLayer((width, height), zoom)
+        layer.rebuild(players)
+
+    sim_times = []
+    render_times = []
+    full_redraw_times = []
+    deaths = 0
+    perf = time.perf_counter
+    for tick in range(ticks):
+        for i in range(num_players):
+            if rng.random() < turn_chance:
+                steering[i] = rng.choice(STEERING)
+
+        t0 = perf()
+        state.step(steering)
+        sim_times.append(perf() - t0)
+        for p in players:
+            if not p.alive:
+                deaths += 1
+                p.alive = True
+
+        if render:
+            t0 = perf()
+            if camera.scrolls:
+                camera.follow(*players[0].head)
+                screen.fill(game.BLACK)
+                for view in camera.views():
+                    for p in players:
+                        game.draw_snake_line(screen, p, zoom, view)
+                for p in players:
+                    for pos in camera.to_screen(p.head[0], p.head[1], p.circle_size * 2):
+                        pygame.draw.circle(screen, p.color, pos, int(p.circle_size * zoom))
+            else:
+                rects = layer.update(players)
+                screen.blit(layer.surface, (0, 0))
+                for p in players:
+                    rects.append(pygame.draw.circle(screen, p.color, (int(p.head[0] * zoom), int(p.head[1] * zoom)),
+                                                    int(p.circle_size * zoom)))
+            pygame.display.flip()
+            render_times.append(perf() - t0)
+
+            if full_redraw_every and tick % full_redraw_every == full_redraw_every - 1:
+                t0 = perf()
+                for p in players:
+                    game.draw_snake_line(screen, p, zoom)
+                full_redraw_times.append(perf() - t0)
+
+    # Verlauf über die Matchlänge: Perzentile je Abschnitt
+    phase_stats = []
+    step = max(1, ticks // phases)
+    for k in range(0, ticks, step):
+        phase_stats.append({
+            "from_tick": k,
+            "sim_ms": percentiles(sim_times[k:k + step]),
+            "render_ms": percentiles(render_times[k:k + step]),
+        })
+
+    peak_rss_kb = None
+    if resource is not None:
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if platform.system() == "Darwin":
+            peak_rss_kb //= 1024  # macOS liefert Bytes
+    return {
+        "players": num_players,
+        "ticks": ticks,
+        "seed": seed,
+        "batch": state.arrays is not None,
+        "simplify": simplify,
+        "world_scale": world_scale,
+        "decay": decay,
+        "trail_points": sum(len(p.trail) for p in players),
+        "collisions": deaths,
+        "sim_ms": percentiles(sim_times),
+        "render_ms": percentiles(render_times),
+        "full_redraw_ms": percentiles(full_redraw_times),
+        "phases": phase_stats,
+        "peak_rss_kb": peak_rss_kb,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """
+    Gibt je Fall das Verhältnis neu/alt der p50- und p99-Zeiten aus. Läufe mit
+    unterschiedlichem Modus (COMPARE_MODES) werden nicht verglichen.
+    """
+    differing = [key for key in COMPARE_MODES if old["meta"].get(key) != new["meta"].get(key)]
+    if differing:
+        print(f"Kein Vergleich mit {old['meta'].get('commit')}: anderer Modus ("
+              + ", ".join(f"{key} {old['meta'].get(key)} -> {new['meta'].get(key)}" for key in differing) + ")")
+        return
+    old_cases = {(c["players"], c["ticks"], c["seed"]): c for c in old["cases"]}
+    print(f"Vergleich mit {old['meta'].get('commit')} (neu/alt, < 1 ist schneller):")
+    for c in new["cases"]:
+        o = old_cases.get((c["players"], c["ticks"], c["seed"]))
+        if o is None:
+            continue
+        parts = []
+        for key in ("sim_ms", "render_ms", "full_redraw_ms"):
+            if c[key] and o[key]:
+                parts.append(f"{key} p50 {c[key]['p50'] / o[key]['p50']:.2f}x p99 {c[key]['p99'] / o[key]['p99']:.2f}x")
+        print(f"  {c['players']:3d} Spieler: " + ", ".join(parts))
+
+
+def print_case(c):
+    sim = c["sim_ms"]
+    line = f"{c['players']:3d} Spieler, {c['ticks']} Ticks: Sim p50 {sim['p50']:.3f} ms p99 {sim['p99']:.3f} ms"
+    if c["render_ms"]:
+        r = c["render_ms"]
+        line += f" | Render p50 {r['p50']:.3f} ms p99 {r['p99']:.3f} ms"
+    if c["full_redraw_ms"]:
+        line += f" | draw_snake_line max {c['full_redraw_ms']['max']:.1f} ms"
+    if c["peak_rss_kb"]:
+        line += f" | Speicher {c['peak_rss_kb'] / 1024:.0f} MB"
+    print(line)
+    for ph in c["phases"]:
+        r = ph["render_ms"]["p50"] if ph["render_ms"] else float("nan")
+        print(f"      ab Tick {ph['from_tick']:6d}: Sim p50 {ph['sim_ms']['p50']:.3f} ms, Render p50 {r:.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark für Tick- und Renderkosten")
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 8, 32, 64])
+    parser.add_argument("--speed", type=int, default=15,
+                        help="Ticks pro Sekunde; zusammen mit GAME_DURATION ergibt das die Matchlänge")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="Ticks pro Fall (Standard: ein volles Match, GAME_DURATION * speed)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zoom", type=float, default=0.5)
+    parser.add_argument("--no-render", action="store_true", help="Nur die Simulation messen")
+    parser.add_argument("--batch", action="store_true", help="Vektorisierten Tick (NumPy) messen")
+    parser.add_argument("--simplify", action="store_true", help="Vereinfachte Spuren (Linienzüge) messen")
+    parser.add_argument("--world-scale", type=float, default=1.0,
+                        help="Welt so viel größer als der Bildschirm (Zeichnen über die Kamera)")
+    parser.add_argument("--decay", type=int, nargs="?", const=DECAY_LENGTH, default=None, metavar="PUNKTE",
+                        help=f"Zerfallende Spuren mit höchstens PUNKTE Punkten (Standard {DECAY_LENGTH})")
+    parser.add_argument("--quick", action="store_true", help="Kurzer Lauf (1000 Ticks)")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--compare", help="Frühere Ergebnisdatei zum Vergleich")
+    args = parser.parse_args(argv)
+
+    ticks = args.ticks or (1000 if args.quick else GAME_DURATION * args.speed)
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ticks": ticks,
+            "seed": args.seed,
+            "zoom": args.zoom,
+            "batch": args.batch,
+            "simplify": args.simplify,
+            "world_scale": args.world_scale,
+            "decay": args.decay,
+        },
+        "cases": [],
+    }
+    ctx = multiprocessing.get_context("spawn")
+    for n in args.players:
+        # Eigener Prozess pro Fall, damit die Spitzen-Speichermessung nicht von früheren Fällen stammt
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            case = pool.submit(run_case, n, ticks, args.seed, zoom=args.zoom,
+                               render=not args.no_render, batch=args.batch,
+                               simplify=args.simplify, world_scale=args.world_scale,
+                               decay=args.decay).result()
+        results["cases"].append(case)
+        print_case(case)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Ergebnisse gespeichert in {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
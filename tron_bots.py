@@ -0,0 +1,257 @@
+"""
+Computergesteuerte Spieler für Tron (ohne pygame).
+
+Bots sind normale Player-Objekte mit control_type "bot". Der BotPlanner setzt vor
+jedem Simulations-Tick ihre turn_left/turn_right-Flags, die Simulation selbst
+behandelt sie wie menschliche Spieler (und die Aufzeichnung speichert ihre Eingaben).
+
+Entscheidung pro Tick: Für jede der drei Aktionen (geradeaus, links, rechts) wird der
+Weg einige Ticks vorausberechnet und wie in der Simulation gegen die Trail-Punkte
+geprüft. Wer den Horizont überlebt, wird zusätzlich nach der freien Fläche am Ende
+bewertet (Flood-Fill auf einem groben Belegungsgitter aller Spuren). Der Horizont wird schrittweise vergrößert, solange das
+Zeitbudget reicht; läuft es ab, gilt das Ergebnis der letzten vollständigen Runde.
+"""
+import math
+import time
+from array import array
+from collections import deque
+
+from tron_engine import BLOCK_SIZE
+
+# Rechenzeit pro Bot und Tick (Sekunden) und Obergrenze für alle Bots zusammen
+BOT_BUDGET = 0.001
+TOTAL_BUDGET = 0.005
+# Horizonte (in Ticks) der schrittweisen Vertiefung
+HORIZONS = (4, 8, 16, 32)
+# So viele Ticks wird eine Drehung im Voraus gehalten, danach geht es geradeaus weiter
+TURN_TICKS = 6
+# Per Flood-Fill werden höchstens AREA_PER_TICK * Horizont Zellen gezählt. So bleibt die
+# erste Runde billig, und erst längere Horizonte schauen sich größere Flächen an.
+AREA_PER_TICK = 8
+# Aktionen: (turn_left, turn_right); geradeaus zuerst, damit es bei Gleichstand gewinnt
+ACTIONS = ((False, False), (True, False), (False, True))
+
+
+class OccupancyGrid:
+    """
+    Belegungsgitter über die Spielwelt mit einer Zelle pro BLOCK_SIZE. Neue Trail-Punkte
+    werden pro Tick nachgetragen (wie bei der TrailLayer nur das neue Stück).
+
+    Ein Punkt belegt alle Zellen, die sein Kollisionskreis ('margin') berührt. Ein Kopf in
+    einer freien Zelle kann so auch keinen Punkt aus einer Nachbarzelle treffen.
+
+    Jede Zelle zählt die Punkte, die sie belegen. Im Zerfallsmodus (GameState(decay=...))
+    werden abgelaufene Punkte so wieder ausgetragen, ohne fremde Belegung zu löschen.
+    """
+    def __init__(self, world_width, world_height, margin=0.0, cell_size=BLOCK_SIZE):
+        self.cell_size = cell_size
+        self.margin = margin
+        self.cols = max(1, math.ceil(world_width / cell_size))
+        self.rows = max(1, math.ceil(world_height / cell_size))
+        self.cells = array("H", bytes(2 * self.cols * self.rows))
+        self.seen = {}  # Spieler -> (absoluter Index nach dem letzten eingetragenen Punkt, letzter Punkt)
+        self.points = {}  # Spieler -> eingetragene, noch nicht abgelaufene Punkte (nur Zerfallsmodus)
+
+    def cell(self, x, y):
+        return (int(x // self.cell_size) % self.cols) + (int(y // self.cell_size) % self.rows) * self.cols
+
+    def mark(self, x, y, amount=1):
+        cs = self.cell_size
+        m = self.margin
+        cols = self.cols
+        rows = self.rows
+        for cy in range(int((y - m) // cs), int((y + m) // cs) + 1):
+            row = (cy % rows) * cols
+            for cx in range(int((x - m) // cs), int((x + m) // cs) + 1):
+                self.cells[row + cx % cols] += amount
+
+    def mark_line(self, x0, y0, x1, y1):
+        """Markiert die Zellen entlang einer Strecke (Schritte von einer halben Zelle)."""
+        pieces = max(1, math.ceil(math.hypot(x1 - x0, y1 - y0) * 2 / self.cell_size))
+        for k in range(1, pieces + 1):
+            self.mark(x0 + (x1 - x0) * k / pieces, y0 + (y1 - y0) * k / pieces)
+
+    def update(self, players):
+        for p in players:
+            trail = p.trail
+            c = trail.coords()
+            first = trail.offset
+            count, last = self.seen.get(p, (0, None))
+            if trail.tolerance is None:
+                points = None
+                if trail.limit is not None:
+                    points = self.points.setdefault(p, deque())
+                    # Der vorderste Punkt hat den absoluten Index count - len(points)
+                    while points and count - len(points) < first:
+                        x, y = points.popleft()
+                        self.mark(x, y, -1)
+                for i in range(2 * max(0, count - first), len(c), 2):
+                    self.mark(c[i], c[i + 1])
+                    if points is not None:
+                        points.append((c[i], c[i + 1]))
+            else:
+                # Vereinfachte Spur: der letzte Punkt kann sich seitdem verschoben haben,
+                # markiert wird der Weg vom zuletzt gesehenen Punkt aus
+                for i in range(max(0, count - 1), len(c) // 2):
+                    x = c[2 * i]
+                    y = c[2 * i + 1]
+                    if last is None or trail.run_start(i):
+                        self.mark(x, y)
+                    else:
+                        self.mark_line(last[0], last[1], x, y)
+                    last = (x, y)
+            self.seen[p] = (first + len(c) // 2, last)
+
+    def free_area(self, start, limit, deadline, blocked):
+        """
+        Zählt die von 'start' aus erreichbaren freien Zellen (4er-Nachbarschaft, mit Wrap),
+        höchstens 'limit'. Gibt None zurück, wenn dabei die Deadline überschritten wird.
+        """
+        cells = self.cells
+        cols = self.cols
+        size = len(cells)
+        visited = {start}
+        queue = deque([start])
+        count = 0
+        while queue and count < limit:
+            if count & 31 == 0 and time.perf_counter() > deadline:
+                return None
+            idx = queue.popleft()
+            count += 1
+            col = idx % cols
+            for n in (idx - col + (col + 1) % cols, idx - col + (col - 1) % cols,
+                      (idx + cols) % size, (idx - cols) % size):
+                if n not in visited and not cells[n] and n not in blocked:
+                    visited.add(n)
+                    queue.append(n)
+        return count
+
+
+class BotBrain:
+    """Lookahead-Suche für einen Bot-Spieler."""
+    def __init__(self, player):
+        self.player = player
+        self.choice = ACTIONS[0]
+
+    def simulate(self, action, horizon, state, others, deadline):
+        """
+        Fährt 'horizon' Ticks mit 'action' (TURN_TICKS lang gehalten) voraus, mit derselben
+        Bewegung und demselben Wrap wie Player.update_position. Jede Position wird wie in
+        Player.check_collision gegen das Kollisionsgitter des GameState geprüft, die Köpfe
+        der anderen Spieler zählen als zusätzliche Punkte.
+        Gibt die Zahl der überlebten Ticks und die Liste der Positionen zurück,
+        oder None, wenn dabei die Deadline überschritten wird.
+        """
+        p = self.player
+        left, right = action
+        angle = p.angle
+        x, y = p.head
+        world_width = state.world_width
+        world_height = state.world_height
+        radius = p.circle_size * state.zoom * 0.8
+        collides = state.grid.collides
+        hypot = math.hypot
+        path = []
+        for step in range(horizon):
+            if step & 7 == 7 and time.perf_counter() > deadline:
+                return None
+            if step < TURN_TICKS:
+                if left:
+                    angle -= p.turn_speed
+                if right:
+                    angle += p.turn_speed
+            x += BLOCK_SIZE * math.cos(angle)
+            y += BLOCK_SIZE * math.sin(angle)
+            if x >= world_width:
+                x = 0
+            elif x < 0:
+                x = world_width - BLOCK_SIZE
+            if y >= world_height:
+                y = 0
+            elif y < 0:
+                y = world_height - BLOCK_SIZE
+            if collides(x, y, radius, p):
+                return step, path
+            for hx, hy in others:
+                if hypot(x - hx, y - hy) < radius + BLOCK_SIZE:
+                    return step, path
+            path.append((x, y))
+        return horizon, path
+
+    def decide(self, state, grid, deadline, others):
+        """
+        Bewertet alle Aktionen mit wachsendem Horizont, bis die Deadline erreicht ist.
+        Gibt die beste Aktion der letzten vollständig bewerteten Runde zurück.
+        """
+        best = self.choice
+        for horizon in HORIZONS:
+            scores = []
+            limit = AREA_PER_TICK * horizon
+            for action in ACTIONS:
+                if time.perf_counter() > deadline:
+                    return best
+                result = self.simulate(action, horizon, state, others, deadline)
+                if result is None:
+                    return best
+                survived, path = result
+                area = 0
+                if survived == horizon:
+                    # Freie Fläche am Ende des Weges; der eigene Weg und fremde Köpfe sind dabei belegt
+                    blocked = {grid.cell(x, y) for x, y in path[:-1]}
+                    blocked.update(grid.cell(x, y) for x, y in others)
+                    area = grid.free_area(grid.cell(*path[-1]), limit, deadline, blocked)
+                    if area is None:
+                        return best
+                scores.append(((survived, area), action))
+            best = max(scores, key=lambda item: item[0])[1]
+            # Alle Aktionen bis zum Horizont frei und mit genug Platz: weitere Runden ändern nichts mehr
+            if all(score == (horizon, limit) for score, _ in scores):
+                break
+        return best
+
+
+class BotPlanner:
+    """
+    Steuert alle Bots eines Matches. update() vor jedem GameState.step() aufrufen.
+
+    Das Budget pro Bot wird so begrenzt, dass alle Bots zusammen höchstens
+    'total_budget' Sekunden pro Tick rechnen, egal wie viele mitspielen. Ist das
+    Gesamtbudget trotzdem erschöpft, behalten die restlichen Bots ihre letzte
+    Entscheidung; die Reihenfolge der Bots wechselt jeden Tick.
+    """
+    def __init__(self, state, bot_budget=BOT_BUDGET, total_budget=TOTAL_BUDGET):
+        self.state = state
+        # Größter Kollisionsradius aller Spieler (wie in Player.check_collision)
+        margin = max(p.circle_size for p in state.players) * state.zoom * 0.8
+        self.grid = OccupancyGrid(state.world_width, state.world_height, margin)
+        self.brains = [BotBrain(p) for p in state.players if p.control_type == "bot"]
+        self.bot_budget = bot_budget
+        self.total_budget = total_budget
+        self.first = 0
+
+    def update(self, total_budget=None):
+        """
+        Setzt die Lenk-Flags aller Bots für den nächsten Tick.
+
+        :param total_budget: Gesamtbudget für diesen Tick (Sekunden), z. B. kleiner, wenn der
+                             Game-Loop in einem Frame mehrere Ticks nachholen muss.
+        """
+        if total_budget is None:
+            total_budget = self.total_budget
+        state = self.state
+        self.grid.update(state.players)
+        heads = [p for p in state.players if p.alive]
+        brains = self.brains
+        if not brains:
+            return
+        self.first = (self.first + 1) % len(brains)
+        budget = min(self.bot_budget, total_budget / len(brains))
+        tick_deadline = time.perf_counter() + total_budget
+        for brain in brains[self.first:] + brains[:self.first]:
+            p = brain.player
+            if not p.alive:
+                continue
+            others = [(o.head[0], o.head[1]) for o in heads if o is not p]
+            deadline = min(time.perf_counter() + budget, tick_deadline)
+            brain.choice = brain.decide(state, self.grid, deadline, others)
+            p.turn_left, p.turn_right = brain.choice
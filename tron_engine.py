@@ -0,0 +1,1096 @@
+"""
+Spiellogik von Tron ohne pygame-Abhängigkeit.
+
+Enthält Spieler, Spurspeicher, Kollisionsgitter und den GameState, der pro
+step() einen Simulations-Tick ausführt. Die pygame-Oberfläche (tron_v0.7.py)
+und der Headless-Runner (tron_headless.py) steuern beide diese Klassen.
+"""
+import random
+import math
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional, ohne läuft die Simulation nur skalar
+    np = None
+
+BLOCK_SIZE = 20
+MIN_DISTANCE = 200
+# Untergrenze, auf die MIN_DISTANCE bei vielen Spielern in einer kleinen Welt verringert wird
+MIN_START_DISTANCE = 4 * BLOCK_SIZE
+GAME_DURATION = 15 * 60
+# Zulässige Abweichung vereinfachter Spuren, als Anteil des kleinsten Kollisionsradius
+SIMPLIFY_TOLERANCE = 0.1
+# Auflösung der Lenkstärke: turn_left/turn_right als Anteil eines Ticks in 1/INPUT_STEPS
+INPUT_STEPS = 8
+# Punkte pro Block einer Spur, für den jeweils ein umschließendes Rechteck geführt wird
+TRAIL_CHUNK = 64
+# Standardlänge (in Trail-Punkten, also etwa Ticks) der Spuren im Zerfallsmodus
+DECAY_LENGTH = 300
+
+
+# --- Räumliches Gitter (für die Kollisionsprüfung) ---
+class SpatialGrid:
+    """
+    Gleichmäßiges Gitter über die Spielwelt, in dem alle Trail-Punkte einsortiert werden.
+    Ein Kopf muss so nur die Zellen in seinem Kollisionsradius prüfen statt aller Punkte.
+    Die Zellindizes werden modulo der Gittergröße gebildet, passend zum Wrap-Around der Welt.
+
+    Für Snapshots (GameState.snapshot()) führt das Gitter ab dem ersten mark() ein
+    Journal der Zellen, an die etwas angehängt wurde; rewind() nimmt die Einträge seit
+    einer Marke in umgekehrter Reihenfolge wieder heraus.
+    """
+    def __init__(self, world_width, world_height, cell_size=BLOCK_SIZE):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(world_width / cell_size))
+        self.rows = max(1, math.ceil(world_height / cell_size))
+        self.cells = {}
+        self.journal = None  # Zellen (Listen) in der Reihenfolge der Einträge, erst nach mark()
+
+    def add(self, x, y, owner):
+        key = (int(x // self.cell_size) % self.cols, int(y // self.cell_size) % self.rows)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            bucket = self.cells[key] = [(x, y, owner)]
+        else:
+            bucket.append((x, y, owner))
+        if self.journal is not None:
+            self.journal.append(bucket)
+
+    def mark(self):
+        """Marke für rewind(); schaltet beim ersten Aufruf das Journal ein."""
+        if self.journal is None:
+            self.journal = []
+        return len(self.journal)
+
+    def rewind(self, mark):
+        """Entfernt alle Einträge, die seit mark() hinzugekommen sind."""
+        journal = self.journal
+        while len(journal) > mark:
+            journal.pop().pop()
+
+    def remove(self, x, y, owner):
+        """
+        Entfernt den Eintrag (x, y, owner), z. B. einen abgelaufenen Trail-Punkt im
+        Zerfallsmodus. Der Aufwand hängt nur von der Belegung der einen Zelle ab.
+        Nicht zusammen mit mark()/rewind() verwendbar (das Journal setzt voraus, dass
+        Einträge nur angehängt werden). Leere Zellen werden entfernt, damit das Gitter
+        mit zerfallenden Spuren nicht über das ganze Spielfeld anwächst.
+        """
+        key = (int(x // self.cell_size) % self.cols, int(y // self.cell_size) % self.rows)
+        bucket = self.cells[key]
+        bucket.remove((x, y, owner))
+        if not bucket:
+            del self.cells[key]
+
+    def query(self, pos, radius):
+        """
+        Liefert alle (x, y, Besitzer)-Einträge aus den Zellen, die der Kreis um 'pos'
+        mit 'radius' berührt. Die exakte Abstandsprüfung macht der Aufrufer.
+        """
+        cs = self.cell_size
+        x0 = int((pos[0] - radius) // cs)
+        x1 = int((pos[0] + radius) // cs)
+        y0 = int((pos[1] - radius) // cs)
+        y1 = int((pos[1] + radius) // cs)
+        seen = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                key = (cx % self.cols, cy % self.rows)
+                if key in seen:
+                    continue
+                seen.add(key)
+                bucket = self.cells.get(key)
+                if bucket:
+                    yield from bucket
+
+    def add_trail(self, owner):
+        """Trägt alle bisherigen Punkte von owner.trail ein."""
+        for x, y in owner.trail:
+            self.add(x, y, owner)
+
+    def collides(self, x, y, radius, player):
+        """
+        True, wenn ein Trail-Punkt näher als 'radius' an (x, y) liegt. Spuren toter
+        Gegner zählen nicht, die eigene Spur von 'player' schon.
+        """
+        # math.hypot(dx, dy) liefert bitgleich dasselbe wie math.dist(head, punkt)
+        for px, py, owner in self.query((x, y), radius):
+            if (owner is player or owner.alive) and math.hypot(x - px, y - py) < radius:
+                return True
+        return False
+
+
+def segment_distance(x, y, x0, y0, x1, y1, steps):
+    """
+    Abstand von (x, y) zum nächsten der steps + 1 gleichmäßig verteilten Punkte auf der
+    Strecke (x0, y0)-(x1, y1). Das sind die Trail-Punkte, die die Strecke ersetzt; der
+    nächste davon ist der mit der nächstgelegenen Projektion auf die Strecke.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    length2 = dx * dx + dy * dy
+    if length2 > 0 and steps > 0:
+        t = ((x - x0) * dx + (y - y0) * dy) / length2
+        if t >= 1:
+            x0 = x1
+            y0 = y1
+        elif t > 0:
+            k = round(t * steps)
+            if k == steps:
+                x0 = x1
+                y0 = y1
+            elif k > 0:
+                x0 += dx * k / steps
+                y0 += dy * k / steps
+    return math.hypot(x - x0, y - y0)
+
+
+class SegmentGrid(SpatialGrid):
+    """
+    Kollisionsgitter für vereinfachte Spuren (Trail mit 'tolerance'). Statt Punkten
+    liegen Strecken [x0, y0, x1, y1, steps, Besitzer] in den Zellen; eine Strecke, die
+    beim Verschmelzen länger wird, wird in den neu überstrichenen Zellen nachgetragen.
+
+    Eingetragen wird jede Strecke in den Zellen entlang der tatsächlich gefahrenen
+    Punkte. Die vereinfachte Strecke weicht davon höchstens um 'tolerance' ab, deshalb
+    sucht query() mit um 'tolerance' vergrößertem Radius.
+    """
+    def __init__(self, world_width, world_height, tolerance, cell_size=BLOCK_SIZE):
+        super().__init__(world_width, world_height, cell_size)
+        self.tolerance = tolerance
+        self.open = {}  # Spieler -> [offene Strecke, Anzahl Eckpunkte, letzter Punkt x, y]
+
+    def _register(self, segment, x0, y0, x1, y1):
+        """
+        Trägt 'segment' in alle Zellen ein, die die Strecke (x0, y0)-(x1, y1) berührt
+        (über die umschließenden Rechtecke von höchstens zellgroßen Teilstücken).
+        """
+        cs = self.cell_size
+        if abs(x1 - x0) > cs or abs(y1 - y0) > cs:
+            pieces = math.ceil(max(abs(x1 - x0), abs(y1 - y0)) / cs)
+            bx = x0
+            by = y0
+            for k in range(1, pieces + 1):
+                ax = bx
+                ay = by
+                bx = x0 + (x1 - x0) * k / pieces if k < pieces else x1
+                by = y0 + (y1 - y0) * k / pieces if k < pieces else y1
+                self._register(segment, ax, ay, bx, by)
+            return
+        cells = self.cells
+        cols = self.cols
+        rows = self.rows
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        for cx in range(int(x0 // cs), int(x1 // cs) + 1):
+            for cy in range(int(y0 // cs), int(y1 // cs) + 1):
+                key = (cx % cols, cy % rows)
+                bucket = cells.get(key)
+                if bucket is None:
+                    bucket = cells[key] = [segment]
+                elif not bucket or bucket[-1] is not segment:
+                    bucket.append(segment)
+                else:
+                    continue
+                if self.journal is not None:
+                    self.journal.append(bucket)
+
+    def add(self, x, y, owner):
+        """
+        Übernimmt den zuletzt an owner.trail angehängten Punkt (x, y): Beginn eines neuen
+        Abschnitts, neue Strecke oder Verlängerung der offenen Strecke (verschmolzen).
+        """
+        trail = owner.trail
+        n = len(trail)
+        state = self.open.get(owner)
+        if state is None or n != state[1] and trail.run_start(n - 1):
+            # Neuer Abschnitt (nach Lücke oder Wrap): zunächst nur ein Punkt
+            segment = [x, y, x, y, 0, owner]
+            self._register(segment, x, y, x, y)
+            self.open[owner] = [segment, n, x, y]
+            return
+        segment, count, last_x, last_y = state
+        if n != count and segment[4] > 0:
+            # Neuer Eckpunkt: neue Strecke ab dem bisherigen Ende
+            segment = [segment[2], segment[3], x, y, 0, owner]
+        else:
+            segment[2] = x
+            segment[3] = y
+        segment[4] = trail.steps(n - 1)
+        self._register(segment, last_x, last_y, x, y)
+        state[0] = segment
+        state[1] = n
+        state[2] = x
+        state[3] = y
+
+    def mark(self):
+        """
+        Wie SpatialGrid.mark(), zusätzlich mit dem Stand der offenen Strecke jedes
+        Spielers (sie wird beim Verschmelzen verändert statt neu angelegt).
+        """
+        opened = {owner: (state[0], state[1], state[2], state[3], state[0][2], state[0][3], state[0][4])
+                  for owner, state in self.open.items()}
+        return super().mark(), opened
+
+    def rewind(self, mark):
+        journal_mark, opened = mark
+        super().rewind(journal_mark)
+        self.open = {}
+        for owner, (segment, count, last_x, last_y, x1, y1, steps) in opened.items():
+            segment[2] = x1
+            segment[3] = y1
+            segment[4] = steps
+            self.open[owner] = [segment, count, last_x, last_y]
+
+    def add_trail(self, owner):
+        trail = owner.trail
+        segment = None
+        for i, (x, y) in enumerate(trail):
+            steps = trail.steps(i)
+            if segment is None or steps == 0:
+                segment = [x, y, x, y, 0, owner]
+            elif segment[4] == 0:
+                segment[2] = x
+                segment[3] = y
+                segment[4] = steps
+            else:
+                segment = [segment[2], segment[3], x, y, steps, owner]
+            self._register(segment, segment[0], segment[1], x, y)
+        if segment is not None:
+            self.open[owner] = [segment, len(trail), segment[2], segment[3]]
+
+    def collides(self, x, y, radius, player):
+        previous = None
+        for segment in self.query((x, y), radius + self.tolerance):
+            if segment is previous:
+                continue  # Dieselbe Strecke aus der Nachbarzelle
+            previous = segment
+            x0, y0, x1, y1, steps, owner = segment
+            if (owner is player or owner.alive) and segment_distance(x, y, x0, y0, x1, y1, steps) < radius:
+                return True
+        return False
+
+
+# --- Trail-Speicher ---
+class Trail:
+    """
+    Kompakter Speicher für die Punkte einer Spur. Die Koordinaten liegen abwechselnd
+    (x0, y0, x1, y1, ...) in einem zusammenhängenden float-Puffer, der bei Bedarf
+    verdoppelt wird (amortisiert O(1) pro append).
+
+    Die Spur besteht aus Abschnitten, die durch Lücken und Wrap-Around getrennt sind
+    (break_run() vor dem ersten Punkt eines neuen Abschnitts, run_start()).
+
+    Mit 'tolerance' wird die Spur beim Anhängen zu einem Linienzug vereinfacht: Liegen
+    alle seit dem letzten Eckpunkt gefahrenen Punkte höchstens 'tolerance' von der
+    Strecke zum neuen Punkt entfernt, wird der letzte Punkt nur verschoben statt ein
+    neuer angehängt ("Sleeve"-Verfahren, O(1) pro Punkt). Der letzte Punkt ist dann
+    immer die zuletzt angehängte Position, die Eckpunkte davor ändern sich nicht mehr.
+    Zu jedem Eckpunkt wird gezählt, wie viele angehängte Punkte (Ticks) die Strecke
+    zu ihm umfasst (steps()); die Kollision verteilt sie gleichmäßig auf die Strecke.
+
+    Im Zerfallsmodus ('limit', siehe GameState(decay=...)) nimmt popleft() den ältesten
+    Punkt vorne weg. Der Puffer ist dann ein gleitendes Fenster: Die abgelaufenen Punkte
+    bleiben liegen, bis sie die Hälfte belegen, dann wird der Rest in einen neuen Puffer
+    gleicher Größe kopiert (amortisiert O(1) pro Punkt, Speicher höchstens etwa das
+    Vierfache von 'limit'). So bleibt coords() eine zusammenhängende Sicht ohne Kopie.
+    Indizes zählen immer ab dem ältesten noch vorhandenen Punkt; 'offset' ist die Zahl
+    der bisher abgelaufenen Punkte (absoluter Index = offset + Index).
+
+    Für das Zeichnen großer Welten liefert chunks() die Spur in Blöcken von TRAIL_CHUNK
+    Punkten mit umschließendem Rechteck, so dass nur sichtbare Blöcke gezeichnet werden.
+
+    Weil nur angehängt wird, reicht für einen Snapshot die Länge (mark()); rewind()
+    kürzt die Spur wieder darauf, ohne Punkte zu kopieren (nicht im Zerfallsmodus).
+    """
+    __slots__ = ("_buf", "_len", "_first", "_base", "_starts", "_new_run", "tolerance", "_steps",
+                 "_has_dir", "_ux", "_uy", "_lo", "_hi", "_end", "_boxes", "limit")
+
+    def __init__(self, points=(), capacity=64, tolerance=None):
+        self._buf = array("d", bytes(8 * 2 * capacity))
+        self._len = 0  # Belegte Punkte im Puffer (einschließlich abgelaufener)
+        self._first = 0  # Pufferposition des ältesten vorhandenen Punkts
+        self._base = 0  # Absoluter Index der Pufferposition 0
+        self._starts = {0}  # Pufferpositionen der Punkte, mit denen ein Abschnitt beginnt
+        self._new_run = False
+        self._boxes = []  # Rechtecke der abgeschlossenen Blöcke (siehe chunks())
+        self.tolerance = None
+        self._steps = None
+        self._has_dir = False  # Hat die offene Strecke schon eine Richtung?
+        self.limit = None  # Höchstzahl der Punkte im Zerfallsmodus (siehe Player.expire_trail())
+        if tolerance is not None:
+            self.set_tolerance(tolerance)
+        for x, y in points:
+            self.append(x, y)
+
+    @property
+    def offset(self):
+        """Anzahl der bisher vorne abgelaufenen Punkte (siehe popleft())."""
+        return self._base + self._first
+
+    def set_tolerance(self, tolerance):
+        """Vereinfacht ab jetzt alle neuen Punkte mit 'tolerance' (bisherige bleiben Eckpunkte)."""
+        self.tolerance = tolerance
+        self._has_dir = False
+        self._steps = array("l", (0 if i in self._starts else 1 for i in range(self._len)))
+
+    def steps(self, i):
+        """
+        Anzahl der angehängten Punkte zwischen Eckpunkt i - 1 und i (0 am Anfang eines
+        Abschnitts). Ohne Vereinfachung immer 1 bzw. 0.
+        """
+        if self._steps is not None:
+            return self._steps[self._first + i]
+        return 0 if self._first + i in self._starts else 1
+
+    def break_run(self):
+        """Der nächste angehängte Punkt beginnt einen neuen Abschnitt."""
+        self._new_run = True
+
+    def run_start(self, i):
+        """True, wenn Punkt 'i' einen Abschnitt beginnt (nicht mit dem vorigen verbunden)."""
+        return self._first + i in self._starts
+
+    def append(self, x, y):
+        """
+        Hängt den Punkt (x, y) an. Gibt False zurück, wenn er (bei vereinfachten Spuren)
+        mit der letzten Strecke verschmolzen wurde, sonst True.
+        """
+        start = self._len == self._first
+        if self._new_run:
+            self._new_run = False
+            self._has_dir = False
+            self._starts.add(self._len)
+            start = True
+        elif self.tolerance is not None and not start:
+            if self._merge(x, y):
+                self._steps[-1] += 1
+                return False
+        self._push(x, y)
+        if self._steps is not None:
+            self._steps.append(0 if start else 1)
+        return True
+
+    def popleft(self):
+        """
+        Entfernt den ältesten Punkt und gibt ihn als (x, y) zurück (amortisiert O(1)).
+        Der nächste Punkt beginnt danach einen Abschnitt.
+        """
+        i = self._first
+        if i >= self._len:
+            raise IndexError("popleft() auf leerem Trail")
+        point = (self._buf[2 * i], self._buf[2 * i + 1])
+        self._starts.discard(i)
+        self._starts.add(i + 1)
+        self._first = i + 1
+        if 2 * self._first >= self._len:
+            self._compact()
+        return point
+
+    def _compact(self):
+        """Kopiert die vorhandenen Punkte an den Anfang eines neuen, gleich großen Puffers."""
+        shift = self._first
+        n = self._len - shift
+        # Wie in _push() bleibt der alte Puffer unverändert, damit bestehende Views gültig bleiben
+        self._buf = self._buf[2 * shift:2 * self._len] + array("d", bytes(8 * (len(self._buf) - 2 * n)))
+        self._starts = {i - shift for i in self._starts if i >= shift}
+        if self._steps is not None:
+            del self._steps[:shift]
+        self._base += shift
+        self._first = 0
+        self._len = n
+
+    def _merge(self, x, y):
+        """Versucht (x, y) mit der offenen Strecke zu verschmelzen (siehe Klassenbeschreibung)."""
+        buf = self._buf
+        n = 2 * self._len
+        if not self._has_dir:
+            # Noch keine offene Strecke (z. B. erster Punkt nach einer Lücke): sie beginnt am letzten Punkt
+            self._start_segment(buf[n - 2], buf[n - 1], x, y)
+            return False
+        # Die offene Strecke geht vom vorletzten Punkt zum letzten
+        ax = buf[n - 4]
+        ay = buf[n - 3]
+        vx = x - ax
+        vy = y - ay
+        d = math.hypot(vx, vy)
+        theta = math.atan2(self._ux * vy - self._uy * vx, self._ux * vx + self._uy * vy)
+        if d > self._end and self._lo <= theta <= self._hi:
+            half = math.asin(self.tolerance / d) if d > self.tolerance else math.pi / 2
+            self._lo = max(self._lo, theta - half)
+            self._hi = min(self._hi, theta + half)
+            self._end = d
+            buf[n - 2] = x
+            buf[n - 1] = y
+            return True
+        # Knick: die neue Strecke beginnt am bisherigen Ende
+        self._start_segment(buf[n - 2], buf[n - 1], x, y)
+        return False
+
+    def _start_segment(self, ax, ay, x, y):
+        d = math.hypot(x - ax, y - ay)
+        if d == 0:
+            self._has_dir = False
+            return
+        self._has_dir = True
+        self._ux = (x - ax) / d
+        self._uy = (y - ay) / d
+        half = math.asin(self.tolerance / d) if d > self.tolerance else math.pi / 2
+        self._lo = -half
+        self._hi = half
+        self._end = d
+
+    def mark(self):
+        """Zustand für rewind() in O(1): Länge, letzter Punkt und Vereinfachungsstand."""
+        n = self._len
+        last = (self._buf[2 * n - 2], self._buf[2 * n - 1]) if n else None
+        steps = self._steps[-1] if self._steps is not None and n else None
+        sleeve = (self._ux, self._uy, self._lo, self._hi, self._end) if self._has_dir else None
+        return (n, self._new_run, last, steps, sleeve)
+
+    def rewind(self, mark):
+        """
+        Setzt die Spur auf den Stand von mark() zurück. Die Punkte danach werden nur
+        abgeschnitten (Aufwand proportional zur Zahl der entfernten Punkte).
+        """
+        n, new_run, last, steps, sleeve = mark
+        for i in range(max(n, 1), self._len):
+            self._starts.discard(i)
+        self._len = n
+        if last is not None:
+            # Bei vereinfachten Spuren kann der letzte Punkt seitdem verschoben worden sein
+            self._buf[2 * n - 2], self._buf[2 * n - 1] = last
+        if self._steps is not None:
+            del self._steps[n:]
+            if n:
+                self._steps[-1] = steps
+        self._new_run = new_run
+        self._has_dir = sleeve is not None
+        if sleeve is not None:
+            self._ux, self._uy, self._lo, self._hi, self._end = sleeve
+        boxes = self._boxes
+        while boxes and boxes[-1][1] >= self._base + n:
+            boxes.pop()
+
+    def _push(self, x, y):
+        n = 2 * self._len
+        if n >= len(self._buf):
+            # Neuer, doppelt so großer Puffer. Der alte wird nicht verändert, damit
+            # noch bestehende Views (coords()) gültig bleiben.
+            self._buf = self._buf + array("d", bytes(8 * len(self._buf)))
+        self._buf[n] = x
+        self._buf[n + 1] = y
+        self._len += 1
+
+    def __len__(self):
+        return self._len - self._first
+
+    def __getitem__(self, i):
+        n = self._len - self._first
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Trail-Index außerhalb des Bereichs")
+        i += self._first
+        return (self._buf[2 * i], self._buf[2 * i + 1])
+
+    def __iter__(self):
+        buf = self._buf
+        for i in range(2 * self._first, 2 * self._len, 2):
+            yield (buf[i], buf[i + 1])
+
+    def coords(self):
+        """
+        Liefert eine Sicht (memoryview, ohne Kopie) auf die flachen Koordinaten
+        x0, y0, x1, y1, ... aller Punkte.
+        """
+        return memoryview(self._buf)[2 * self._first:2 * self._len]
+
+    def chunks(self):
+        """
+        Liefert die Spur in Blöcken zu TRAIL_CHUNK Punkten als Liste von
+        (erster Index, Endindex, min_x, min_y, max_x, max_y). Ein Block reicht bis
+        einschließlich des ersten Punkts des nächsten Blocks (Endindex exklusiv), damit
+        die Strecke zwischen zwei Blöcken mit dem vorderen gezeichnet wird.
+
+        Die Rechtecke abgeschlossener Blöcke werden zwischengespeichert: Ihre Punkte
+        ändern sich nicht mehr (bei vereinfachten Spuren verschiebt sich nur der letzte
+        Punkt). Neu berechnet wird pro Aufruf nur der Block am Ende der Spur. Die Blöcke
+        sind an absoluten Indizes ausgerichtet; im Zerfallsmodus behält der vorderste,
+        teilweise abgelaufene Block sein altes (dann zu großes) Rechteck.
+        """
+        base = self._base
+        first = base + self._first
+        n = base + self._len
+        boxes = self._boxes
+        while boxes and boxes[0][1] <= first + 1:
+            del boxes[0]
+        start = boxes[-1][0] + TRAIL_CHUNK if boxes else first - first % TRAIL_CHUNK
+        # Ein Block ist abgeschlossen, wenn sein letzter Punkt nicht mehr der letzte der Spur ist
+        while start + TRAIL_CHUNK + 1 < n:
+            boxes.append(self._box(start, start + TRAIL_CHUNK + 1))
+            start += TRAIL_CHUNK
+        if first:
+            result = [(max(s, first) - first, e - first, x0, y0, x1, y1) for s, e, x0, y0, x1, y1 in boxes]
+        else:
+            result = list(boxes)
+        while start + 1 < n or start <= first < n:
+            s, e, x0, y0, x1, y1 = self._box(start, min(n, start + TRAIL_CHUNK + 1))
+            result.append((max(s, first) - first, e - first, x0, y0, x1, y1))
+            start += TRAIL_CHUNK
+        return result
+
+    def _box(self, start, end):
+        """Rechteck der (noch vorhandenen) Punkte mit den absoluten Indizes start bis end (exklusiv)."""
+        buf = self._buf
+        lo = 2 * (max(start, self._base + self._first) - self._base)
+        hi = 2 * (end - self._base)
+        xs = buf[lo:hi:2]
+        ys = buf[lo + 1:hi:2]
+        return (start, end, min(xs), min(ys), max(xs), max(ys))
+
+
+# --- Player-Klasse ---
+class Player:
+    __slots__ = (
+        "head", "trail", "dx", "dy", "controller", "control_type", "color", "alive",
+        "confirmed", "circle_size", "angle", "turn_speed", "turn_left", "turn_right",
+        "trail_counter", "highlighted", "highlight_start_time", "gap_chance", "min_gap",
+        "max_gap", "current_gap_remaining", "head_image", "grid", "rng",
+    )
+
+    def __init__(self, control_type, color, start_pos, direction, gap_chance=0.1, min_gap=2, max_gap=4):
+        # Kopf und statische Spur (Trail) werden getrennt geführt
+        self.head = list(start_pos)
+        self.trail = Trail([start_pos])
+        self.dx, self.dy = direction
+        self.controller = None
+        self.control_type = control_type
+        self.color = color
+        self.alive = True
+        self.confirmed = False
+        self.circle_size = BLOCK_SIZE // 2  # Basisgröße (z.B. für den Kopf)
+        # Fahrtrichtung als Winkel; steer() berechnet daraus in jedem Tick dx/dy neu
+        self.angle = math.atan2(self.dy, self.dx)
+        self.turn_speed = 0.2
+        # Lenkung im nächsten Tick: False/True oder der Anteil des Ticks (Vielfaches von
+        # 1/INPUT_STEPS), in dem die Taste gehalten wurde (siehe tron_input)
+        self.turn_left = False
+        self.turn_right = False
+        self.trail_counter = 0
+        self.highlighted = False
+        self.highlight_start_time = 0
+
+        # Parameter für zufällige Lücken:
+        self.gap_chance = gap_chance    # z.B. 10 % Chance pro Update, ein Gap zu starten
+        self.min_gap = min_gap          # Mindestlänge in Updates (z.B. 2)
+        self.max_gap = max_gap          # Maximallänge in Updates (z.B. 4)
+        self.current_gap_remaining = 0  # Zähler, wie viele Updates noch keine Spur erzeugt werden
+        # Optional: Kopfbild (wenn du später den Kopf durch ein PNG ersetzen möchtest)
+        self.head_image = None
+        # Räumliches Gitter für die Kollisionsprüfung (wird im Game-Loop gesetzt)
+        self.grid = None
+        # Zufallsquelle für die Lücken. Standard ist das globale random-Modul,
+        # GameState(seed=...) gibt jedem Spieler einen eigenen, reproduzierbaren Strom.
+        self.rng = random
+
+    def attach_grid(self, grid):
+        """
+        Verbindet den Spieler mit einem gemeinsamen SpatialGrid und trägt den
+        bisherigen Trail dort ein. Neue Trail-Punkte werden danach automatisch ergänzt.
+        """
+        self.grid = grid
+        grid.add_trail(self)
+
+    def expire_trail(self):
+        """
+        Zerfallsmodus: Entfernt die ältesten Trail-Punkte, bis höchstens trail.limit
+        übrig sind, auch aus dem Kollisionsgitter (pro Tick meist genau einer, O(1)).
+        """
+        trail = self.trail
+        while len(trail) > trail.limit:
+            x, y = trail.popleft()
+            if self.grid is not None:
+                self.grid.remove(x, y, self)
+
+    def steer(self):
+        """Dreht den Spieler gemäß turn_left/turn_right und setzt die Bewegungsrichtung."""
+        # True zählt als 1, eine volle Drehung bleibt also bitgleich turn_speed
+        if self.turn_left:
+            self.angle -= self.turn_speed * self.turn_left
+        if self.turn_right:
+            self.angle += self.turn_speed * self.turn_right
+
+        # Aktualisiere die Bewegungsrichtung basierend auf dem Winkel
+        self.dx = BLOCK_SIZE * math.cos(self.angle)
+        self.dy = BLOCK_SIZE * math.sin(self.angle)
+
+    def update_position(self, world_width, world_height):
+        if not self.alive:
+            return
+
+        self.trail_counter += 1
+
+        # Wenn ein Gap aktiv ist, verringere den Zähler und füge kein Segment hinzu.
+        if self.current_gap_remaining > 0:
+            self.current_gap_remaining -= 1
+        else:
+            # Mit einer gewissen Wahrscheinlichkeit ein Gap starten:
+            if self.rng.random() < self.gap_chance:
+                # Wähle eine zufällige Gap-Länge zwischen min_gap und max_gap.
+                self.current_gap_remaining = self.rng.randint(self.min_gap, self.max_gap)
+                self.trail.break_run()
+            else:
+                # Füge die aktuelle Kopfposition zur statischen Spur hinzu.
+                self.trail.append(self.head[0], self.head[1])
+                if self.grid is not None:
+                    self.grid.add(self.head[0], self.head[1], self)
+                if self.trail.limit is not None:
+                    self.expire_trail()
+
+        # Aktualisiere die Kopfposition (direkt in der bestehenden Liste):
+        x = self.head[0] + self.dx
+        y = self.head[1] + self.dy
+        if x >= world_width:
+            x = 0
+        elif x < 0:
+            x = world_width - BLOCK_SIZE
+        if y >= world_height:
+            y = 0
+        elif y < 0:
+            y = world_height - BLOCK_SIZE
+        if x != self.head[0] + self.dx or y != self.head[1] + self.dy:
+            # Wrap-Around: der nächste Trail-Punkt wird nicht mit dem letzten verbunden
+            self.trail.break_run()
+        self.head[0] = x
+        self.head[1] = y
+
+
+    def check_collision(self, players, zoom):
+        if not self.alive:
+            return
+        hx, hy = self.head
+        collision_radius = (self.circle_size * zoom) * 0.8
+        # math.hypot(dx, dy) liefert bitgleich dasselbe wie math.dist(head, punkt)
+        if self.grid is not None:
+            # Nur die Zellen rund um den Kopf prüfen. Spuren toter Gegner zählen
+            # (wie beim vollständigen Durchlauf unten) nicht.
+            if self.grid.collides(hx, hy, collision_radius, self):
+                self.alive = False
+            return
+        for p in players:
+            if p is self or p.alive:
+                c = p.trail.coords()
+                for i in range(0, len(c), 2):
+                    if math.hypot(hx - c[i], hy - c[i + 1]) < collision_radius:
+                        self.alive = False
+                        return
+
+
+def player_rng(seed, index):
+    """
+    Eigener Zufallsstrom für Spieler 'index' eines Matches mit 'seed'.
+    Die Ströme hängen nicht von der Reihenfolge der Aufrufe ab und sind über
+    Python-Prozesse hinweg gleich (Seeds aus Strings werden per SHA-512 abgeleitet).
+    """
+    return random.Random(f"opentron:{seed}:{index}")
+
+
+def start_grid(num_players, width, height):
+    """
+    Wählt das Raster (Spalten, Zeilen) mit mindestens 'num_players' Zellen, dessen
+    kürzere Zellseite am größten ist. Gibt (kürzere Zellseite, Spalten, Zeilen) zurück.
+    """
+    best = None
+    for cols in range(1, num_players + 1):
+        rows = -(-num_players // cols)
+        side = min(width / cols, height / rows)
+        if best is None or side > best[0]:
+            best = (side, cols, rows)
+    return best
+
+
+def generate_start_positions(num_players, width, height, rng=random, min_distance=MIN_DISTANCE):
+    """
+    Verteilt die Startpositionen in O(n): Die Welt wird in ein Raster mit mindestens
+    'num_players' möglichst großen Zellen geteilt, jeder Spieler bekommt eine zufällige
+    Zelle und darin eine zufällige Position mit mindestens 'min_distance' Abstand zu
+    allen Nachbarzellen. Weil das Raster die Welt genau ausfüllt, gilt der Abstand auch
+    über den Rand hinweg (Wrap-Around).
+
+    Passen nicht alle Spieler mit 'min_distance' in die Welt, wird der Abstand auf die
+    Zellgröße verringert, aber nicht unter MIN_START_DISTANCE (sonst ValueError).
+
+    Als Startrichtung wird eine der vier Achsenrichtungen gewählt, in deren 90°-Kegel
+    kein Spieler aus den Nachbarzellen liegt; gibt es keine, zeigt sie vom nächsten
+    Nachbarn weg.
+
+    :param rng: Zufallsquelle (z. B. random.Random(seed) für reproduzierbare Startpositionen).
+    :param min_distance: Gewünschter Mindestabstand zwischen zwei Startpositionen.
+    """
+    if num_players <= 0:
+        return [], []
+    side, cols, rows = start_grid(num_players, width, height)
+    if side < MIN_START_DISTANCE:
+        raise ValueError(f"{num_players} Spieler passen nicht in eine Welt von {width:.0f}x{height:.0f} "
+                         f"(Abstand höchstens {side:.0f}, mindestens {MIN_START_DISTANCE} nötig)")
+    distance = min(min_distance, side)
+    cell_w = width / cols
+    cell_h = height / rows
+    cells = rng.sample(range(cols * rows), num_players)
+    positions = []
+    occupied = {}  # (Spalte, Zeile) -> Index des Spielers
+    for i, cell in enumerate(cells):
+        col, row = cell % cols, cell // cols
+        positions.append([col * cell_w + rng.uniform(0, cell_w - distance),
+                          row * cell_h + rng.uniform(0, cell_h - distance)])
+        occupied[(col, row)] = i
+
+    dir_options = [(BLOCK_SIZE, 0), (-BLOCK_SIZE, 0), (0, BLOCK_SIZE), (0, -BLOCK_SIZE)]
+    directions = []
+    for i, cell in enumerate(cells):
+        col, row = cell % cols, cell // cols
+        x, y = positions[i]
+        # Kürzeste Verbindungen (mit Wrap-Around) zu den Spielern der Nachbarzellen
+        neighbors = set()
+        for dc in (-1, 0, 1):
+            for dr in (-1, 0, 1):
+                j = occupied.get(((col + dc) % cols, (row + dr) % rows))
+                if j is not None and j != i:
+                    neighbors.add(j)
+        vectors = []
+        for j in neighbors:
+            vx = (positions[j][0] - x + width / 2) % width - width / 2
+            vy = (positions[j][1] - y + height / 2) % height - height / 2
+            vectors.append((vx, vy, math.hypot(vx, vy)))
+        free = [d for d in dir_options
+                if all(d[0] * vx + d[1] * vy <= BLOCK_SIZE * dist * math.sqrt(0.5) for vx, vy, dist in vectors)]
+        if free:
+            directions.append(rng.choice(free))
+        else:
+            vx, vy, dist = min(vectors, key=lambda v: v[2])
+            directions.append((-vx / dist * BLOCK_SIZE, -vy / dist * BLOCK_SIZE))
+    return positions, directions
+
+
+# --- Vektorisierter Spielerzustand ---
+_batch_available = None
+
+
+def batch_available():
+    """
+    True, wenn der vektorisierte Tick (PlayerArrays) genutzt werden kann: NumPy ist
+    installiert und np.cos/np.sin liefern bitgleich dasselbe wie math.cos/math.sin.
+    Manche NumPy-Builds nutzen eigene SIMD-Routinen, die im letzten Bit abweichen
+    können; dann bleibt es beim skalaren Pfad, damit Matches reproduzierbar bleiben.
+    """
+    global _batch_available
+    if _batch_available is None:
+        if np is None:
+            _batch_available = False
+        else:
+            angles = [k * 0.05 for k in range(-4000, 4001)]
+            a = np.array(angles)
+            _batch_available = (np.cos(a).tolist() == [math.cos(v) for v in angles]
+                                and np.sin(a).tolist() == [math.sin(v) for v in angles])
+    return _batch_available
+
+
+class PlayerArrays:
+    """
+    Struct-of-Arrays-Zustand aller Spieler für den vektorisierten Tick: Kopf, Winkel,
+    Richtung, Lücken-Zähler usw. liegen in NumPy-Arrays und werden für alle Spieler
+    in einem Schritt fortgeschrieben. Die Player-Objekte werden danach mit den
+    Ergebnissen aktualisiert, damit Darstellung, Bots und Netzwerk unverändert bleiben.
+
+    Die Arrays sind maßgeblich für Kopf, Winkel, Richtung und Lücken. Wer diese
+    Attribute an den Player-Objekten von außen ändert, muss danach reload() aufrufen.
+    Lenk-Flags und alive werden in jedem Tick von den Spielern übernommen.
+    Zurückgeschrieben werden pro Tick nur Kopf und Winkel (die lesen Darstellung und
+    Bots); Richtung, Lücken-Zähler und trail_counter erst mit store().
+
+    """
+    def __init__(self, players):
+        self.players = players
+        self.reload()
+
+    def reload(self):
+        """Übernimmt den kompletten Zustand aus den Player-Objekten."""
+        ps = self.players
+        self.x = np.array([float(p.head[0]) for p in ps])
+        self.y = np.array([float(p.head[1]) for p in ps])
+        self.angle = np.array([float(p.angle) for p in ps])
+        self.dx = np.array([float(p.dx) for p in ps])
+        self.dy = np.array([float(p.dy) for p in ps])
+        self.turn_speed = np.array([float(p.turn_speed) for p in ps])
+        self.gap_remaining = np.array([p.current_gap_remaining for p in ps], dtype=np.int64)
+        self.trail_counter = np.array([p.trail_counter for p in ps], dtype=np.int64)
+
+    def store(self):
+        """Schreibt Richtung, Lücken-Zähler und trail_counter in die Player-Objekte zurück."""
+        for p, dx, dy, gap, counter in zip(self.players, self.dx.tolist(), self.dy.tolist(),
+                                           self.gap_remaining.tolist(), self.trail_counter.tolist()):
+            p.dx = dx
+            p.dy = dy
+            p.current_gap_remaining = gap
+            p.trail_counter = counter
+
+    def step(self, world_width, world_height):
+        """
+        Drehung, Lückenentscheidung und Bewegung aller Spieler (wie steer() und
+        update_position()). Gibt die Liste der Spieler-Indizes zurück, die in diesem
+        Tick einen Trail-Punkt an ihrer alten Kopfposition anhängen, die alten Köpfe und
+        die Indizes der Spieler mit Wrap-Around.
+        """
+        ps = self.players
+        left = np.array([float(p.turn_left) for p in ps])
+        right = np.array([float(p.turn_right) for p in ps])
+        alive = np.array([p.alive for p in ps], dtype=bool)
+
+        # steer(): gilt (wie im skalaren Pfad) auch für ausgeschiedene Spieler
+        angle = np.where(left > 0, self.angle - self.turn_speed * left, self.angle)
+        angle = np.where(right > 0, angle + self.turn_speed * right, angle)
+        self.angle = angle
+        self.dx = BLOCK_SIZE * np.cos(angle)
+        self.dy = BLOCK_SIZE * np.sin(angle)
+
+        # update_position(): Lücken. Die Zufallszahlen kommen aus den Strömen der Spieler
+        # und werden in derselben Reihenfolge wie im skalaren Pfad gezogen.
+        self.trail_counter += alive
+        in_gap = alive & (self.gap_remaining > 0)
+        self.gap_remaining -= in_gap
+        appended = []
+        gap = self.gap_remaining
+        for i in np.flatnonzero(alive & ~in_gap).tolist():
+            p = ps[i]
+            rng = p.rng
+            if rng.random() < p.gap_chance:
+                gap[i] = rng.randint(p.min_gap, p.max_gap)
+                p.trail.break_run()
+            else:
+                appended.append(i)
+
+        old_x = self.x
+        old_y = self.y
+        x = old_x + self.dx
+        y = old_y + self.dy
+        wrapped = alive & ((x >= world_width) | (x < 0) | (y >= world_height) | (y < 0))
+        x = np.where(x >= world_width, 0.0, np.where(x < 0, world_width - BLOCK_SIZE, x))
+        y = np.where(y >= world_height, 0.0, np.where(y < 0, world_height - BLOCK_SIZE, y))
+        self.x = np.where(alive, x, old_x)
+        self.y = np.where(alive, y, old_y)
+        return appended, old_x, old_y, np.flatnonzero(wrapped).tolist()
+
+
+# --- Simulationszustand ---
+class Snapshot:
+    """Festgehaltener Zustand eines GameState (siehe GameState.snapshot())."""
+    __slots__ = ("tick", "players", "grid")
+
+    def __init__(self, tick, players, grid):
+        self.tick = tick
+        self.players = players  # je Spieler ein Tupel, siehe GameState.snapshot()
+        self.grid = grid  # Marke des Kollisionsgitters
+
+
+class GameState:
+    """
+    Kompletter Zustand eines laufenden Spiels. step() führt genau einen Tick aus:
+    Drehung, Bewegung und Kollisionsprüfung aller Spieler in fester Reihenfolge.
+
+    Mit 'seed' bekommt jeder Spieler einen eigenen Zufallsstrom (player_rng), das Match
+    ist dann allein durch Seed, Startaufstellung und Eingaben festgelegt.
+
+    Mit batch=True werden Drehung und Bewegung vektorisiert (PlayerArrays), sofern
+    batch_available() das erlaubt; die Ergebnisse sind identisch zum skalaren Pfad.
+
+    Mit simplify=True werden die Spuren als vereinfachte Linienzüge gespeichert
+    (Trail mit 'tolerance') und die Kollision prüft den Abstand des Kopfes zu den
+    Strecken (SegmentGrid) statt zu den einzelnen Punkten.
+
+    Mit 'decay' (Anzahl Punkte, z. B. DECAY_LENGTH) zerfallen die Spuren: Jede Spur
+    behält nur ihre letzten 'decay' Punkte, ältere laufen ab und verschwinden auch aus
+    dem Kollisionsgitter. Speicher und Aufwand pro Tick bleiben so über ein beliebig
+    langes Match gleich. Nur für unvereinfachte Spuren.
+
+    snapshot() hält den Zustand in O(Spieler) fest (Spuren nur über ihre Länge),
+    restore() springt dorthin zurück, z. B. für Rollback oder eine Revanche ab Tick N.
+    Im Zerfallsmodus gibt es keine Snapshots (abgelaufene Punkte lassen sich so nicht
+    zurückholen).
+    """
+    def __init__(self, players, world_width, world_height, zoom, seed=None, batch=False, simplify=False,
+                 decay=None):
+        self.players = players
+        self.world_width = world_width
+        self.world_height = world_height
+        self.zoom = zoom
+        self.tick = 0
+        self.seed = seed
+        if seed is not None:
+            for i, p in enumerate(players):
+                p.rng = player_rng(seed, i)
+        # Optionaler Profiler (siehe tron_profiler); misst Drehung, Bewegung und Kollision getrennt
+        self.profiler = None
+        # Gemeinsames Kollisionsgitter für alle Spieler
+        self.simplify = simplify
+        if simplify:
+            radius = min((p.circle_size * zoom * 0.8 for p in players), default=BLOCK_SIZE)
+            tolerance = SIMPLIFY_TOLERANCE * radius
+            for p in players:
+                p.trail.set_tolerance(tolerance)
+            self.grid = SegmentGrid(world_width, world_height, tolerance)
+        else:
+            self.grid = SpatialGrid(world_width, world_height)
+        for p in players:
+            p.attach_grid(self.grid)
+        self.decay = decay
+        if decay is not None:
+            if simplify:
+                raise ValueError("Zerfallende Spuren lassen sich nicht vereinfachen")
+            if decay < 1:
+                raise ValueError("Die Spurlänge im Zerfallsmodus muss mindestens 1 sein")
+            for p in players:
+                p.trail.limit = decay
+                p.expire_trail()
+        self.arrays = PlayerArrays(players) if batch and batch_available() else None
+
+    def step(self, inputs=None):
+        """
+        Führt einen Simulations-Tick aus.
+
+        :param inputs: Optional eine Liste mit (turn_left, turn_right) je Spieler (bool
+                       oder Lenkstärke, siehe Player). Ohne inputs werden die aktuellen
+                       Flags der Spieler verwendet.
+        """
+        players = self.players
+        if inputs is not None:
+            for p, (left, right) in zip(players, inputs):
+                p.turn_left = left
+                p.turn_right = right
+        profiler = self.profiler
+        if self.arrays is not None:
+            self._step_batch(profiler if profiler is not None and profiler.enabled else None)
+        elif profiler is not None and profiler.enabled:
+            self._step_profiled(profiler)
+        else:
+            for p in players:
+                p.steer()
+                p.update_position(self.world_width, self.world_height)
+                p.check_collision(players, self.zoom)
+        self.tick += 1
+
+    def _step_profiled(self, profiler):
+        """Wie der Tick in step(), aber mit über alle Spieler aufsummierten Zeiten je Teilschritt."""
+        perf = time.perf_counter
+        players = self.players
+        turn = move = collision = 0.0
+        start = perf()
+        for p in players:
+            t0 = perf()
+            p.steer()
+            t1 = perf()
+            p.update_position(self.world_width, self.world_height)
+            t2 = perf()
+            p.check_collision(players, self.zoom)
+            t3 = perf()
+            turn += t1 - t0
+            move += t2 - t1
+            collision += t3 - t2
+        profiler.add_sequence(start, [("sim.turn", turn), ("sim.move", move), ("sim.collision", collision)])
+
+    def _step_batch(self, profiler=None):
+        """
+        Vektorisierter Tick. Drehung und Bewegung laufen für alle Spieler gleichzeitig;
+        Anhängen der Trail-Punkte und Kollisionsprüfung folgen danach der Reihe nach,
+        damit jeder Spieler (wie im skalaren Pfad) nur die Punkte der Spieler vor ihm sieht.
+        """
+        perf = time.perf_counter
+        start = perf()
+        arrays = self.arrays
+        appended, old_x, old_y, wrapped = arrays.step(self.world_width, self.world_height)
+        moved = perf()
+        players = self.players
+        zoom = self.zoom
+        append = [False] * len(players)
+        for i in appended:
+            append[i] = True
+        for p, x, y, angle, ox, oy, app in zip(players, arrays.x.tolist(), arrays.y.tolist(),
+                                                arrays.angle.tolist(), old_x.tolist(), old_y.tolist(), append):
+            if app:
+                p.trail.append(ox, oy)
+                if p.grid is not None:
+                    p.grid.add(ox, oy, p)
+                if p.trail.limit is not None:
+                    p.expire_trail()
+            p.angle = angle
+            head = p.head
+            head[0] = x
+            head[1] = y
+            if p.alive:
+                p.check_collision(players, zoom)
+        for i in wrapped:
+            players[i].trail.break_run()
+        if profiler is not None:
+            profiler.add_sequence(start, [("sim.batch", moved - start), ("sim.collision", perf() - moved)])
+
+    def snapshot(self):
+        """
+        Hält den kompletten Simulationszustand fest: Köpfe, Winkel, Lenk-Flags, Lücken,
+        alive, Zufallsströme, Spuren und Kollisionsgitter. Die Spuren werden nicht
+        kopiert; gespeichert wird nur ihre Länge (Trail.mark()). Beim ersten Aufruf
+        beginnt das Gitter ein Journal seiner Einträge (siehe SpatialGrid.mark()).
+        """
+        if self.decay is not None:
+            raise ValueError("Im Zerfallsmodus sind keine Snapshots möglich")
+        self.sync_players()
+        players = []
+        for p in self.players:
+            players.append((p.head[0], p.head[1], p.angle, p.dx, p.dy, p.alive, p.turn_left, p.turn_right,
+                            p.trail_counter, p.current_gap_remaining, p.rng.getstate(), p.trail.mark()))
+        return Snapshot(self.tick, players, self.grid.mark())
+
+    def restore(self, snapshot):
+        """
+        Setzt das Spiel auf 'snapshot' (aus diesem GameState) zurück. Das geht nur
+        rückwärts: Snapshots, die danach aufgenommen wurden, sind anschließend ungültig.
+        Player- und Trail-Objekte bleiben dieselben; der Aufwand wächst nur mit der Zahl
+        der seitdem angehängten Punkte.
+        """
+        for p, (x, y, angle, dx, dy, alive, left, right, counter, gap, rng_state, trail_mark) in zip(
+                self.players, snapshot.players):
+            p.head[0] = x
+            p.head[1] = y
+            p.angle = angle
+            p.dx = dx
+            p.dy = dy
+            p.alive = alive
+            p.turn_left = left
+            p.turn_right = right
+            p.trail_counter = counter
+            p.current_gap_remaining = gap
+            p.rng.setstate(rng_state)
+            p.trail.rewind(trail_mark)
+        self.grid.rewind(snapshot.grid)
+        self.tick = snapshot.tick
+        if self.arrays is not None:
+            self.arrays.reload()
+
+    def sync_players(self):
+        """
+        Bringt die Player-Objekte im vektorisierten Modus auf den vollen Stand
+        (siehe PlayerArrays.store); im skalaren Modus ist nichts zu tun.
+        """
+        if self.arrays is not None:
+            self.arrays.store()
+
+    def alive_players(self):
+        return [p for p in self.players if p.alive]
+
+    def is_over(self):
+        """Das Spiel ist vorbei, wenn höchstens ein Spieler übrig ist (bei Einzelspieler: keiner)."""
+        alive = sum(1 for p in self.players if p.alive)
+        return alive == 0 or (alive == 1 and len(self.players) > 1)
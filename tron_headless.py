@@ -0,0 +1,123 @@
+"""
+Headless-Runner: spielt Tron-Matches ohne Fenster so schnell wie die CPU erlaubt.
+
+Es wird nur tron_engine benötigt, pygame/SDL muss nicht installiert sein.
+Die Spieler werden von einfachen Zufallsbots gesteuert (reproduzierbar über --seed),
+mit --ai stattdessen von den Lookahead-Bots aus tron_bots.
+
+Beispiel:
+    python tron_headless.py --players 4 --ticks 20000 --seed 1
+"""
+import argparse
+import random
+import time
+
+from tron_bots import BotPlanner
+from tron_engine import DECAY_LENGTH, GameState, Player, generate_start_positions
+
+# Mögliche Lenkzustände der Zufallsbots: (turn_left, turn_right)
+STEERING = [(False, False), (True, False), (False, True)]
+
+
+def build_players(num_players, width, height, snake_width=10, turn_speed=0.2, rng=random):
+    """Erstellt Bot-Spieler mit Startpositionen wie in init_players."""
+    positions, directions = generate_start_positions(num_players, width, height, rng)
+    players = []
+    for i in range(num_players):
+        p = Player("bot", None, positions[i], directions[i])
+        p.circle_size = snake_width
+        p.turn_speed = turn_speed
+        players.append(p)
+    return players
+
+
+def run_match(num_players=4, ticks=10000, seed=0, width=1920, height=1080, zoom=1.0,
+              snake_width=10, turn_speed=0.2, turn_chance=0.1, stop_when_over=True, ai=False, batch=False,
+              simplify=False, decay=None):
+    """
+    Spielt ein Match ohne Darstellung.
+
+    :param ticks: Maximale Anzahl Simulations-Ticks.
+    :param turn_chance: Wahrscheinlichkeit pro Tick, dass ein Bot seinen Lenkzustand wechselt.
+    :param stop_when_over: Abbrechen, sobald höchstens ein Spieler übrig ist.
+    :param ai: Lookahead-Bots (tron_bots) statt Zufallsbots verwenden.
+    :param batch: Vektorisierten Tick verwenden (siehe GameState), gleiches Ergebnis.
+    :param simplify: Spuren als vereinfachte Linienzüge speichern (siehe GameState).
+    :param decay: Spurlänge im Zerfallsmodus (siehe GameState) oder None.
+    :return: Dictionary mit Ergebnis und Laufzeit.
+    """
+    rng = random.Random(seed + 1)
+    # Startaufstellung und Lücken aus eigenen Zufallsströmen (unabhängig vom globalen random)
+    players = build_players(num_players, width, height, snake_width, turn_speed, random.Random(seed))
+    state = GameState(players, width / zoom, height / zoom, zoom, seed=seed, batch=batch, simplify=simplify,
+                      decay=decay)
+    planner = BotPlanner(state) if ai else None
+    steering = [STEERING[0]] * num_players
+    death_ticks = [None] * num_players
+
+    start = time.perf_counter()
+    while state.tick < ticks:
+        if planner is not None:
+            planner.update()
+            state.step()
+        else:
+            for i in range(num_players):
+                if rng.random() < turn_chance:
+                    steering[i] = rng.choice(STEERING)
+            state.step(steering)
+        for i, p in enumerate(players):
+            if not p.alive and death_ticks[i] is None:
+                death_ticks[i] = state.tick
+        if stop_when_over and state.is_over():
+            break
+    duration = time.perf_counter() - start
+
+    alive = state.alive_players()
+    return {
+        "ticks": state.tick,
+        "seconds": duration,
+        "ticks_per_second": state.tick / duration if duration > 0 else float("inf"),
+        "winner": players.index(alive[0]) if len(alive) == 1 else None,
+        "death_ticks": death_ticks,
+        "trail_lengths": [len(p.trail) for p in players],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tron ohne Fenster simulieren")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--matches", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--zoom", type=float, default=1.0)
+    parser.add_argument("--snake-width", type=int, default=10)
+    parser.add_argument("--turn-speed", type=float, default=0.2)
+    parser.add_argument("--turn-chance", type=float, default=0.1)
+    parser.add_argument("--ai", action="store_true", help="Lookahead-Bots statt Zufallsbots")
+    parser.add_argument("--batch", action="store_true", help="Vektorisierter Tick mit NumPy (falls verfügbar)")
+    parser.add_argument("--simplify", action="store_true", help="Spuren als vereinfachte Linienzüge")
+    parser.add_argument("--decay", type=int, nargs="?", const=DECAY_LENGTH, default=None, metavar="PUNKTE",
+                        help=f"Zerfallende Spuren mit höchstens PUNKTE Punkten (Standard {DECAY_LENGTH})")
+    parser.add_argument("--no-stop", action="store_true",
+                        help="Nicht beim Spielende abbrechen (Soak-Test über alle Ticks)")
+    args = parser.parse_args(argv)
+
+    total_ticks = 0
+    total_seconds = 0.0
+    for m in range(args.matches):
+        res = run_match(args.players, args.ticks, args.seed + m, args.width, args.height, args.zoom,
+                        args.snake_width, args.turn_speed, args.turn_chance, not args.no_stop, args.ai, args.batch, args.simplify,
+                        args.decay)
+        total_ticks += res["ticks"]
+        total_seconds += res["seconds"]
+        winner = "keiner" if res["winner"] is None else f"Spieler {res['winner'] + 1}"
+        print(f"Match {m + 1}: {res['ticks']} Ticks, Sieger: {winner}, "
+              f"{res['ticks_per_second']:.0f} Ticks/s, Tode: {res['death_ticks']}")
+    if total_seconds > 0:
+        print(f"Gesamt: {total_ticks} Ticks in {total_seconds:.2f}s ({total_ticks / total_seconds:.0f} Ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
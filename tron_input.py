@@ -0,0 +1,146 @@
+"""
+Eingabeschicht für das Spiel: Tastatur und Joysticks mit Zeitstempeln.
+
+Statt beim Abarbeiten der Events nur turn_left/turn_right zu setzen, merkt sich die
+InputLayer jeden Druck und jedes Loslassen mit dem Zeitpunkt, zu dem das Event aus
+der Warteschlange geholt wurde. Vor jedem Simulations-Tick wird daraus berechnet,
+welchen Anteil der Tick-Dauer die Taste gehalten war; die Drehung wird entsprechend
+anteilig ausgeführt (in Stufen von 1/INPUT_STEPS, damit Aufzeichnungen exakt bleiben).
+Ein kurzes Antippen innerhalb eines Ticks geht so nicht mehr verloren, es dreht
+mindestens eine Stufe.
+
+Joystick-Events werden über ein Dictionary Instanz-ID -> Spieler zugeordnet.
+
+Zusätzlich wird die Latenz von der Eingabe bis zum Bild gemessen, das die Drehung
+zeigt: vom Abholen des Events bis nach pygame.display.flip()/update() des Frames, in
+dem der betroffene Tick simuliert wurde. Die Zeit, die das Event vorher in der
+Warteschlange von SDL lag (höchstens ein Frame), ist darin nicht enthalten.
+"""
+from collections import deque
+
+import pygame
+
+from tron_engine import INPUT_STEPS
+
+# Joystick-Tasten für links/rechts (Steuerkreuz)
+JOY_LEFT = 13
+JOY_RIGHT = 14
+# So viele Latenz-Messungen werden für die Statistik behalten
+LATENCY_HISTORY = 200
+
+
+class ButtonTrack:
+    """Zustand einer Lenktaste mit den noch nicht verrechneten Wechseln (Zeit, gedrückt)."""
+    __slots__ = ("pressed", "changes")
+
+    def __init__(self):
+        self.pressed = False
+        self.changes = deque()
+
+    def set(self, pressed, now):
+        self.changes.append((now, pressed))
+
+    def held(self, start, end):
+        """
+        Verrechnet alle Wechsel bis 'end' und gibt (gehaltene Dauer in [start, end],
+        Zeitpunkte der Drücke) zurück. Wechsel vor 'start' zählen als zu 'start'.
+        """
+        held = 0.0
+        presses = []
+        t = start
+        pressed = self.pressed
+        changes = self.changes
+        while changes and changes[0][0] <= end:
+            when, now_pressed = changes.popleft()
+            when = max(when, start)
+            if pressed:
+                held += when - t
+            if now_pressed and not pressed:
+                presses.append(when)
+            t = when
+            pressed = now_pressed
+        if pressed:
+            held += end - t
+        self.pressed = pressed
+        return held, presses
+
+
+class InputLayer:
+    """
+    Lenkeingaben der lokalen Spieler eines Matches. handle() für jedes Event aufrufen,
+    apply() vor jedem Tick und presented() nach jeder Bildschirmübertragung.
+    """
+    def __init__(self, players):
+        self.tracks = {}  # Spieler -> (ButtonTrack links, ButtonTrack rechts)
+        self.joysticks = {}  # Instanz-ID -> Spieler
+        # Die Tastatur lenkt den ersten Spieler, außer das ist ein Bot oder Netzwerkspieler
+        # (kein Tastaturspieler bestätigt)
+        self.keyboard = None
+        if players and players[0].control_type not in ("bot", "network"):
+            self.keyboard = players[0]
+            self.tracks[players[0]] = (ButtonTrack(), ButtonTrack())
+        for p in players:
+            if p.controller is not None and p.control_type not in ("bot", "network"):
+                self.joysticks[p.controller.get_instance_id()] = p
+                self.tracks.setdefault(p, (ButtonTrack(), ButtonTrack()))
+        self.waiting = []  # Zeitpunkte von Drücken, deren Tick simuliert, aber noch nicht gezeigt wurde
+        self.latencies = deque(maxlen=LATENCY_HISTORY)
+
+    def handle(self, event, now):
+        """Übernimmt ein Lenk-Event mit dem Zeitstempel 'now' (time.perf_counter())."""
+        if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+            if self.keyboard is None or event.key not in (pygame.K_LEFT, pygame.K_RIGHT):
+                return
+            left, right = self.tracks[self.keyboard]
+            track = left if event.key == pygame.K_LEFT else right
+            track.set(event.type == pygame.KEYDOWN, now)
+        elif event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+            p = self.joysticks.get(event.joy)
+            if p is None or event.button not in (JOY_LEFT, JOY_RIGHT):
+                return
+            left, right = self.tracks[p]
+            if event.type == pygame.JOYBUTTONDOWN:
+                # Wie bisher: eine Richtung am Steuerkreuz löst die andere
+                if event.button == JOY_LEFT:
+                    right.set(False, now)
+                    left.set(True, now)
+                else:
+                    left.set(False, now)
+                    right.set(True, now)
+            else:
+                (left if event.button == JOY_LEFT else right).set(False, now)
+
+    def apply(self, start, end):
+        """
+        Setzt turn_left/turn_right der lokalen Spieler für den Tick, der die Zeit von
+        'start' bis 'end' abdeckt: True bei durchgehend gehaltener Taste, sonst der
+        gehaltene Anteil in Stufen von 1/INPUT_STEPS (mindestens eine Stufe pro Druck).
+        """
+        duration = end - start
+        for p, (left, right) in self.tracks.items():
+            p.turn_left = self._amount(left, start, end, duration)
+            p.turn_right = self._amount(right, start, end, duration)
+
+    def _amount(self, track, start, end, duration):
+        held, presses = track.held(start, end)
+        self.waiting.extend(presses)
+        if held >= duration:
+            return True
+        if held <= 0 and not presses:
+            return False
+        steps = max(1, min(INPUT_STEPS, round(held / duration * INPUT_STEPS)))
+        return True if steps == INPUT_STEPS else steps / INPUT_STEPS
+
+    def presented(self, now):
+        """Nach der Bildschirmübertragung: Latenz für alle inzwischen simulierten Drücke."""
+        if self.waiting:
+            self.latencies.extend(now - t for t in self.waiting)
+            self.waiting = []
+
+    def latency_text(self):
+        if not self.latencies:
+            return "Eingabe->Bild: -"
+        values = sorted(self.latencies)
+        mean = sum(values) / len(values)
+        p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+        return f"Eingabe->Bild: {mean * 1000:.0f} ms (p95 {p95 * 1000:.0f} ms, n={len(values)})"
@@ -0,0 +1,531 @@
+"""
+LAN-Mehrspieler über UDP (ohne pygame).
+
+Der Host ist maßgeblich: er simuliert das Spiel (GameState) wie bei lokalen Spielern.
+Clients schicken nur ihre Lenkeingaben und bekommen pro Tick ein Delta zurück:
+
+    Client -> Host   JOIN, danach INPUT (Folgenummer, Zeitstempel, Lenk-Bits, Quittung)
+    Host -> Client   WELCOME, START (Einstellungen und Startaufstellung),
+                     STATE (Tick, Lebend-Bits, Köpfe und die neuen Trail-Punkte)
+
+Ein STATE enthält je Spieler nur die Punkte ab dem Stand, den der Client zuletzt
+quittiert hat (ähnlich wie Delta-Snapshots in Quake 3). Geht ein Paket verloren,
+steckt sein Inhalt automatisch im nächsten; ganze Spuren werden nie übertragen.
+Koordinaten werden auf 1/QUANT Pixel gerundet und als uint16 verschickt.
+
+Zum Testen ohne zweiten Rechner simuliert Endpoint Paketverlust und Verzögerung,
+und --selftest spielt Host und Clients über 127.0.0.1 gegeneinander:
+
+    python tron_net.py --selftest --clients 2 --loss 0.2 --delay 0.05
+"""
+import argparse
+import heapq
+import random
+import socket
+import struct
+import time
+
+from tron_engine import GameState, Player, Trail
+
+PORT = 47800
+# Koordinaten werden in 1/QUANT Pixel übertragen (uint16: Welten bis ca. 16000 Pixel)
+QUANT = 4
+# Größte Weltbreite bzw. -höhe, deren Koordinaten sich noch verlustfrei übertragen lassen
+MAX_WORLD_SIZE = 0xFFFF // QUANT
+# Obergrenze für Trail-Punkte pro STATE-Paket (hält Pakete unter ca. 1200 Bytes)
+MAX_PACKET_POINTS = 280
+# So viele unquittierte STATE-Stände merkt sich der Host pro Client
+MAX_UNACKED = 256
+NO_ACK = 0xFFFFFFFF
+
+MSG_JOIN, MSG_WELCOME, MSG_START, MSG_INPUT, MSG_STATE = range(1, 6)
+
+JOIN = struct.Struct("<B")
+WELCOME = struct.Struct("<B")
+# Typ, Match, eigener Spielerindex, Weltbreite, Welthöhe, Zoom, Geschwindigkeit, Spielerzahl
+START = struct.Struct("<BBBdddHB")
+# Startposition, Farbe und Schlangenbreite je Spieler
+START_PLAYER = struct.Struct("<ddBBBB")
+# Typ, Folgenummer, Zeitstempel (ms), Lenk-Bits, quittierter Tick
+INPUT = struct.Struct("<BIIBI")
+# Typ, Match, Tick, zurückgeschickter Zeitstempel, Haltezeit beim Host (ms), Lebend-Bits, Spielerzahl
+STATE = struct.Struct("<BBIIHQB")
+# Kopf (quantisiert), Index des ersten Punktes, Anzahl Punkte
+STATE_PLAYER = struct.Struct("<HHIH")
+POINT = struct.Struct("<HH")
+
+
+def quantize(v):
+    return max(0, min(0xFFFF, int(round(v * QUANT))))
+
+
+class NetStats:
+    """Zählt Bytes und Pakete und berechnet daraus sekündlich die Bandbreite."""
+    def __init__(self):
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.packets_in = 0
+        self.packets_out = 0
+        self.rate_in = 0.0
+        self.rate_out = 0.0
+        self.rtt = None  # geglättete Round-Trip-Zeit in Sekunden (nur Client)
+        self.lost_states = 0  # beim Client nie angekommene STATE-Ticks
+        self._window_start = time.perf_counter()
+        self._window_in = 0
+        self._window_out = 0
+
+    def _roll(self):
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.rate_in = self._window_in / elapsed
+            self.rate_out = self._window_out / elapsed
+            self._window_start = now
+            self._window_in = 0
+            self._window_out = 0
+
+    def sent(self, size):
+        self.bytes_out += size
+        self.packets_out += 1
+        self._window_out += size
+        self._roll()
+
+    def received(self, size):
+        self.bytes_in += size
+        self.packets_in += 1
+        self._window_in += size
+        self._roll()
+
+    def add_rtt(self, rtt):
+        self.rtt = rtt if self.rtt is None else self.rtt * 0.9 + rtt * 0.1
+
+    def text(self, speed=None):
+        line = f"Netz: {self.rate_out / 1024:.1f} kB/s hoch, {self.rate_in / 1024:.1f} kB/s runter"
+        if self.rtt is not None:
+            line += f", RTT {self.rtt * 1000:.0f} ms"
+            if speed:
+                line += f" ({self.rtt * speed:.1f} Ticks)"
+        if self.lost_states:
+            line += f", {self.lost_states} Ticks verpasst"
+        return line
+
+
+class Endpoint:
+    """
+    Nicht blockierender UDP-Socket. Mit 'loss', 'delay' und 'jitter' (Sekunden) werden
+    ausgehende Pakete zufällig verworfen bzw. verzögert, um ein schlechtes Netz nachzustellen.
+    """
+    def __init__(self, bind=("0.0.0.0", 0), loss=0.0, delay=0.0, jitter=0.0, seed=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(bind)
+        self.loss = loss
+        self.delay = delay
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.queue = []  # (Sendezeitpunkt, Nummer, Daten, Adresse)
+        self.counter = 0
+        self.stats = NetStats()
+
+    @property
+    def address(self):
+        return self.sock.getsockname()
+
+    def send(self, data, addr):
+        self.stats.sent(len(data))
+        if self.loss and self.rng.random() < self.loss:
+            return
+        if self.delay or self.jitter:
+            due = time.perf_counter() + self.delay + self.rng.uniform(0, self.jitter)
+            self.counter += 1
+            heapq.heappush(self.queue, (due, self.counter, data, addr))
+        else:
+            self._sendto(data, addr)
+
+    def _sendto(self, data, addr):
+        try:
+            self.sock.sendto(data, addr)
+        except OSError:
+            pass  # z. B. Ziel nicht erreichbar; UDP garantiert ohnehin nichts
+
+    def flush(self):
+        """Verschickt alle verzögerten Pakete, deren Zeit gekommen ist."""
+        now = time.perf_counter()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self.queue)
+            self._sendto(data, addr)
+
+    def receive(self):
+        """Liefert alle bereits angekommenen Pakete als Liste von (Daten, Adresse)."""
+        self.flush()
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionResetError:
+                continue  # Windows meldet so ein früheres "Port nicht erreichbar"
+            self.stats.received(len(data))
+            packets.append((data, addr))
+        return packets
+
+    def close(self):
+        self.sock.close()
+
+
+class RemoteClient:
+    """Ein beim Host angemeldeter Client und sein Übertragungsstand."""
+    def __init__(self, addr):
+        self.addr = addr
+        self.player = None
+        self.last_seq = -1
+        self.last_stamp = 0
+        self.stamp_time = 0.0
+        self.acked_tick = None
+        self.baseline = None  # Trail-Längen, die der Client sicher hat
+        self.sent = {}  # Tick -> Trail-Längen nach diesem STATE
+
+
+class NetHost:
+    """
+    Maßgeblicher Host. poll() in jedem Frame aufrufen (Anmeldungen und Eingaben),
+    start() zu Beginn eines Matches und broadcast() nach jedem GameState.step().
+    """
+    def __init__(self, port=PORT, endpoint=None):
+        self.endpoint = endpoint or Endpoint(("0.0.0.0", port))
+        self.clients = {}  # Adresse -> RemoteClient
+        self.state = None
+        self.match = 0
+        self.speed = 0
+        self.start_packets = {}
+
+    @property
+    def stats(self):
+        return self.endpoint.stats
+
+    def poll(self):
+        """
+        Verarbeitet eingegangene Pakete. Gibt die Liste der neu angemeldeten Clients
+        zurück; der Aufrufer legt für sie Spieler an (client.player).
+        """
+        joined = []
+        for data, addr in self.endpoint.receive():
+            if not data:
+                continue
+            kind = data[0]
+            client = self.clients.get(addr)
+            if kind == MSG_JOIN:
+                if client is None:
+                    if self.state is not None:
+                        continue  # Während eines Matches kann niemand einsteigen
+                    client = RemoteClient(addr)
+                    self.clients[addr] = client
+                    joined.append(client)
+                self.endpoint.send(WELCOME.pack(MSG_WELCOME), addr)
+            elif kind == MSG_INPUT and client is not None and len(data) >= INPUT.size:
+                _, seq, stamp, bits, ack = INPUT.unpack_from(data)
+                if seq <= client.last_seq:
+                    continue  # veraltet oder doppelt
+                client.last_seq = seq
+                client.last_stamp = stamp
+                client.stamp_time = time.perf_counter()
+                if client.player is not None and self.state is not None:
+                    client.player.turn_left = bool(bits & 1)
+                    client.player.turn_right = bool(bits & 2)
+                if ack != NO_ACK:
+                    self._acknowledge(client, ack)
+        return joined
+
+    def _acknowledge(self, client, tick):
+        lengths = client.sent.get(tick)
+        if lengths is None:
+            return
+        client.acked_tick = tick
+        client.baseline = lengths
+        for t in [t for t in client.sent if t <= tick]:
+            del client.sent[t]
+
+    def start(self, state, speed):
+        """Beginnt ein Match: merkt sich den Zustand und schickt allen Clients START."""
+        if max(state.world_width, state.world_height) > MAX_WORLD_SIZE:
+            raise ValueError(f"Welt von {state.world_width:.0f}x{state.world_height:.0f} Pixeln ist für das "
+                             f"Netzwerkspiel zu groß (höchstens {MAX_WORLD_SIZE} Pixel pro Richtung)")
+        self.state = state
+        self.speed = speed
+        self.match = (self.match + 1) % 256
+        players = state.players
+        lengths = [len(p.trail) for p in players]
+        self.start_packets = {}
+        for client in self.clients.values():
+            client.acked_tick = None
+            client.baseline = lengths
+            client.sent = {}
+            if client.player not in players:
+                continue
+            packet = bytearray(START.pack(MSG_START, self.match, players.index(client.player), state.world_width,
+                                          state.world_height, state.zoom, speed, len(players)))
+            for p in players:
+                x, y = p.trail[0]
+                r, g, b = p.color or (255, 255, 255)
+                packet += START_PLAYER.pack(x, y, r, g, b, p.circle_size)
+            self.start_packets[client.addr] = bytes(packet)
+            self.endpoint.send(self.start_packets[client.addr], client.addr)
+
+    def stop(self):
+        """Beendet das Match; danach können sich wieder neue Clients anmelden."""
+        self.state = None
+
+    def broadcast(self):
+        """Schickt jedem Client den aktuellen Tick mit den für ihn neuen Trail-Punkten."""
+        state = self.state
+        if state is None:
+            return
+        players = state.players
+        n = len(players)
+        alive = 0
+        for i, p in enumerate(players):
+            if p.alive:
+                alive |= 1 << i
+        lengths = [len(p.trail) for p in players]
+        per_player = max(4, MAX_PACKET_POINTS // max(1, n))
+        now = time.perf_counter()
+        for client in self.clients.values():
+            if client.addr not in self.start_packets:
+                continue
+            if client.acked_tick is None and state.tick % 5 == 0:
+                # START könnte verloren gegangen sein, bis zur ersten Quittung wiederholen
+                self.endpoint.send(self.start_packets[client.addr], client.addr)
+            hold = min(0xFFFF, int((now - client.stamp_time) * 1000)) if client.last_stamp else 0
+            packet = bytearray(STATE.pack(MSG_STATE, self.match, state.tick, client.last_stamp, hold, alive, n))
+            after = []
+            for i, p in enumerate(players):
+                start = client.baseline[i]
+                count = min(lengths[i] - start, per_player)
+                packet += STATE_PLAYER.pack(quantize(p.head[0]), quantize(p.head[1]), start, count)
+                c = p.trail.coords()
+                for k in range(2 * start, 2 * (start + count), 2):
+                    packet += POINT.pack(quantize(c[k]), quantize(c[k + 1]))
+                after.append(start + count)
+            client.sent[state.tick] = after
+            if len(client.sent) > MAX_UNACKED:
+                del client.sent[min(client.sent)]
+            self.endpoint.send(bytes(packet), client.addr)
+
+    def close(self):
+        self.endpoint.close()
+
+
+class NetClient:
+    """
+    Client: rekonstruiert die Spieler (Spuren, Köpfe, Lebend-Status) aus den Deltas
+    des Hosts. poll() und send_input() in jedem Frame aufrufen.
+    """
+    JOIN_INTERVAL = 0.5
+
+    def __init__(self, host_addr, endpoint=None):
+        self.host_addr = host_addr
+        self.endpoint = endpoint or Endpoint()
+        self.welcomed = False
+        self.last_join = 0.0
+        self.match = None
+        self.players = None
+        self.me = None
+        self.world_width = self.world_height = self.zoom = None
+        self.speed = 0
+        self.tick = -1
+        self.ack = NO_ACK
+        self.seq = 0
+        self.clock_start = time.perf_counter()
+
+    @property
+    def stats(self):
+        return self.endpoint.stats
+
+    def _now_ms(self):
+        return int((time.perf_counter() - self.clock_start) * 1000) + 1
+
+    def poll(self):
+        if not self.welcomed and time.perf_counter() - self.last_join >= self.JOIN_INTERVAL:
+            self.last_join = time.perf_counter()
+            self.endpoint.send(JOIN.pack(MSG_JOIN), self.host_addr)
+        for data, addr in self.endpoint.receive():
+            if addr != self.host_addr or not data:
+                continue
+            kind = data[0]
+            if kind == MSG_WELCOME:
+                self.welcomed = True
+            elif kind == MSG_START:
+                self._start(data)
+            elif kind == MSG_STATE:
+                self._state(data)
+
+    def _start(self, data):
+        _, match, me, world_width, world_height, zoom, speed, n = START.unpack_from(data)
+        if match == self.match:
+            return  # Wiederholung eines bereits bekannten START
+        self.welcomed = True
+        self.match = match
+        self.me = me
+        self.world_width = world_width
+        self.world_height = world_height
+        self.zoom = zoom
+        self.speed = speed
+        players = []
+        pos = START.size
+        for _ in range(n):
+            x, y, r, g, b, size = START_PLAYER.unpack_from(data, pos)
+            pos += START_PLAYER.size
+            p = Player("network", (r, g, b), [x, y], (0, 0))
+            p.trail = Trail([(x, y)])
+            p.circle_size = size
+            players.append(p)
+        self.players = players
+        self.tick = -1
+        self.ack = NO_ACK
+
+    def _state(self, data):
+        _, match, tick, echo, hold, alive, n = STATE.unpack_from(data)
+        if match != self.match or self.players is None or tick <= self.tick:
+            return  # anderes Match, noch kein START oder veraltet
+        if echo:
+            self.stats.add_rtt(max(0, self._now_ms() - echo - hold) / 1000)
+        if self.tick >= 0 and tick > self.tick + 1:
+            self.stats.lost_states += tick - self.tick - 1
+        self.tick = tick
+        complete = True
+        pos = STATE.size
+        for i in range(n):
+            hx, hy, start, count = STATE_PLAYER.unpack_from(data, pos)
+            pos += STATE_PLAYER.size
+            p = self.players[i]
+            have = len(p.trail)
+            if start > have:
+                # Ein früheres Paket fehlt; die Punkte kommen mit dem nächsten STATE erneut
+                complete = False
+            else:
+                for k in range(have - start, count):
+                    x, y = POINT.unpack_from(data, pos + k * POINT.size)
+                    p.trail.append(x / QUANT, y / QUANT)
+            pos += count * POINT.size
+            p.head = [hx / QUANT, hy / QUANT]
+            p.alive = bool(alive >> i & 1)
+        if complete:
+            self.ack = tick
+
+    def send_input(self, turn_left, turn_right):
+        """Schickt den aktuellen Lenkzustand (und die Quittung für den letzten STATE)."""
+        if self.players is None:
+            return
+        self.seq += 1
+        bits = (1 if turn_left else 0) | (2 if turn_right else 0)
+        self.endpoint.send(INPUT.pack(MSG_INPUT, self.seq, self._now_ms(), bits, self.ack), self.host_addr)
+
+    def close(self):
+        self.endpoint.close()
+
+
+def parse_address(text, default_port=PORT):
+    """'host' oder 'host:port' -> (IP, Port)."""
+    host, _, port = text.partition(":")
+    return socket.gethostbyname(host or "127.0.0.1"), int(port) if port else default_port
+
+
+def selftest(num_clients=2, ticks=300, speed=30, loss=0.2, delay=0.05, jitter=0.02, seed=0):
+    """
+    Host und Clients im selben Prozess über 127.0.0.1. Die Clients lenken zufällig,
+    am Ende müssen ihre Spuren (bis auf die Quantisierung) denen des Hosts entsprechen.
+    """
+    rng = random.Random(seed)
+    host = NetHost(endpoint=Endpoint(("127.0.0.1", 0), loss, delay, jitter, seed))
+    clients = [NetClient(host.endpoint.address, Endpoint(("127.0.0.1", 0), loss, delay, jitter, seed + i + 1))
+               for i in range(num_clients)]
+    players = []
+    deadline = time.perf_counter() + 10
+    while len(players) < num_clients and time.perf_counter() < deadline:
+        for c in clients:
+            c.poll()
+        for rc in host.poll():
+            rc.player = Player("network", None, [0, 0], (0, 0))
+            players.append(rc.player)
+        time.sleep(0.01)
+    if len(players) < num_clients:
+        print("Nicht alle Clients konnten sich anmelden")
+        return False
+    # Feste Startaufstellung mit Abstand, damit das Match nicht sofort endet
+    width, height = 1920, 1080
+    for i, p in enumerate(players):
+        p.head = [width * (i + 1) / (num_clients + 1), height / 2]
+        p.trail = Trail([tuple(p.head)])
+        p.angle = rng.uniform(0, 6.28)
+    state = GameState(players, width, height, 1.0, seed=seed)
+    host.start(state, speed)
+
+    tick_time = 1.0 / speed
+    next_tick = time.perf_counter()
+    steering = [(False, False)] * num_clients
+    # Nach den Ticks noch eine Weile weiterlaufen lassen, bis alle Deltas angekommen sind
+    drain_until = None
+    while True:
+        now = time.perf_counter()
+        for c in clients:
+            c.poll()
+        host.poll()
+        if now >= next_tick:
+            next_tick += tick_time
+            for i, c in enumerate(clients):
+                if rng.random() < 0.05:
+                    steering[i] = rng.choice([(False, False), (True, False), (False, True)])
+                c.send_input(*steering[i])
+            if state.tick < ticks:
+                state.step()
+                # Niemand scheidet aus, damit die Spuren über alle Ticks wachsen
+                for p in players:
+                    p.alive = True
+            elif drain_until is None:
+                drain_until = now + 1.0 + 4 * (delay + jitter)
+            host.broadcast()
+        if drain_until is not None and now >= drain_until:
+            break
+        time.sleep(0.002)
+
+    ok = True
+    for ci, c in enumerate(clients):
+        for i, (hp, cp) in enumerate(zip(players, c.players)):
+            host_points = [(quantize(x), quantize(y)) for x, y in hp.trail]
+            client_points = [(int(round(x * QUANT)), int(round(y * QUANT))) for x, y in cp.trail]
+            if host_points != client_points:
+                ok = False
+                print(f"Client {ci + 1}: Spur von Spieler {i + 1} weicht ab "
+                      f"({len(client_points)} statt {len(host_points)} Punkte)")
+        print(f"Client {ci + 1}: Tick {c.tick}, {c.stats.text(speed)}, "
+              f"{c.stats.bytes_in} Bytes empfangen in {c.stats.packets_in} Paketen")
+    total_points = sum(len(p.trail) for p in players)
+    print(f"Host: {state.tick} Ticks, {total_points} Trail-Punkte, {host.stats.bytes_out} Bytes gesendet "
+          f"({host.stats.bytes_out / max(1, state.tick * num_clients):.0f} Bytes pro Tick und Client)")
+    print("Selbsttest " + ("bestanden" if ok else "FEHLGESCHLAGEN"))
+    host.close()
+    for c in clients:
+        c.close()
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LAN-Protokoll von Tron testen")
+    parser.add_argument("--selftest", action="store_true", help="Host und Clients über Loopback testen")
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--speed", type=int, default=30)
+    parser.add_argument("--loss", type=float, default=0.2, help="Anteil verworfener Pakete (0 bis 1)")
+    parser.add_argument("--delay", type=float, default=0.05, help="Verzögerung pro Paket in Sekunden")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Zusätzliche zufällige Verzögerung in Sekunden")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.selftest:
+        ok = selftest(args.clients, args.ticks, args.speed, args.loss, args.delay, args.jitter, args.seed)
+        raise SystemExit(0 if ok else 1)
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
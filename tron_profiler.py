@@ -0,0 +1,197 @@
+"""
+Leichter Frame-Profiler für Spiel und Menü.
+
+Jede Phase eines Frames (Events, Simulation, Trails, Köpfe, HUD, Bildschirm, Warten)
+wird mit profiler.phase(name) eingeklammert. Ist der Profiler aus, liefert phase()
+ein gemeinsames Dummy-Objekt ohne Zeitmessung, der Aufwand bleibt also bei einem
+Funktionsaufruf pro Phase.
+
+Eingeschaltet sammelt er die letzten Frames für ein Overlay (Frame-Zeit-Graph und
+Aufschlüsselung nach Phasen) und eine Zeitleiste im Chrome-Trace-Format, die sich
+in chrome://tracing oder Perfetto öffnen lässt.
+"""
+import json
+import time
+from collections import deque
+
+import pygame
+
+# Farben für die Phasen im Graph (werden der Reihe nach vergeben)
+PHASE_COLORS = [
+    (100, 255, 100), (255, 100, 100), (100, 100, 255), (255, 255, 100),
+    (255, 100, 255), (100, 255, 255), (255, 180, 80), (180, 180, 180),
+]
+# Obergrenze für gespeicherte Trace-Ereignisse (ca. eine Minute bei 60 FPS und 15 Phasen).
+# Ist sie erreicht, fallen die ältesten heraus, damit Ruckler spät im Match erhalten bleiben.
+MAX_TRACE_EVENTS = 60 * 60 * 15
+
+
+class _NullPhase:
+    """Wird bei ausgeschaltetem Profiler statt einer Messung zurückgegeben."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start, self.start)
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, history=120):
+        self.enabled = False
+        self.history = deque(maxlen=history)  # (Frame-Dauer, {Phase: Dauer})
+        self.trace = deque(maxlen=MAX_TRACE_EVENTS)
+        self.origin = time.perf_counter()
+        self.colors = {}
+        self.frame_start = None
+        self.current = {}
+        self.lines = []
+        self.frames_since_text = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_start = None
+        self.current = {}
+        if self.enabled:
+            # Alte Frames (z. B. aus dem Menü) nicht mit der neuen Messung vermischen
+            self.history.clear()
+            self.lines = []
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add(self, name, duration, start=None):
+        """
+        Bucht 'duration' Sekunden auf die Phase 'name'. Mit 'start' (perf_counter-Zeit)
+        landet die Phase zusätzlich in der Trace-Zeitleiste.
+        """
+        if not self.enabled:
+            return
+        self.current[name] = self.current.get(name, 0.0) + duration
+        if start is not None:
+            self.trace.append({
+                "name": name, "ph": "X", "pid": 0, "tid": 0,
+                "ts": (start - self.origin) * 1e6, "dur": duration * 1e6,
+            })
+
+    def add_sequence(self, start, parts):
+        """
+        Bucht mehrere aufsummierte Teilphasen (z. B. Drehung/Bewegung/Kollision über alle
+        Spieler). In der Zeitleiste werden sie nacheinander ab 'start' dargestellt.
+        """
+        t = start
+        for name, duration in parts:
+            self.add(name, duration, t)
+            t += duration
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = time.perf_counter()
+        self.current = {}
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        now = time.perf_counter()
+        duration = now - self.frame_start
+        self.history.append((duration, self.current))
+        self.trace.append({
+            "name": "frame", "ph": "X", "pid": 0, "tid": 1,
+            "ts": (self.frame_start - self.origin) * 1e6, "dur": duration * 1e6,
+        })
+        self.frames_since_text += 1
+
+    def color(self, name):
+        c = self.colors.get(name)
+        if c is None:
+            c = PHASE_COLORS[len(self.colors) % len(PHASE_COLORS)]
+            self.colors[name] = c
+        return c
+
+    def summary_lines(self):
+        """Durchschnitt je Phase über die gespeicherten Frames, in Millisekunden."""
+        if not self.history:
+            return []
+        totals = {}
+        frame_total = 0.0
+        for duration, phases in self.history:
+            frame_total += duration
+            for name, d in phases.items():
+                totals[name] = totals.get(name, 0.0) + d
+        n = len(self.history)
+        lines = [f"Frame {frame_total / n * 1000:.2f} ms"]
+        for name, total in sorted(totals.items(), key=lambda item: -item[1]):
+            lines.append(f"{name} {total / n * 1000:.2f} ms")
+        return lines
+
+    def draw_overlay(self, surface, font, text_cache, pos=(10, 60), size=(240, 80), budget=1 / 30):
+        """
+        Zeichnet den Frame-Zeit-Graph (gestapelt nach Phasen) und darunter die
+        Aufschlüsselung. 'budget' (Sekunden) entspricht der vollen Graph-Höhe.
+        Gibt das Rechteck des Overlays zurück.
+        """
+        x0, y0 = pos
+        w, h = size
+        # Texte nur alle 30 Frames neu aufbauen, damit sie im Text-Cache bleiben
+        if self.frames_since_text >= 30 or not self.lines:
+            self.lines = self.summary_lines()
+            self.frames_since_text = 0
+        line_height = font.get_linesize()
+        area = pygame.Rect(x0, y0, w, h + line_height * len(self.lines) + 4)
+        surface.fill((0, 0, 0), area)
+        pygame.draw.rect(surface, (50, 50, 50), (x0, y0, w, h), 1)
+        bar_w = max(1, w // max(1, self.history.maxlen))
+        for i, (_, phases) in enumerate(self.history):
+            x = x0 + i * bar_w
+            y = y0 + h
+            for name, d in phases.items():
+                if "." in name:
+                    continue  # Teilphasen (z. B. sim.move) stecken schon in ihrer Oberphase
+                bar_h = int(d / budget * h)
+                if bar_h <= 0:
+                    continue
+                bar_h = min(bar_h, y - y0)
+                pygame.draw.rect(surface, self.color(name), (x, y - bar_h, bar_w, bar_h))
+                y -= bar_h
+        y = y0 + h + 4
+        for line in self.lines:
+            name = line.split(" ", 1)[0]
+            color = self.colors.get(name, (255, 255, 255))
+            surface.blit(text_cache.render(font, line, color), (x0, y))
+            y += line_height
+        return area
+
+    def export_trace(self, path):
+        """
+        Schreibt die Zeitleiste im Chrome-Trace-Format (JSON). Bei langen Sitzungen
+        enthält sie nur die letzten MAX_TRACE_EVENTS Ereignisse.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": list(self.trace), "displayTimeUnit": "ms"}, f)
+        return len(self.trace)
+
+
+profiler = FrameProfiler()
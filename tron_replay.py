@@ -0,0 +1,317 @@
+"""
+Aufzeichnung und Wiedergabe von Matches über die Eingaben.
+
+Ein Match ist durch Seed, Einstellungen, Startaufstellung und die Lenkeingaben pro
+Tick vollständig festgelegt (siehe GameState(seed=...)). Statt eines Videos wird
+deshalb nur das gespeichert:
+
+    Kopf     b"OTRP", Version, Seed, Weltgröße, Zoom, Geschwindigkeit,
+             Schlangenbreite, Drehgeschwindigkeit, Spielerzahl, Flags (ab Version 2),
+             bei gesetztem FLAG_DECAY die Spurlänge als Varint (ab Version 5)
+    Spieler  Startposition und Startrichtung je Spieler (bis Version 3 starteten alle
+             Spieler nach rechts, die gespeicherte Richtung wurde nicht verwendet)
+    Eingaben Lauflängen-kodiert: (Anzahl Ticks, Zustand) als Varints, wobei im
+             Zustand Bit 2*i für turn_left und Bit 2*i+1 für turn_right von Spieler i steht.
+             Ab Version 3 folgen darüber (ab Bit 2*n) je Taste drei Bits für Lenkstärken
+             unter einem vollen Tick (INPUT_STEPS - Stufe, 0 = volle Drehung); solange nur
+             ganze Ticks gelenkt wird, sind sie 0 und der Zustand so kurz wie zuvor.
+
+Eine Minute Spiel mit zwei Spielern belegt so meist nur einige hundert Bytes.
+Die Wiedergabe simuliert das Match neu, in Echtzeit (tron_v0.7.py --replay) oder
+so schnell wie möglich (dieses Skript). Springen zu einem Tick spult vom letzten
+Snapshot davor (siehe GameState.snapshot()) bzw. vom aktuellen Stand aus vor; im
+Zerfallsmodus gibt es keine Snapshots, rückwärts wird dann von Tick 0 an neu simuliert.
+
+Beispiel:
+    python tron_replay.py replays/tron_20250101_120000.otr --seek 900
+"""
+import argparse
+import struct
+import time
+
+from tron_engine import BLOCK_SIZE, INPUT_STEPS, GameState, Player, Trail
+
+MAGIC = b"OTRP"
+VERSION = 5
+# Seed, Weltbreite, Welthöhe, Zoom, Geschwindigkeit, Schlangenbreite, Drehgeschwindigkeit, Spielerzahl
+HEADER = struct.Struct("<QdddHHdH")
+# Bits im Flags-Byte (Version 2)
+FLAG_SIMPLIFY = 1
+# Zerfallende Spuren, die Länge folgt als Varint (Version 5)
+FLAG_DECAY = 2
+# Bits je Taste für Lenkstärken unter einem vollen Tick (Version 3)
+PARTIAL_BITS = (INPUT_STEPS - 1).bit_length()
+# Startposition (x, y) und Richtung (dx, dy)
+PLAYER = struct.Struct("<dddd")
+# Abstand der Snapshots, zu denen ReplayRunner.seek() zurückspringt
+KEYFRAME_TICKS = 300
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Aufzeichnung ist abgeschnitten")
+        b = data[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        if b < 0x80:
+            return value, pos
+        shift += 7
+
+
+def input_level(value):
+    """Lenkstärke (bool oder Anteil eines Ticks) als Stufe von 0 bis INPUT_STEPS."""
+    if not value:
+        return 0
+    return max(1, min(INPUT_STEPS, round(value * INPUT_STEPS)))
+
+
+def pack_inputs(inputs):
+    """Packt eine Liste (turn_left, turn_right) je Spieler in eine Zahl."""
+    inputs = list(inputs)
+    partial_base = 2 * len(inputs)
+    state = 0
+    for i, pair in enumerate(inputs):
+        for side, value in enumerate(pair):
+            level = input_level(value)
+            if level:
+                bit = 2 * i + side
+                state |= 1 << bit
+                state |= (INPUT_STEPS - level) << (partial_base + PARTIAL_BITS * bit)
+    return state
+
+
+def unpack_inputs(state, num_players):
+    """Gegenstück zu pack_inputs: volle Drehungen als True, andere als Anteil."""
+    partial_base = 2 * num_players
+    mask = (1 << PARTIAL_BITS) - 1
+    inputs = []
+    for i in range(num_players):
+        pair = []
+        for bit in (2 * i, 2 * i + 1):
+            if not state >> bit & 1:
+                pair.append(False)
+                continue
+            partial = state >> (partial_base + PARTIAL_BITS * bit) & mask
+            pair.append(True if partial == 0 else (INPUT_STEPS - partial) / INPUT_STEPS)
+        inputs.append(tuple(pair))
+    return inputs
+
+
+class Recording:
+    """Einstellungen, Startaufstellung und lauflängenkodierte Eingaben eines Matches."""
+    def __init__(self, seed, world_width, world_height, zoom, speed, snake_width, turn_speed, starts, runs=None,
+                 simplify=False, decay=None):
+        self.seed = seed
+        self.world_width = world_width
+        self.world_height = world_height
+        self.zoom = zoom
+        self.speed = speed
+        self.snake_width = snake_width
+        self.turn_speed = turn_speed
+        self.starts = starts  # Liste von (x, y, dx, dy)
+        self.runs = runs if runs is not None else []  # Liste von [Anzahl Ticks, Zustand]
+        self.simplify = simplify  # Vereinfachte Spuren (GameState(simplify=True))
+        self.decay = decay  # Spurlänge im Zerfallsmodus (GameState(decay=...)) oder None
+
+    @property
+    def num_players(self):
+        return len(self.starts)
+
+    @property
+    def ticks(self):
+        return sum(count for count, _ in self.runs)
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        out += HEADER.pack(self.seed, self.world_width, self.world_height, self.zoom, self.speed,
+                           self.snake_width, self.turn_speed, len(self.starts))
+        out.append((FLAG_SIMPLIFY if self.simplify else 0) | (FLAG_DECAY if self.decay is not None else 0))
+        if self.decay is not None:
+            _write_varint(out, self.decay)
+        for start in self.starts:
+            out += PLAYER.pack(*start)
+        for count, state in self.runs:
+            _write_varint(out, count)
+            _write_varint(out, state)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("Keine OpenTron-Aufzeichnung")
+        version = data[4]
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"Unbekannte Version {version}")
+        pos = 5
+        seed, world_width, world_height, zoom, speed, snake_width, turn_speed, num_players = \
+            HEADER.unpack_from(data, pos)
+        pos += HEADER.size
+        flags = 0
+        if version >= 2:
+            flags = data[pos]
+            pos += 1
+        decay = None
+        if flags & FLAG_DECAY:
+            decay, pos = _read_varint(data, pos)
+        starts = []
+        for _ in range(num_players):
+            x, y, dx, dy = PLAYER.unpack_from(data, pos)
+            if version < 4:
+                # Damals begann jeder Spieler mit Winkel 0, unabhängig von (dx, dy)
+                dx, dy = BLOCK_SIZE, 0.0
+            starts.append((x, y, dx, dy))
+            pos += PLAYER.size
+        runs = []
+        while pos < len(data):
+            count, pos = _read_varint(data, pos)
+            state, pos = _read_varint(data, pos)
+            runs.append([count, state])
+        return cls(seed, world_width, world_height, zoom, speed, snake_width, turn_speed, starts, runs,
+                   simplify=bool(flags & FLAG_SIMPLIFY), decay=decay)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def inputs(self, start=0):
+        """Liefert pro Tick ab Tick 'start' die Liste (turn_left, turn_right) je Spieler."""
+        n = self.num_players
+        for count, state in self.runs:
+            if start >= count:
+                start -= count
+                continue
+            inputs = unpack_inputs(state, n)
+            for _ in range(count - start):
+                yield inputs
+            start = 0
+
+
+class InputRecorder:
+    """
+    Zeichnet ein laufendes Match auf. record() wird vor jedem GameState.step()
+    aufgerufen und übernimmt die aktuellen Lenk-Flags der Spieler.
+    """
+    def __init__(self, players, seed, speed, world_width, world_height, zoom, simplify=False, decay=None):
+        starts = [(p.head[0], p.head[1], p.dx, p.dy) for p in players]
+        self.players = players
+        self.recording = Recording(seed, world_width, world_height, zoom, speed,
+                                   players[0].circle_size, players[0].turn_speed, starts, simplify=simplify,
+                                   decay=decay)
+
+    def record(self):
+        state = pack_inputs((p.turn_left, p.turn_right) for p in self.players)
+        runs = self.recording.runs
+        if runs and runs[-1][1] == state:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, state])
+
+
+class ReplayRunner:
+    """
+    Simuliert eine Aufzeichnung neu. step() führt den nächsten aufgezeichneten Tick aus,
+    seek() springt zu einem Tick. Alle KEYFRAME_TICKS Ticks wird ein Snapshot des
+    GameState festgehalten; rückwärts springt seek() zum letzten davor und spult nur
+    von dort vor. Im Zerfallsmodus (ohne Snapshots) beginnt es dafür wieder bei Tick 0.
+    """
+    def __init__(self, recording, colors=None):
+        self.recording = recording
+        self.colors = colors
+        self.keyframes = {}  # Tick -> Snapshot
+        self.rebuild()
+
+    def rebuild(self):
+        rec = self.recording
+        players = []
+        for i, (x, y, dx, dy) in enumerate(rec.starts):
+            color = self.colors[i % len(self.colors)] if self.colors else None
+            p = Player("replay", color, [x, y], (dx, dy))
+            p.trail = Trail([(x, y)])
+            p.circle_size = rec.snake_width
+            p.turn_speed = rec.turn_speed
+            players.append(p)
+        self.players = players
+        self.state = GameState(players, rec.world_width, rec.world_height, rec.zoom, seed=rec.seed,
+                               simplify=rec.simplify, decay=rec.decay)
+        self._inputs = rec.inputs()
+        self.keyframes = {0: self.state.snapshot()} if rec.decay is None else {}
+
+    @property
+    def tick(self):
+        return self.state.tick
+
+    def step(self):
+        """Führt einen Tick aus. Gibt False zurück, wenn die Aufzeichnung zu Ende ist."""
+        inputs = next(self._inputs, None)
+        if inputs is None:
+            return False
+        state = self.state
+        state.step(inputs)
+        if state.tick % KEYFRAME_TICKS == 0 and state.decay is None and state.tick not in self.keyframes:
+            self.keyframes[state.tick] = state.snapshot()
+        return True
+
+    def seek(self, tick):
+        """
+        Springt zu 'tick' (begrenzt auf die Länge der Aufzeichnung). Gibt True zurück,
+        wenn dafür zurückgesprungen wurde: Die Spieler-Objekte bleiben dieselben, ihre
+        Spuren wurden aber gekürzt (eine Darstellung muss neu aufgebaut werden). Im
+        Zerfallsmodus werden Spieler und GameState dabei neu angelegt.
+        """
+        back = tick < self.state.tick
+        if back and self.recording.decay is not None:
+            self.rebuild()
+        elif back:
+            start = max(t for t in self.keyframes if t <= max(tick, 0))
+            self.state.restore(self.keyframes[start])
+            # Spätere Snapshots gelten nach dem Zurücksetzen nicht mehr
+            self.keyframes = {t: s for t, s in self.keyframes.items() if t <= start}
+            self._inputs = self.recording.inputs(start)
+        while self.state.tick < tick and self.step():
+            pass
+        return back
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tron-Aufzeichnung ohne Fenster neu simulieren")
+    parser.add_argument("file")
+    parser.add_argument("--seek", type=int, default=None, help="Nur bis zu diesem Tick simulieren")
+    args = parser.parse_args(argv)
+
+    rec = Recording.load(args.file)
+    print(f"Seed {rec.seed}, {rec.num_players} Spieler, {rec.ticks} Ticks "
+          f"({rec.ticks / rec.speed:.1f}s bei {rec.speed} Ticks/s), {len(rec.runs)} Eingabe-Läufe")
+    runner = ReplayRunner(rec)
+    target = rec.ticks if args.seek is None else args.seek
+    death_ticks = [None] * rec.num_players
+    start = time.perf_counter()
+    while runner.tick < target and runner.step():
+        for i, p in enumerate(runner.players):
+            if not p.alive and death_ticks[i] is None:
+                death_ticks[i] = runner.tick
+    duration = time.perf_counter() - start
+    rate = runner.tick / duration if duration > 0 else float("inf")
+    print(f"Tick {runner.tick} erreicht in {duration:.3f}s ({rate:.0f} Ticks/s)")
+    for i, p in enumerate(runner.players):
+        status = "lebt" if p.alive else f"ausgeschieden in Tick {death_ticks[i]}"
+        print(f"  Spieler {i + 1}: {status}, Kopf ({p.head[0]:.1f}, {p.head[1]:.1f}), Spur {len(p.trail)} Punkte")
+
+
+if __name__ == "__main__":
+    main()
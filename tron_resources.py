@@ -0,0 +1,296 @@
+"""
+Gemeinsame Ressourcen der pygame-Oberfläche: Schriften, Text-Cache, Bilder und Musik.
+
+Beim Import wird nichts initialisiert. Die pygame-Subsysteme werden erst bei der
+ersten Benutzung gestartet (Mixer beim ersten Musikstück, Schriften beim ersten
+load_font), und jede dieser Phasen wird in 'startup' mitgemessen.
+"""
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pygame
+
+# Ergebnis der (langsamen) Systemschrift-Suche wird zwischen Programmstarts hier gespeichert
+FONT_CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "opentron", "fonts.json",
+)
+
+
+# --- Startzeit-Messung ---
+class StartupProfile:
+    """
+    Misst die Dauer der einzelnen Init-Phasen (Display, Schriften, Mixer, ...) und die
+    Zeit bis zum ersten gezeichneten Menü-Frame.
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []          # (Name, Dauer in Sekunden)
+        self.first_frame = None   # Sekunden seit Programmstart
+        self.report = False       # Bericht beim ersten Frame ausgeben
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - t0))
+
+    def frame_shown(self):
+        """Wird nach jedem Menü-Frame aufgerufen, zählt aber nur beim ersten Mal."""
+        if self.first_frame is not None:
+            return
+        self.first_frame = time.perf_counter() - self.start
+        if self.report:
+            print(self.summary())
+
+    def summary(self):
+        lines = [f"Erster Menü-Frame nach {self.first_frame * 1000:.1f} ms"]
+        for name, duration in self.phases:
+            lines.append(f"  {name:<20} {duration * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+startup = StartupProfile()
+
+
+# --- Schriften (Systemschrift-Suche mit Cache auf der Festplatte) ---
+_font_paths = None
+
+
+def _load_font_paths():
+    global _font_paths
+    if _font_paths is None:
+        try:
+            with open(FONT_CACHE_FILE, encoding="utf-8") as f:
+                _font_paths = json.load(f)
+        except (OSError, ValueError):
+            _font_paths = {}
+    return _font_paths
+
+
+def _save_font_paths():
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(_font_paths, f)
+    except OSError as e:
+        print(f"Schrift-Cache konnte nicht gespeichert werden: {e}")
+
+
+def load_font(name, size):
+    """
+    Wie pygame.font.SysFont, aber der Pfad zur Schriftdatei wird nur beim ersten Start
+    gesucht und danach aus FONT_CACHE_FILE gelesen. Wird keine passende Schrift gefunden,
+    kommt (wie bei SysFont) die pygame-Standardschrift zum Einsatz.
+    """
+    if not pygame.font.get_init():
+        with startup.phase("font.init"):
+            pygame.font.init()
+    paths = _load_font_paths()
+    path = paths.get(name)
+    if name not in paths or (path is not None and not os.path.exists(path)):
+        with startup.phase(f"match_font({name})"):
+            path = pygame.font.match_font(name)
+        paths[name] = path
+        _save_font_paths()
+    return pygame.font.Font(path, size)
+
+
+# --- Text-Cache (gerenderte Texte wiederverwenden) ---
+class TextCache:
+    """
+    LRU-begrenzter Cache für gerenderte Text-Surfaces, Schlüssel ist (Schrift, Text, Farbe).
+    Texte, die sich kaum ändern (Menü-Beschriftungen, Status), werden so nur einmal gerendert.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Am längsten nicht benutzter Eintrag
+        return surf
+
+
+class GlyphAtlas:
+    """
+    Einzeln vorgerenderte Zeichen (z. B. Ziffern) einer Schrift. Wechselnde Zahlen wie der
+    Timer werden aus diesen Glyphen zusammengesetzt, ohne neue Surfaces anzulegen.
+    """
+    def __init__(self, font, color, chars="0123456789"):
+        self.glyphs = {c: font.render(c, True, color) for c in chars}
+
+    def draw(self, surface, text, pos):
+        x, y = pos
+        for c in text:
+            glyph = self.glyphs[c]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return x
+
+
+# Gemeinsamer Cache für Buttons und alle Bildschirme
+text_cache = TextCache()
+
+
+# --- Asset-Cache (Bilder nur einmal laden und skalieren) ---
+class AssetManager:
+    """
+    Lädt jede Bilddatei aus dem Unterordner 'assets' nur einmal (bereits mit convert_alpha)
+    und merkt sich skalierte Varianten. Die Anzahl skalierter Varianten ist begrenzt,
+    die am längsten nicht benutzte fliegt zuerst raus.
+    """
+    def __init__(self, directory="assets", max_scaled=32):
+        self.directory = directory
+        self.max_scaled = max_scaled
+        self.images = {}
+        self.scaled = OrderedDict()
+
+    def image(self, filename):
+        image = self.images.get(filename)
+        if image is None:
+            path = os.path.join(self.directory, filename)
+            try:
+                image = pygame.image.load(path).convert_alpha()
+            except Exception as e:
+                # Fehler werden nicht gemerkt, damit ein späterer Versuch (z. B. nach set_mode) klappt
+                print(f"Fehler beim Laden von {path}: {e}")
+                return None
+            self.images[filename] = image
+        return image
+
+    def scale(self, image, size):
+        """
+        Liefert 'image' in der Größe 'size' (Breite, Höhe). Schlüssel ist das Quellbild
+        und die Zielgröße, damit z. B. Kopfbilder pro Zoomstufe nur einmal skaliert werden.
+        """
+        size = (int(size[0]), int(size[1]))
+        key = (image, size)
+        surf = self.scaled.get(key)
+        if surf is not None:
+            self.scaled.move_to_end(key)
+            return surf
+        surf = pygame.transform.scale(image, size)
+        self.scaled[key] = surf
+        if len(self.scaled) > self.max_scaled:
+            self.scaled.popitem(last=False)
+        return surf
+
+
+assets = AssetManager()
+
+
+# --- Musiksteuerung (blockiert den Game-Loop nicht) ---
+class AudioController:
+    """
+    Spielt Musikstücke als Sounds auf zwei reservierten Mixer-Kanälen. Das Dekodieren
+    der mp3-Dateien läuft in einem Hintergrund-Thread; Überblendungen übernimmt der
+    Mixer selbst (fadeout/fade_ms). update() muss einmal pro Frame aufgerufen werden
+    und startet ein angefordertes Stück, sobald es fertig geladen ist.
+    """
+    def __init__(self, directory="assets"):
+        self.directory = directory
+        self.sounds = {}      # Dateiname -> fertig dekodierter Sound
+        self.loading = {}     # Dateiname -> Future des Lade-Threads
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.channels = None
+        self.current = None   # (Dateiname, Kanal) des laufenden Stücks
+        self.requested = None # (Dateiname, Fade in ms), wartet noch aufs Laden
+
+    def _load(self, path):
+        return pygame.mixer.Sound(path)
+
+    def _ensure_mixer(self):
+        # Der Mixer wird erst gestartet, wenn wirklich Musik gebraucht wird
+        if not pygame.mixer.get_init():
+            with startup.phase("mixer.init"):
+                pygame.mixer.init()
+
+    def preload(self, filename):
+        """
+        Startet das Laden im Hintergrund, ohne abzuspielen.
+
+        :return: False, wenn der Mixer nicht gestartet werden konnte
+        """
+        try:
+            self._ensure_mixer()
+        except pygame.error as e:
+            print(f"Mixer konnte nicht gestartet werden: {e}")
+            return False
+        if filename not in self.sounds and filename not in self.loading:
+            path = os.path.join(self.directory, filename)
+            self.loading[filename] = self.executor.submit(self._load, path)
+        return True
+
+    def play(self, filename, fade_ms=0):
+        """
+        Fordert ein Musikstück in Endlosschleife an. Das aktuelle Stück wird über
+        'fade_ms' Millisekunden aus- und das neue gleichzeitig eingeblendet.
+        """
+        if self.current is not None and self.current[0] == filename:
+            self.requested = None
+            return
+        self.requested = (filename, fade_ms)
+        if not self.preload(filename):
+            # Ohne Mixer wird nie etwas geladen; sonst bliebe pending für immer True
+            self.requested = None
+            return
+        self.update()
+
+    @property
+    def pending(self):
+        """True, solange ein Stück lädt oder auf den Start wartet (update() muss dann weiter laufen)."""
+        return bool(self.loading) or self.requested is not None
+
+    def update(self):
+        # Fertig geladene Stücke übernehmen
+        for filename, future in list(self.loading.items()):
+            if future.done():
+                del self.loading[filename]
+                try:
+                    self.sounds[filename] = future.result()
+                except Exception as e:
+                    print(f"Fehler beim Laden der Musik '{os.path.join(self.directory, filename)}': {e}")
+                    if self.requested is not None and self.requested[0] == filename:
+                        self.requested = None
+        if self.requested is None or self.requested[0] not in self.sounds:
+            return
+        filename, fade_ms = self.requested
+        self.requested = None
+        try:
+            if self.channels is None:
+                pygame.mixer.set_reserved(2)
+                self.channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+            if self.current is not None:
+                old_channel = self.current[1]
+                if fade_ms > 0:
+                    old_channel.fadeout(fade_ms)
+                else:
+                    old_channel.stop()
+                channel = self.channels[1] if old_channel is self.channels[0] else self.channels[0]
+            else:
+                channel = self.channels[0]
+            channel.play(self.sounds[filename], loops=-1, fade_ms=fade_ms)
+            self.current = (filename, channel)
+        except pygame.error as e:
+            print(f"Fehler beim Abspielen der Musik '{filename}': {e}")
+
+
+audio = AudioController()
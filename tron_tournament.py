@@ -0,0 +1,181 @@
+"""
+Turnier-Runner: spielt viele Matches ohne Fenster parallel auf allen CPU-Kernen.
+
+Gedacht zum Abstimmen der Standardeinstellungen (Geschwindigkeit, Schlangenbreite,
+Drehgeschwindigkeit wie im Startmenü) und zum Vergleich der Bots. Jede Kombination
+der angegebenen Werte wird mit --matches Seeds gespielt (Matches wie in tron_headless).
+
+Die Ergebnisse werden pro Match sofort als eine JSON-Zeile an die Ergebnisdatei
+angehängt (Einstellungen, Sieger, Dauer, Tick jedes Ausscheidens, Spurlängen).
+Wird der Lauf abgebrochen, setzt derselbe Aufruf ihn fort: Matches, die schon in der
+Datei stehen, werden übersprungen.
+
+Mit --bots random sind die Ergebnisse allein durch Seed und Einstellungen festgelegt.
+Die Lookahead-Bots (--bots ai) rechnen mit einem Zeitbudget pro Tick, ihre Ergebnisse
+hängen deshalb auch von der Rechnerlast ab.
+
+Beispiel:
+    python tron_tournament.py --players 2 4 --speed 10 15 20 25 --snake-width 8 10 12 14 \\
+        --turn-speed 0.1 0.2 0.3 0.4 --matches 50 --out turnier.jsonl
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+from tron_engine import GAME_DURATION
+from tron_headless import run_match
+
+
+def match_key(config):
+    """Eindeutiger Schlüssel eines Matches (zum Überspringen beim Fortsetzen)."""
+    return (f"p{config['players']}-v{config['speed']}-w{config['snake_width']}-"
+            f"t{config['turn_speed']}-{config['bots']}-z{config['zoom']}-"
+            f"{config['width']}x{config['height']}-n{config['ticks']}-s{config['seed']}")
+
+
+def sweep(args):
+    """Alle Match-Konfigurationen der Parameter-Kombinationen, in fester Reihenfolge."""
+    configs = []
+    for players, speed, snake_width, turn_speed, bots in itertools.product(
+            args.players, args.speed, args.snake_width, args.turn_speed, args.bots):
+        for seed in range(args.seed, args.seed + args.matches):
+            config = {
+                "players": players,
+                "speed": speed,
+                "snake_width": snake_width,
+                "turn_speed": turn_speed,
+                "bots": bots,
+                "zoom": args.zoom,
+                "width": args.width,
+                "height": args.height,
+                # Ohne --ticks höchstens ein volles Match bei dieser Geschwindigkeit
+                "ticks": args.ticks or GAME_DURATION * speed,
+                "seed": seed,
+            }
+            config["key"] = match_key(config)
+            configs.append(config)
+    return configs
+
+
+def play(config):
+    """Spielt ein Match (läuft im Worker-Prozess) und gibt die Ergebniszeile zurück."""
+    res = run_match(config["players"], config["ticks"], config["seed"], config["width"], config["height"],
+                    config["zoom"], config["snake_width"], config["turn_speed"], ai=config["bots"] == "ai")
+    result = dict(config)
+    result.update({
+        "winner": res["winner"],
+        "duration_ticks": res["ticks"],
+        "seconds": res["seconds"],
+        "death_ticks": res["death_ticks"],
+        "trail_lengths": res["trail_lengths"],
+    })
+    return result
+
+
+def load_results(path):
+    """
+    Liest die bisherigen Ergebnisse. Eine unvollständige letzte Zeile (Abbruch beim
+    Schreiben) wird ignoriert; das Match wird dann einfach noch einmal gespielt.
+    """
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            results[result["key"]] = result
+    return results
+
+
+def ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def summarize(results):
+    """Gibt je Einstellung Matchzahl, mittlere Dauer, Unentschieden und Siege je Startplatz aus."""
+    groups = {}
+    for r in results:
+        group = (r["players"], r["speed"], r["snake_width"], r["turn_speed"], r["bots"])
+        groups.setdefault(group, []).append(r)
+    print("Spieler  Tempo  Breite  Drehung  Bots    Matches  Dauer (Ticks)  Unentsch.  Siege je Platz")
+    for group in sorted(groups):
+        rs = groups[group]
+        players, speed, snake_width, turn_speed, bots = group
+        wins = [0] * players
+        draws = 0
+        for r in rs:
+            if r["winner"] is None:
+                draws += 1
+            else:
+                wins[r["winner"]] += 1
+        duration = sum(r["duration_ticks"] for r in rs) / len(rs)
+        print(f"{players:7d}  {speed:5d}  {snake_width:6d}  {turn_speed:7.2f}  {bots:6s}  {len(rs):7d}  "
+              f"{duration:13.0f}  {draws / len(rs):8.0%}   {wins}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Viele Tron-Matches parallel ohne Fenster spielen")
+    parser.add_argument("--players", type=int, nargs="+", default=[2])
+    parser.add_argument("--speed", type=int, nargs="+", default=[15],
+                        help="Ticks pro Sekunde (bestimmt mit GAME_DURATION die maximale Matchlänge)")
+    parser.add_argument("--snake-width", type=int, nargs="+", default=[10])
+    parser.add_argument("--turn-speed", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--bots", choices=["random", "ai"], nargs="+", default=["random"])
+    parser.add_argument("--matches", type=int, default=10, help="Seeds pro Kombination")
+    parser.add_argument("--seed", type=int, default=0, help="Erster Seed")
+    parser.add_argument("--ticks", type=int, default=None, help="Maximale Ticks pro Match")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--zoom", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--out", default="turnier.jsonl", help="Ergebnisdatei (JSON Lines)")
+    args = parser.parse_args(argv)
+
+    configs = sweep(args)
+    done = load_results(args.out)
+    todo = [c for c in configs if c["key"] not in done]
+    workers = args.workers or os.cpu_count() or 1
+    print(f"{len(configs)} Matches, davon {len(configs) - len(todo)} schon in {args.out}, "
+          f"{len(todo)} zu spielen mit {workers} Prozessen")
+
+    start = time.perf_counter()
+    finished = 0
+    if todo:
+        pool = multiprocessing.Pool(workers)
+        try:
+            with open(args.out, "a", encoding="utf-8") as f:
+                if f.tell() > 0 and not ends_with_newline(args.out):
+                    f.write("\n")  # abgeschnittene letzte Zeile abschließen
+                for result in pool.imap_unordered(play, todo, chunksize=max(1, min(16, len(todo) // (workers * 4)))):
+                    f.write(json.dumps(result) + "\n")
+                    f.flush()
+                    done[result["key"]] = result
+                    finished += 1
+                    if finished % 100 == 0 or finished == len(todo):
+                        rate = finished / (time.perf_counter() - start)
+                        print(f"  {finished}/{len(todo)} Matches ({rate:.1f}/s)")
+            pool.close()
+        except KeyboardInterrupt:
+            pool.terminate()
+            print(f"Abgebrochen nach {finished} Matches; derselbe Aufruf setzt den Lauf fort.")
+            return
+        except BaseException:
+            # join() geht nur auf einem geschlossenen oder beendeten Pool
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    summarize([done[c["key"]] for c in configs])
+
+
+if __name__ == "__main__":
+    main()
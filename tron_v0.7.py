@@ -1,11 +1,20 @@
+import argparse
+import os
 import pygame
-import random
 import math
+import random
 import time
-import os
+from collections import deque
 
-# Initialisierung
-pygame.init()
+from tron_bots import BotPlanner, TOTAL_BUDGET
+from tron_engine import BLOCK_SIZE, DECAY_LENGTH, GameState, Player, Trail, generate_start_positions
+from tron_input import InputLayer
+from tron_net import MAX_WORLD_SIZE, PORT, Endpoint, NetClient, NetHost, parse_address
+from tron_profiler import profiler
+from tron_replay import InputRecorder, Recording, ReplayRunner
+from tron_resources import GlyphAtlas, assets, audio, load_font, startup, text_cache
+from tron_widgets import (ANIMATION_FRAME_MS, IDLE_MS, POLL_MS, Button, HeadMarker, Label, Slider, WidgetTree,
+                          wait_events)
 
 # Farben
 WHITE     = (255, 255, 255)
@@ -21,260 +30,82 @@ DARK_GRAY = (30, 30, 30)
 
 COLORS = [GREEN, RED, LIGHT_BLUE, YELLOW, MAGENTA, CYAN]
 
-# Display-Einstellungen
-info = pygame.display.Info()
-DESKTOP_W, DESKTOP_H = info.current_w, info.current_h
-BLOCK_SIZE = 20
-MIN_DISTANCE = 200
-GAME_DURATION = 15 * 60
-
-# Schriftarten
-font = pygame.font.SysFont("Arial", 30)
-large_font = pygame.font.SysFont("Arial", 50)
+# Display-Einstellungen und Schriftarten werden erst in init_subsystems() gesetzt
+DESKTOP_W, DESKTOP_H = 0, 0
+font = None
+large_font = None
 # Für Buttons verwenden wir eine Schrift, die ca. 20% kleiner ist
-button_font = pygame.font.SysFont("Arial", int(50 * 0.8))
+button_font = None
+# Kleine Schrift für das Profiler-Overlay
+small_font = None
 
-# Uhr für die Spielgeschwindigkeit
+# Uhr für die Bildrate (die Simulation läuft mit festem Zeitschritt, siehe game_loop)
 clock = pygame.time.Clock()
+# Obergrenze für die nachzuholende Simulationszeit pro Frame (verhindert eine "Todesspirale")
+MAX_FRAME_TIME = 0.25
+# Höchstzahl an Computergegnern, die im Startmenü hinzugefügt werden können
+MAX_BOTS = 12
+# Countdown vor Spielbeginn: drei Zahlen zu je ca. 0,33 Sekunden
+COUNTDOWN_STEP = 1 / 3
+# Dauer der Musik-Überblendung zwischen Menü und Spiel in Millisekunden
+MUSIC_FADE_MS = 1000
+# Im Spiel nur geänderte Bereiche an den Bildschirm übertragen statt flip() (Umschalten mit F4)
+DIRTY_RECTS = True
+# Höhe der Statusleiste oben im Spiel
+STATUS_BAR_HEIGHT = 50
+# Kleinster Zoom im Startmenü (ergibt bei gegebenem --world-scale die größte Welt)
+MIN_ZOOM = 0.5
 
-pygame.mixer.init()
-
-# --- Button-Klasse (für diskrete Einstellungen) ---
-class Button:
-    def __init__(self, rect, normal_bg, normal_text_color, blink_bg, blink_text_color, text, callback, blink_duration=0.2):
-        self.rect = pygame.Rect(rect)
-        self.normal_bg = normal_bg
-        self.normal_text_color = normal_text_color
-        self.blink_bg = blink_bg
-        self.blink_text_color = blink_text_color
-        self.text = text
-        self.callback = callback
-        self.blink_duration = blink_duration
-        self.is_blinking = False
-        self.blink_start_time = 0
-
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if self.rect.collidepoint(event.pos):
-                self.is_blinking = True
-                self.blink_start_time = time.time()
-                if self.callback:
-                    self.callback()
-
-    def update(self):
-        if self.is_blinking and (time.time() - self.blink_start_time > self.blink_duration):
-            self.is_blinking = False
-
-    def draw(self, surface, font):
-        bg = self.blink_bg if self.is_blinking else self.normal_bg
-        text_color = self.blink_text_color if self.is_blinking else self.normal_text_color
-        pygame.draw.rect(surface, bg, self.rect)
-        pygame.draw.rect(surface, WHITE, self.rect, 3)  # Weiße Umrandung
-        text_surf = font.render(self.text, True, text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        surface.blit(text_surf, text_rect)
-
-
-# --- Slider-Klasse (für kontinuierliche Einstellungen, z. B. Zoom) ---
-class Slider:
-    def __init__(self, rect, min_value, max_value, initial_value, track_color, knob_color):
-        self.rect = pygame.Rect(rect)  # Der Schienenbereich
-        self.min_value = min_value
-        self.max_value = max_value
-        self.value = initial_value
-        self.track_color = track_color
-        self.knob_color = knob_color
-        self.knob_radius = self.rect.height // 2
-        self.dragging = False
-
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if self.get_knob_rect().collidepoint(event.pos):
-                self.dragging = True
-        elif event.type == pygame.MOUSEBUTTONUP:
-            self.dragging = False
-        elif event.type == pygame.MOUSEMOTION and self.dragging:
-            rel_x = event.pos[0] - self.rect.x
-            rel_x = max(0, min(self.rect.width, rel_x))
-            fraction = rel_x / self.rect.width
-            self.value = self.min_value + fraction * (self.max_value - self.min_value)
-
-    def get_knob_rect(self):
-        fraction = (self.value - self.min_value) / (self.max_value - self.min_value)
-        knob_x = self.rect.x + fraction * self.rect.width
-        knob_rect = pygame.Rect(0, 0, self.knob_radius * 2, self.knob_radius * 2)
-        knob_rect.center = (int(knob_x), self.rect.centery)
-        return knob_rect
-
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.track_color, self.rect)
-        knob_rect = self.get_knob_rect()
-        pygame.draw.ellipse(surface, self.knob_color, knob_rect)
-        pygame.draw.ellipse(surface, WHITE, knob_rect, 2)
-
-
-# --- Player-Klasse ---
-class Player:
-    def __init__(self, control_type, color, start_pos, direction, gap_chance=0.1, min_gap=2, max_gap=4):
-        # Kopf und statische Spur (Trail) werden getrennt geführt
-        self.head = start_pos.copy()
-        self.trail = [start_pos.copy()]
-        self.dx, self.dy = direction
-        self.controller = None
-        self.control_type = control_type
-        self.color = color
-        self.alive = True
-        self.confirmed = False
-        self.circle_size = BLOCK_SIZE // 2  # Basisgröße (z.B. für den Kopf)
-        self.angle = 0
-        self.turn_speed = 0.2
-        self.turn_left = False
-        self.turn_right = False
-        self.trail_counter = 0
-        self.highlighted = False
-        self.highlight_start_time = 0
-
-        # Parameter für zufällige Lücken:
-        self.gap_chance = gap_chance    # z.B. 10 % Chance pro Update, ein Gap zu starten
-        self.min_gap = min_gap          # Mindestlänge in Updates (z.B. 2)
-        self.max_gap = max_gap          # Maximallänge in Updates (z.B. 4)
-        self.current_gap_remaining = 0  # Zähler, wie viele Updates noch keine Spur erzeugt werden
-        # Optional: Kopfbild (wenn du später den Kopf durch ein PNG ersetzen möchtest)
-        self.head_image = None
-
-    def update_position(self, world_width, world_height):
-        if not self.alive:
-            return
-
-        self.trail_counter += 1
-
-        # Wenn ein Gap aktiv ist, verringere den Zähler und füge kein Segment hinzu.
-        if self.current_gap_remaining > 0:
-            self.current_gap_remaining -= 1
-        else:
-            # Mit einer gewissen Wahrscheinlichkeit ein Gap starten:
-            if random.random() < self.gap_chance:
-                # Wähle eine zufällige Gap-Länge zwischen min_gap und max_gap.
-                self.current_gap_remaining = random.randint(self.min_gap, self.max_gap)
-            else:
-                # Füge den aktuellen Kopf (als Kopie) zur statischen Spur hinzu.
-                self.trail.append(self.head.copy())
-
-        # Aktualisiere die Kopfposition:
-        new_head = [self.head[0] + self.dx, self.head[1] + self.dy]
-        if new_head[0] >= world_width:
-            new_head[0] = 0
-        elif new_head[0] < 0:
-            new_head[0] = world_width - BLOCK_SIZE
-        if new_head[1] >= world_height:
-            new_head[1] = 0
-        elif new_head[1] < 0:
-            new_head[1] = world_height - BLOCK_SIZE
-        self.head = new_head
-
-
-    def check_collision(self, players, zoom):
-        if not self.alive:
-            return
-        head = self.head
-        collision_radius = (self.circle_size * zoom) * 0.8
-        for segment in self.trail:
-            if math.dist(head, segment) < collision_radius:
-                self.alive = False
-        for p in players:
-            if p != self and p.alive:
-                for segment in p.trail:
-                    if math.dist(head, segment) < collision_radius:
-                        self.alive = False
-
-
-def generate_start_positions(num_players, width, height):
-    positions = []
-    directions = []
-    regions = [
-        (width // 4, height // 4),
-        (3 * width // 4, height // 4),
-        (width // 4, 3 * height // 4),
-        (3 * width // 4, 3 * height // 4)
-    ]
-    dir_options = [(BLOCK_SIZE, 0), (-BLOCK_SIZE, 0), (0, BLOCK_SIZE), (0, -BLOCK_SIZE)]
-    for i in range(num_players):
-        pos = list(regions[i % 4])
-        d = random.choice(dir_options)
-        if i >= 4:
-            pos[0] += random.randint(-100, 100)
-            pos[1] += random.randint(-100, 100)
-        while any(math.dist(pos, p) < MIN_DISTANCE for p in positions):
-            pos[0] = random.randint(BLOCK_SIZE, width - BLOCK_SIZE)
-            pos[1] = random.randint(BLOCK_SIZE, height - BLOCK_SIZE)
-        positions.append(pos)
-        directions.append(d)
-    return positions, directions
 
 def load_image(filename, scale=None):
     """
-    Lädt ein Bild aus dem Unterordner 'assets'.
+    Lädt ein Bild aus dem Unterordner 'assets' (über den gemeinsamen AssetManager).
     
     :param filename: Name der Bilddatei (z. B. "tron.png").
     :param scale: Optionales Tuple (Breite, Höhe) zum Skalieren des Bildes.
     :return: Das geladene (und ggf. skalierte) Bild oder None, falls ein Fehler auftritt.
     """
-    import os
-    path = os.path.join("assets", filename)
-    try:
-        image = pygame.image.load(path).convert_alpha()
-    except Exception as e:
-        print(f"Fehler beim Laden von {path}: {e}")
+    image = assets.image(filename)
+    if image is None:
         return None
     if scale is not None:
-        image = pygame.transform.scale(image, scale)
+        image = assets.scale(image, scale)
     return image
 
 def play_music(filename):
     """
-    Lädt und spielt eine Musikdatei aus dem Unterordner 'assets' in Endlosschleife.
+    Spielt eine Musikdatei aus dem Unterordner 'assets' in Endlosschleife, sobald
+    sie (im Hintergrund) geladen ist.
     """
-    music_path = os.path.join("assets", filename)
-    try:
-        pygame.mixer.music.load(music_path)
-        pygame.mixer.music.play(-1)  # Endlos-Schleife
-    except Exception as e:
-        print(f"Fehler beim Laden der Musik '{music_path}': {e}")
+    audio.play(filename)
 
 def transition_music(new_music, fade_duration=3000):
     """
     Blendet das aktuell laufende Musikstück über 'fade_duration' Millisekunden aus
-    und startet dann das neue Musikstück mit gleichem Fade‑in.
+    und das neue Musikstück gleichzeitig ein. Kehrt sofort zurück.
     :param new_music: Dateiname (z.B. "theme.mp3") im Unterordner "assets".
     :param fade_duration: Dauer des Fade‑out und Fade‑in in Millisekunden.
     """
-    import os
-    # Starte das Ausblenden der aktuellen Musik
-    pygame.mixer.music.fadeout(fade_duration)
-    # Warten, bis der Fade-Out abgeschlossen ist (diese Pause blockiert kurz den Thread)
-    pygame.time.delay(fade_duration)
-    
-    # Lade und starte die neue Musik mit Fade-In
-    new_music_path = os.path.join("assets", new_music)
-    try:
-        pygame.mixer.music.load(new_music_path)
-        pygame.mixer.music.play(-1, fade_ms=fade_duration)
-    except Exception as e:
-        print(f"Fehler beim Laden der Musik '{new_music_path}': {e}")
+    audio.play(new_music, fade_ms=fade_duration)
 
 
 # --- Startbildschirm (Menü) ---
-def start_screen():
-    screen = pygame.display.set_mode((DESKTOP_W, DESKTOP_H), pygame.FULLSCREEN)
-    pygame.display.set_caption("Tron - Startmenü")
-    play_music("music.mp3")
-    title_image = load_image("tron.png", (DESKTOP_W /2, DESKTOP_H / 2))
+def start_screen(host=None):
+    with startup.phase("set_mode"):
+        screen = pygame.display.set_mode((DESKTOP_W, DESKTOP_H), pygame.FULLSCREEN)
+        pygame.display.set_caption("Tron - Startmenü")
+    transition_music("music.mp3", MUSIC_FADE_MS)
+    # Spielmusik schon im Hintergrund dekodieren, damit der Wechsel beim Start sofort klappt
+    audio.preload("theme.mp3")
+    with startup.phase("title image"):
+        title_image = load_image("tron.png", (DESKTOP_W /2, DESKTOP_H / 2))
     if title_image:
         title_rect = title_image.get_rect(center=(DESKTOP_W // 2, DESKTOP_H // 4))
     # Spieler erstellen
     players = []
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
+    with startup.phase("joysticks"):
+        pygame.joystick.init()
+        joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
     players.append(Player("keyboard", COLORS[0], [0, 0], (0, 0)))
     for i, joy in enumerate(joysticks):
         joy.init()
@@ -282,10 +113,42 @@ def start_screen():
         p.controller = joy
         players.append(p)
     
-    positions, directions = generate_start_positions(len(players), DESKTOP_W, DESKTOP_H)
-    for i, p in enumerate(players):
-        p.trail = [[positions[i][0], positions[i][1]]]
-        p.dx, p.dy = directions[i]
+    def place_players():
+        positions, directions = generate_start_positions(len(players), DESKTOP_W, DESKTOP_H)
+        for i, p in enumerate(players):
+            p.trail = Trail([positions[i]])
+            p.dx, p.dy = directions[i]
+    
+    place_players()
+    
+    def add_bot():
+        # Bots sind sofort bestätigt; ihre Farbe folgt der Position in der Spielerliste
+        if sum(1 for p in players if p.control_type == "bot") >= MAX_BOTS:
+            return
+        bot = Player("bot", COLORS[len(players) % len(COLORS)], [0, 0], (0, 0))
+        bot.confirmed = True
+        players.append(bot)
+        place_players()
+    
+    def add_network_player(client):
+        # Spieler eines LAN-Clients; gelenkt wird er über dessen INPUT-Pakete
+        p = Player("network", COLORS[len(players) % len(COLORS)], [0, 0], (0, 0))
+        p.confirmed = True
+        client.player = p
+        players.append(p)
+        place_players()
+    
+    if host is not None:
+        # Bereits angemeldete Clients spielen auch im nächsten Match mit
+        for client in host.clients.values():
+            add_network_player(client)
+    
+    def remove_bot():
+        for i in range(len(players) - 1, -1, -1):
+            if players[i].control_type == "bot":
+                del players[i]
+                place_players()
+                return
     
     # --- Diskrete Einstellungen ---
     # Geschwindigkeitsoptionen
@@ -331,7 +194,8 @@ def start_screen():
         blink_bg=WHITE,
         blink_text_color=BLACK,
         text="-",
-        callback=lambda: update_speed(-1)
+        callback=lambda: update_speed(-1),
+        font=button_font
     )
     plus_speed_button = Button(
         rect=(plus_speed_x, speed_button_y, button_size, button_size),
@@ -340,7 +204,8 @@ def start_screen():
         blink_bg=BLACK,
         blink_text_color=WHITE,
         text="+",
-        callback=lambda: update_speed(1)
+        callback=lambda: update_speed(1),
+        font=button_font
     )
     speed_button_list = [minus_speed_button, plus_speed_button]
     speed_text_center = (DESKTOP_W // 2, speed_button_y + button_size // 2)
@@ -356,7 +221,8 @@ def start_screen():
         blink_bg=WHITE,
         blink_text_color=BLACK,
         text="-",
-        callback=lambda: update_snake_width(-1)
+        callback=lambda: update_snake_width(-1),
+        font=button_font
     )
     plus_snake_button = Button(
         rect=(plus_snake_x, snake_button_y, button_size, button_size),
@@ -365,7 +231,8 @@ def start_screen():
         blink_bg=BLACK,
         blink_text_color=WHITE,
         text="+",
-        callback=lambda: update_snake_width(1)
+        callback=lambda: update_snake_width(1),
+        font=button_font
     )
     snake_button_list = [minus_snake_button, plus_snake_button]
     snake_text_center = (DESKTOP_W // 2, snake_button_y + button_size // 2)
@@ -381,7 +248,8 @@ def start_screen():
         blink_bg=WHITE,
         blink_text_color=BLACK,
         text="-",
-        callback=lambda: update_turn_speed(-1)
+        callback=lambda: update_turn_speed(-1),
+        font=button_font
     )
     plus_turn_button = Button(
         rect=(plus_turn_x, turn_speed_button_y, button_size, button_size),
@@ -390,14 +258,15 @@ def start_screen():
         blink_bg=BLACK,
         blink_text_color=WHITE,
         text="+",
-        callback=lambda: update_turn_speed(1)
+        callback=lambda: update_turn_speed(1),
+        font=button_font
     )
     turn_speed_button_list = [minus_turn_button, plus_turn_button]
     turn_speed_text_center = (DESKTOP_W // 2, turn_speed_button_y + button_size // 2)
     
     # --- Zoom-Slider ---
     zoom_slider_rect = (DESKTOP_W // 2 - 100, turn_speed_button_y + 80, 200, 20)
-    zoom_slider = Slider(zoom_slider_rect, 0.5, 1.0, 1.0, track_color=GRAY, knob_color=WHITE)
+    zoom_slider = Slider(zoom_slider_rect, MIN_ZOOM, 1.0, 1.0, track_color=GRAY, knob_color=WHITE)
     zoom_text_center = (DESKTOP_W // 2, zoom_slider_rect[1] - 20)
     
     # --- TRON-Titel oben (Sci-Fi-Schrift) ---
@@ -410,161 +279,689 @@ def start_screen():
     tron_text = sci_fi_font.render("TRON", True, WHITE)
     tron_rect = tron_text.get_rect(center=(DESKTOP_W // 2, DESKTOP_H // 4))
     
-    while True:
-        screen.fill(BLACK)
-        # Zeichne den TRON-Titel oben in der oberen Bildschirmhälfte
-        if title_image:
-            screen.blit(title_image, title_rect)
-        
-        # Zeichne die Schlangenköpfe (Puls-Effekt)
+    # --- Widget-Baum: Titelbild als fester Hintergrund, darüber Köpfe, Texte und Bedienelemente ---
+    background = pygame.Surface(screen.get_size())
+    background.fill(BLACK)
+    # Zeichne den TRON-Titel oben in der oberen Bildschirmhälfte
+    if title_image:
+        background.blit(title_image, title_rect)
+    tree = WidgetTree(background)
+    markers = {}  # Spieler -> HeadMarker (Köpfe liegen unter allen anderen Widgets)
+    
+    def sync_markers():
+        for p in list(markers):
+            if p not in players:
+                tree.remove(markers.pop(p))
         for p in players:
-            if p.highlighted:
-                elapsed = time.time() - p.highlight_start_time
-                if elapsed < 1:
-                    pulse_size = int(p.circle_size * (1 + 0.5 * math.sin(elapsed * 10)))
-                    pygame.draw.circle(screen, WHITE, (int(p.trail[0][0]), int(p.trail[0][1])), pulse_size)
-                else:
-                    p.highlighted = False
-            pygame.draw.circle(screen, p.color, (int(p.trail[0][0]), int(p.trail[0][1])), p.circle_size)
-        
-        # Starttext (jetzt unter dem TRON-Titel)
-        start_text = large_font.render("Drücke LEERTASTE zum Starten", True, WHITE)
-        screen.blit(start_text, (DESKTOP_W // 2 - 250, DESKTOP_H // 2 - 50))
-        
-        # Texte für die Einstellungen
-        speed_text = font.render(f"Geschwindigkeit: {speed}", True, WHITE)
-        speed_rect = speed_text.get_rect(center=speed_text_center)
-        screen.blit(speed_text, speed_rect)
-        
-        snake_text = font.render(f"Schlangenbreite: {snake_width}", True, WHITE)
-        snake_rect = snake_text.get_rect(center=snake_text_center)
-        screen.blit(snake_text, snake_rect)
-        
-        turn_speed_text = font.render(f"Drehgeschwindigkeit: {turn_speed}", True, WHITE)
-        turn_speed_rect = turn_speed_text.get_rect(center=turn_speed_text_center)
-        screen.blit(turn_speed_text, turn_speed_rect)
-        
-        zoom_text = font.render(f"Zoom: {zoom_slider.value:.2f}", True, WHITE)
-        zoom_rect = zoom_text.get_rect(center=zoom_text_center)
-        screen.blit(zoom_text, zoom_rect)
+            if p not in markers:
+                markers[p] = tree.add(HeadMarker(p), index=len(markers))
+    
+    # Starttext (jetzt unter dem TRON-Titel)
+    tree.add(Label(large_font, "Drücke LEERTASTE zum Starten", WHITE, topleft=(DESKTOP_W // 2 - 250, DESKTOP_H // 2 - 50)))
+    # Texte für die Einstellungen
+    speed_label = tree.add(Label(font, "", WHITE, center=speed_text_center))
+    snake_label = tree.add(Label(font, "", WHITE, center=snake_text_center))
+    turn_speed_label = tree.add(Label(font, "", WHITE, center=turn_speed_text_center))
+    zoom_label = tree.add(Label(font, "", WHITE, center=zoom_text_center))
+    bots_label = tree.add(Label(font, "", WHITE, center=(DESKTOP_W // 2, zoom_slider_rect[1] + 60)))
+    net_label = None
+    if host is not None:
+        net_label = tree.add(Label(font, "", WHITE, center=(DESKTOP_W // 2, zoom_slider_rect[1] + 100)))
+    for widget in speed_button_list + snake_button_list + turn_speed_button_list + [zoom_slider]:
+        tree.add(widget)
+    overlay_shown = False
+    
+    while True:
+        profiler.begin_frame()
+        with profiler.phase("draw"):
+            # Texte nachführen; neu gezeichnet wird nur, was sich geändert hat
+            sync_markers()
+            speed_label.set_text(f"Geschwindigkeit: {speed}")
+            snake_label.set_text(f"Schlangenbreite: {snake_width}")
+            turn_speed_label.set_text(f"Drehgeschwindigkeit: {turn_speed}")
+            zoom_label.set_text(f"Zoom: {zoom_slider.value:.2f}")
+            num_bots = sum(1 for p in players if p.control_type == "bot")
+            bots_label.set_text(f"Computergegner: {num_bots}  (B: hinzufügen, N: entfernen)")
+            if net_label is not None:
+                num_network = sum(1 for p in players if p.control_type == "network")
+                net_label.set_text(f"Netzwerkspieler: {num_network}  (Port {host.endpoint.address[1]})")
+            animating = tree.update(time.time())
+            # Das Profiler-Overlay liegt über allem: solange es an ist (und einmal nach dem
+            # Ausschalten) wird jedes Mal alles gezeichnet
+            if profiler.enabled or overlay_shown:
+                tree.invalidate()
+            overlay_shown = profiler.enabled
+            rects = tree.render(screen)
         
-        # Buttons zeichnen
-        for btn in speed_button_list:
-            btn.update()
-            btn.draw(screen, button_font)
-        for btn in snake_button_list:
-            btn.update()
-            btn.draw(screen, button_font)
-        for btn in turn_speed_button_list:
-            btn.update()
-            btn.draw(screen, button_font)
-        zoom_slider.draw(screen)
+        # Profiler-Overlay (F5)
+        if profiler.enabled:
+            with profiler.phase("profiler"):
+                profiler.draw_overlay(screen, small_font, text_cache)
         
-        pygame.display.flip()
+        with profiler.phase("display"):
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+        startup.frame_shown()
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return None, None, None, None, None
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    confirmed_players = [p for p in players if p.confirmed]
-                    if confirmed_players:
-                        # Rückgabe: Spieler, Speed, Schlangenbreite, Zoom und Drehgeschwindigkeit
-                        return confirmed_players, speed, snake_width, zoom_slider.value, turn_speed
-                if event.key == pygame.K_a and players[0].control_type == "keyboard":
-                    players[0].confirmed = True
-                    players[0].highlighted = True
-                    players[0].highlight_start_time = time.time()
-                if event.key == pygame.K_x:
-                    players[0].confirmed = True
-                    players[0].highlighted = True
-                    players[0].highlight_start_time = time.time()
-                if event.key == pygame.K_ESCAPE:
+        with profiler.phase("events"):
+            audio.update()
+            if host is not None:
+                for client in host.poll():
+                    add_network_player(client)
+            # Blockierend auf Eingaben warten: im Frame-Takt nur während Animationen,
+            # kurz, solange Musik lädt oder Clients sich anmelden können, sonst lange
+            if animating or profiler.enabled:
+                timeout = ANIMATION_FRAME_MS
+            elif audio.pending or host is not None:
+                timeout = POLL_MS
+            else:
+                timeout = IDLE_MS
+            for event in wait_events(timeout):
+                if event.type == pygame.QUIT:
                     pygame.quit()
                     return None, None, None, None, None
-            for btn in speed_button_list + snake_button_list + turn_speed_button_list:
-                btn.handle_event(event)
-            zoom_slider.handle_event(event)
-            if event.type == pygame.JOYBUTTONDOWN:
-                for p in players:
-                    if p.controller and event.joy == p.controller.get_instance_id():
-                        if event.button in [0, 1, 2, 3]:
-                            p.confirmed = True
-                            p.highlighted = True
-                            p.highlight_start_time = time.time()
-
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        confirmed_players = [p for p in players if p.confirmed]
+                        if confirmed_players:
+                            # Rückgabe: Spieler, Speed, Schlangenbreite, Zoom und Drehgeschwindigkeit
+                            return confirmed_players, speed, snake_width, zoom_slider.value, turn_speed
+                    if event.key == pygame.K_a and players[0].control_type == "keyboard":
+                        players[0].confirmed = True
+                        players[0].highlighted = True
+                        players[0].highlight_start_time = time.time()
+                    if event.key == pygame.K_x:
+                        players[0].confirmed = True
+                        players[0].highlighted = True
+                        players[0].highlight_start_time = time.time()
+                    if event.key == pygame.K_b:
+                        add_bot()
+                    if event.key == pygame.K_n:
+                        remove_bot()
+                    if event.key == pygame.K_ESCAPE:
+                        pygame.quit()
+                        return None, None, None, None, None
+                if event.type == pygame.VIDEOEXPOSE:
+                    tree.invalidate()
+                handle_profiler_keys(event)
+                tree.handle_event(event)
+                if event.type == pygame.JOYBUTTONDOWN:
+                    for p in players:
+                        if p.controller and event.joy == p.controller.get_instance_id():
+                            if event.button in [0, 1, 2, 3]:
+                                p.confirmed = True
+                                p.highlighted = True
+                                p.highlight_start_time = time.time()
+        profiler.end_frame()
 
 # --- Spieler initialisieren (hier wird auch Schlangenbreite und Drehgeschwindigkeit gesetzt) ---
-def init_players(players, snake_width, turn_speed):
+def init_players(players, snake_width, turn_speed, seed=None, world_scale=1.0):
     head_img = load_image("bike.png", (int(BLOCK_SIZE * 5), int(BLOCK_SIZE * 5)))
     # Weisen wir z. B. dem ersten Spieler dieses Bild zu:
     if head_img is not None:
         players[0].head_image = head_img
     num_players = len(players)
-    positions, directions = generate_start_positions(num_players, DESKTOP_W, DESKTOP_H)
+    # Startaufstellung aus dem Match-Seed, damit sie sich reproduzieren lässt
+    positions, directions = generate_start_positions(num_players, DESKTOP_W * world_scale, DESKTOP_H * world_scale,
+                                                     random.Random(seed))
     for i, p in enumerate(players):
         # Setze die Startposition für den Kopf:
         p.head = [positions[i][0], positions[i][1]]
         # Erstelle den initialen Trail (zum Beispiel nur den Startpunkt – später wird der Trail erweitert)
-        p.trail = [[positions[i][0], positions[i][1]]]
+        p.trail = Trail([positions[i]])
         p.dx, p.dy = directions[i]
+        p.angle = math.atan2(p.dy, p.dx)
         p.circle_size = snake_width
         p.turn_speed = turn_speed
     return players
 
 
-def draw_snake_line(surface, player, zoom):
+def draw_snake_line(surface, player, zoom, view=None):
     """
     Zeichnet den Trail des Spielers als durchgehende Linie mit Lücken.
     Falls zwei aufeinanderfolgende Segmente zu weit auseinander liegen (Screen Wrap),
-    wird die Linie dort unterbrochen.
+    wird die Linie dort unterbrochen. Vereinfachte Spuren (lange Strecken) werden nur
+    an den Abschnittsgrenzen des Trails unterbrochen.
+
+    Mit 'view' (links, oben, rechts, unten in Weltkoordinaten, siehe Camera) wird nur
+    dieser Ausschnitt gezeichnet, links oben auf der Fläche. Dabei werden nur die Blöcke
+    des Trails (Trail.chunks()) angefasst, deren Rechteck den Ausschnitt berührt.
     """
-    segments = []       # Hier sammeln wir Teillinien
-    current_segment = []  # Aktuelle Teillinie
+    trail = player.trail
+    thickness = max(1, int(player.circle_size * zoom))
+    if view is None:
+        ranges = [(0, len(trail))]
+        offset_x = offset_y = 0
+    else:
+        left, top, right, bottom = view
+        # Die Linie ragt um die halbe Dicke über die Punkte hinaus
+        margin = thickness / zoom
+        ranges = []
+        for start, end, x0, y0, x1, y1 in trail.chunks():
+            if x1 + margin < left or x0 - margin > right or y1 + margin < top or y0 - margin > bottom:
+                continue
+            if ranges and ranges[-1][1] - 1 == start:
+                # Direkt anschließender Block: eine durchgehende Linie
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        # Verschiebung in ganzen Pixeln, damit die Punkte genau wie ohne Ausschnitt gerundet werden
+        offset_x = round(left * zoom)
+        offset_y = round(top * zoom)
 
     # Definiere einen Schwellwert, ab dem wir annehmen, dass ein Wrap erfolgt ist.
     # Dieser Wert hängt von BLOCK_SIZE, zoom und ggf. Spielwelt ab.
     threshold = BLOCK_SIZE * zoom * 2  # Beispiel: doppelte Blockgröße
+    if trail.tolerance is not None:
+        threshold = math.inf
 
-    # Iteriere über den Trail
-    for i, pos in enumerate(player.trail):
-        # Transformiere die Position
-        x = int(pos[0] * zoom)
-        y = int(pos[1] * zoom)
+    segments = []       # Hier sammeln wir Teillinien
+    # Iteriere über den Trail (flache Koordinaten ohne Kopie)
+    c = trail.coords()
+    for start, end in ranges:
+        current_segment = []  # Aktuelle Teillinie
+        for i in range(2 * start, 2 * end, 2):
+            # Transformiere die Position
+            x = int(c[i] * zoom) - offset_x
+            y = int(c[i + 1] * zoom) - offset_y
+            if current_segment:
+                last_x, last_y = current_segment[-1]
+                # Berechne den Abstand zum letzten Punkt
+                dist = math.hypot(x - last_x, y - last_y)
+                # Falls der Abstand zu groß ist, wird die Linie unterbrochen
+                if dist > threshold or trail.run_start(i // 2):
+                    segments.append(current_segment)
+                    current_segment = []
+            current_segment.append((x, y))
         if current_segment:
-            last_x, last_y = current_segment[-1]
-            # Berechne den Abstand zum letzten Punkt
-            dist = math.hypot(x - last_x, y - last_y)
-            # Falls der Abstand zu groß ist, wird die Linie unterbrochen
-            if dist > threshold:
-                segments.append(current_segment)
-                current_segment = []
-        current_segment.append((x, y))
-    if current_segment:
-        segments.append(current_segment)
+            segments.append(current_segment)
 
     # Zeichne die einzelnen Linienabschnitte
-    thickness = max(1, int(player.circle_size * zoom))
     for seg in segments:
         if len(seg) >= 2:
             pygame.draw.lines(surface, player.color, False, seg, thickness)
 
 
+# --- Kamera für Welten, die größer als der Bildschirm sind ---
+class Camera:
+    """
+    Sichtbarer Ausschnitt der Welt. Passt die Welt (mal Zoom) auf den Bildschirm, steht
+    die Kamera still und zeigt alles (scrolls ist False). Sonst folgt sie einem Spieler.
+    Weil die Welt an den Rändern umbricht, kann der Ausschnitt über den Rand hinausgehen;
+    views() zerlegt ihn dann in bis zu vier Teile, die jeweils für sich gezeichnet werden.
+    """
+    def __init__(self, size, world_width, world_height, zoom):
+        self.view_width = size[0] / zoom
+        self.view_height = size[1] / zoom
+        self.world_width = world_width
+        self.world_height = world_height
+        self.zoom = zoom
+        # Kleine Rundungsfehler (z. B. DESKTOP_W / zoom * zoom) zählen nicht als größere Welt
+        self.scroll_x = world_width > self.view_width + 1
+        self.scroll_y = world_height > self.view_height + 1
+        self.scrolls = self.scroll_x or self.scroll_y
+        self.left = 0.0
+        self.top = 0.0
+
+    def follow(self, x, y):
+        """
+        Zentriert den Ausschnitt auf die Weltposition (x, y). Die Kamera rastet auf ganze
+        Bildschirmpixel ein, sonst würden die Spuren beim Scrollen um ein Pixel flackern.
+        """
+        if self.scroll_x:
+            self.left = math.floor((x - self.view_width / 2) % self.world_width * self.zoom) / self.zoom
+        if self.scroll_y:
+            self.top = math.floor((y - self.view_height / 2) % self.world_height * self.zoom) / self.zoom
+
+    def views(self):
+        """
+        Die Teile des Ausschnitts als (links, oben, rechts, unten) in Weltkoordinaten.
+        Ein Teil jenseits des rechten/unteren Rands wird um die Weltgröße verschoben
+        angegeben (negatives links/oben), damit dieselbe Umrechnung
+        (Welt - links) * zoom für alle Teile gilt.
+        """
+        lefts = [self.left]
+        if self.scroll_x and self.left + self.view_width > self.world_width:
+            lefts.append(self.left - self.world_width)
+        tops = [self.top]
+        if self.scroll_y and self.top + self.view_height > self.world_height:
+            tops.append(self.top - self.world_height)
+        return [(l, t, l + self.view_width, t + self.view_height) for l in lefts for t in tops]
+
+    def to_screen(self, x, y, margin=0):
+        """
+        Bildschirmpositionen des Weltpunkts (x, y), eine je Teil des Ausschnitts, in dem
+        er (bis auf 'margin' Weltpixel, z. B. den Kopfradius) liegt.
+        """
+        positions = []
+        for left, top, right, bottom in self.views():
+            if left - margin <= x < right + margin and top - margin <= y < bottom + margin:
+                positions.append((int((x - left) * self.zoom), int((y - top) * self.zoom)))
+        return positions
+
+
+# --- Persistente Trail-Ebene (inkrementelles Zeichnen) ---
+class TrailLayer:
+    """
+    Offscreen-Fläche, auf der die Spuren aller Spieler stehen bleiben.
+    Pro Tick wird nur das neu angehängte Stück gezeichnet; komplett neu aufgebaut
+    wird die Ebene nur, wenn sich Zoom oder Auflösung ändern.
+
+    Bei vereinfachten Spuren kann sich der letzte Punkt seit dem letzten Aufruf
+    verschoben haben (verschmolzen); gezeichnet wird dann das Stück von seiner alten
+    zur neuen Position.
+
+    Zerfallende Spuren (Trail.limit) werden Stück für Stück gezeichnet, und jedes
+    Stück wird mit seinem Rechteck in einem Gitter über die Ebene einsortiert (wie
+    SpatialGrid, Zellen zu CELL Pixeln). Ist sein Anfangspunkt abgelaufen, wird das
+    Rechteck schwarz gefüllt und die noch vorhandenen Stücke, die es berühren, werden
+    neu gezeichnet. Der Aufwand hängt so nur von der Spurlänge im Zerfallsmodus ab,
+    nicht von der Matchlänge.
+    """
+    CELL = 32
+
+    def __init__(self, size, zoom):
+        self.size = size
+        self.zoom = zoom
+        self.surface = pygame.Surface(size)
+        self.drawn = {}  # Spieler -> absoluter Index nach dem letzten gezeichneten Trail-Punkt
+        self.ends = {}  # Spieler -> zuletzt gezeichneter Endpunkt (Bildschirmkoordinaten)
+        # Nur im Zerfallsmodus: Stücke als (Rechteck, Spieler, absoluter Index des Endpunkts),
+        # je Spieler in Zeichenreihenfolge und je Gitterzelle
+        self.pieces = {}
+        self.cells = {}
+
+    def rebuild(self, players):
+        self.surface.fill(BLACK)
+        self.drawn = {}
+        self.ends = {}
+        self.pieces = {}
+        self.cells = {}
+        decaying = []
+        for p in players:
+            if p.trail.limit is not None:
+                decaying.append(p)
+                continue
+            draw_snake_line(self.surface, p, self.zoom)
+            self.drawn[p] = len(p.trail)
+            if len(p.trail):
+                x, y = p.trail[-1]
+                self.ends[p] = (int(x * self.zoom), int(y * self.zoom))
+        if decaying:
+            self.update(decaying)
+
+    def sync(self, size, zoom, players):
+        """
+        Baut die Ebene neu auf, falls sich Auflösung oder Zoom geändert haben.
+        Gibt True zurück, wenn neu aufgebaut wurde.
+        """
+        if size != self.size or zoom != self.zoom:
+            self.size = size
+            self.zoom = zoom
+            self.surface = pygame.Surface(size)
+            self.rebuild(players)
+            return True
+        return False
+
+    def update(self, players):
+        """
+        Zeichnet nur die seit dem letzten Aufruf neu hinzugekommenen Trail-Stücke und
+        löscht die abgelaufenen. Gibt die Liste der dabei veränderten Rechtecke zurück.
+        """
+        dirty = []
+        expired = []
+        zoom = self.zoom
+        # Gleicher Schwellwert wie in draw_snake_line (Wrap und Lücken unterbrechen die Linie)
+        threshold = BLOCK_SIZE * zoom * 2
+        for p in players:
+            trail = p.trail
+            c = trail.coords()
+            if not c:
+                continue
+            first = trail.offset
+            drawn = self.drawn.get(p, 0)
+            thickness = max(1, int(p.circle_size * zoom))
+            if trail.tolerance is None:
+                pieces = None
+                if trail.limit is not None:
+                    pieces = self.pieces.setdefault(p, deque())
+                    # Ein Stück läuft ab, sobald der Punkt vor seinem Endpunkt abgelaufen ist
+                    while pieces and pieces[0][2] <= first:
+                        piece = pieces.popleft()
+                        for key in self._cells(piece[0]):
+                            cell = self.cells[key]
+                            cell.remove(piece)
+                            if not cell:
+                                del self.cells[key]
+                        expired.append(piece[0])
+                for i in range(2 * max(1, drawn - first), len(c), 2):
+                    last_x = int(c[i - 2] * zoom)
+                    last_y = int(c[i - 1] * zoom)
+                    x = int(c[i] * zoom)
+                    y = int(c[i + 1] * zoom)
+                    if math.hypot(x - last_x, y - last_y) <= threshold:
+                        rect = pygame.draw.line(self.surface, p.color, (last_x, last_y), (x, y), thickness)
+                        dirty.append(rect)
+                        if pieces is not None:
+                            piece = (rect, p, first + i // 2)
+                            pieces.append(piece)
+                            for key in self._cells(rect):
+                                self.cells.setdefault(key, []).append(piece)
+            else:
+                last = self.ends.get(p)
+                for i in range(max(0, drawn - 1), len(c) // 2):
+                    x = int(c[2 * i] * zoom)
+                    y = int(c[2 * i + 1] * zoom)
+                    if last is not None and last != (x, y) and not (i >= drawn and trail.run_start(i)):
+                        dirty.append(pygame.draw.line(self.surface, p.color, last, (x, y), thickness))
+                    last = (x, y)
+                self.ends[p] = last
+            self.drawn[p] = first + len(c) // 2
+        if expired:
+            dirty.extend(self._erase(expired))
+        return dirty
+
+    def _cells(self, rect):
+        """Schlüssel der Gitterzellen, die 'rect' berührt."""
+        cs = self.CELL
+        return [(cx, cy) for cx in range(rect.left // cs, (rect.right - 1) // cs + 1)
+                for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1)]
+
+    def _erase(self, expired):
+        """
+        Füllt die Rechtecke abgelaufener Stücke schwarz und zeichnet die noch vorhandenen
+        Stücke, die sie berühren, vollständig neu (ohne Clipping, damit jedes Stück genau
+        dieselben Pixel trifft wie beim ersten Zeichnen). Gibt die veränderten Bereiche zurück.
+        """
+        merged = []
+        for rect in expired:
+            rect = pygame.Rect(rect)
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        surface = self.surface
+        zoom = self.zoom
+        trails = {}  # Spieler -> (Koordinaten, abgelaufene Punkte, Linienstärke)
+        dirty = []
+        for rect in merged:
+            surface.fill(BLACK, rect)
+            area = rect.copy()
+            redrawn = set()
+            for key in self._cells(rect):
+                for piece in self.cells.get(key, ()):
+                    piece_rect, p, end = piece
+                    if id(piece) in redrawn or not piece_rect.colliderect(rect):
+                        continue
+                    redrawn.add(id(piece))
+                    trail = trails.get(p)
+                    if trail is None:
+                        trail = trails[p] = (p.trail.coords(), p.trail.offset, max(1, int(p.circle_size * zoom)))
+                    c, first, thickness = trail
+                    i = 2 * (end - first)
+                    pygame.draw.line(surface, p.color, (int(c[i - 2] * zoom), int(c[i - 1] * zoom)),
+                                     (int(c[i] * zoom), int(c[i + 1] * zoom)), thickness)
+                    area.union_ip(piece_rect)
+            dirty.append(area)
+        return dirty
+
+
+def get_refresh_rate(default=60):
+    """
+    Ermittelt die Bildwiederholrate des Monitors. Nicht jede pygame-Version bietet
+    dafür eine Funktion, dann wird 'default' verwendet.
+    """
+    get_rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+    if get_rates is not None:
+        try:
+            rates = get_rates()
+            if rates and rates[0] > 0:
+                return rates[0]
+        except pygame.error:
+            pass
+    return default
+
+
+def interpolate_head(prev, cur, alpha):
+    """
+    Position des Kopfes zwischen zwei Ticks (alpha von 0 bis 1).
+    Bei einem Wrap-Around wird nicht interpoliert, sonst würde der Kopf quer über den Bildschirm gleiten.
+    """
+    dx = cur[0] - prev[0]
+    dy = cur[1] - prev[1]
+    if abs(dx) > BLOCK_SIZE * 2 or abs(dy) > BLOCK_SIZE * 2:
+        return cur[0], cur[1]
+    return prev[0] + dx * alpha, prev[1] + dy * alpha
+
+
+# --- Zeichnen eines Spiel-Frames ---
+class FrameRenderer:
+    """
+    Zeichnet die Frames eines Matches: Spuren (Trail-Ebene oder Kamera), Köpfe und
+    Statusleiste, und überträgt sie an den Bildschirm (ganz oder nur die geänderten
+    Bereiche). Wird von game_loop und von der Allokations-Messung (tron_alloc) benutzt.
+    """
+    def __init__(self, screen, players, world_width, world_height, zoom, font):
+        self.screen = screen
+        self.zoom = zoom
+        self.font = font
+        # Spuren werden auf einer eigenen Ebene gesammelt statt jedes Frame neu gezeichnet.
+        # Ist die Welt größer als der Bildschirm, zeichnet die Kamera stattdessen jedes Frame
+        # nur die sichtbaren Blöcke der Spuren.
+        self.camera = Camera(screen.get_size(), world_width, world_height, zoom)
+        self.trail_layer = TrailLayer(screen.get_size(), zoom)
+        if not self.camera.scrolls:
+            self.trail_layer.rebuild(players)
+        # Kopfbilder einmal pro Spiel auf die Zoomstufe skalieren, pro Frame wird nur noch geblittet
+        self.head_sprites = []
+        for p in players:
+            if p.head_image is not None:
+                size = int(p.circle_size * 2 * zoom)
+                self.head_sprites.append(assets.scale(p.head_image, (size, size)))
+            else:
+                self.head_sprites.append(None)
+        self.timer_glyphs = GlyphAtlas(font, WHITE, "0123456789s")
+        # Dirty-Rect-Modus: Bereiche, die im nächsten Frame aus der Trail-Ebene wiederhergestellt
+        # werden müssen (alte Köpfe, Overlay), und ob der nächste Frame komplett übertragen wird
+        self.dirty_rects = DIRTY_RECTS
+        self.erase_rects = []
+        self.new_trail_rects = []
+        self.full_redraw = True
+
+    def rebuild(self, players):
+        """Nach einem Sprung in der Aufzeichnung: Trail-Ebene neu aufbauen, alles übertragen."""
+        if not self.camera.scrolls:
+            self.trail_layer.rebuild(players)
+        self.full_redraw = True
+
+    def draw_trails(self, players, focus):
+        """
+        Trail-Ebene aktualisieren (nur neue Stücke) und als Hintergrund verwenden.
+        Bei neuem Zoom oder neuer Auflösung wird der ganze Bildschirm übertragen.
+        Mit scrollender Kamera wird der Ausschnitt um 'focus' (Weltposition) gezeichnet.
+        """
+        screen = self.screen
+        zoom = self.zoom
+        if self.camera.scrolls:
+            # Ausschnitt um den (interpolierten) Kopf des verfolgten Spielers: jedes Frame
+            # komplett neu, aber nur die Spurblöcke, die den Ausschnitt berühren
+            self.camera.follow(*focus)
+            screen.fill(BLACK)
+            for view in self.camera.views():
+                for p in players:
+                    draw_snake_line(screen, p, zoom, view)
+            self.new_trail_rects = []
+            self.full_redraw = True
+            return
+        trail_layer = self.trail_layer
+        if trail_layer.sync(screen.get_size(), zoom, players):
+            self.full_redraw = True
+        self.new_trail_rects = trail_layer.update(players)
+        if self.full_redraw or not self.dirty_rects:
+            screen.blit(trail_layer.surface, (0, 0))
+        else:
+            # Nur alte Köpfe/Overlay und neue Trail-Stücke aus der Ebene wiederherstellen
+            for rect in self.erase_rects:
+                screen.blit(trail_layer.surface, rect, rect)
+            for rect in self.new_trail_rects:
+                screen.blit(trail_layer.surface, rect, rect)
+
+    def draw_heads(self, players, prev_heads, alpha):
+        """Zeichnet die Köpfe (zwischen den Ticks interpoliert); gibt die berührten Bereiche zurück."""
+        screen = self.screen
+        zoom = self.zoom
+        camera = self.camera
+        drawn_rects = []
+        for i, p in enumerate(players):
+            # Zeichne den Kopf als zusätzlichen Kreis (zwischen den Ticks interpoliert)
+            wx, wy = interpolate_head(prev_heads[i], p.head, alpha)
+            if camera.scrolls:
+                positions = camera.to_screen(wx, wy, p.circle_size * 2)
+            else:
+                positions = [(int(wx * zoom), int(wy * zoom))]
+            for hx, hy in positions:
+                drawn_rects.append(pygame.draw.circle(screen, p.color, (hx, hy), int(p.circle_size * zoom)))
+                head_img = self.head_sprites[i]
+                if head_img is not None:
+                    # Bereits passend skaliertes Kopfbild, am Kopf zentriert
+                    drawn_rects.append(screen.blit(head_img, (hx - head_img.get_width() // 2, hy - head_img.get_height() // 2)))
+        return drawn_rects
+
+    def draw_status_bar(self, players, elapsed):
+        """
+        Statusleiste mit dem Zustand jedes Spielers und dem Timer ('elapsed' Sekunden).
+        Wird jedes Frame neu gezeichnet, ist aber nur ein schmaler Streifen; gibt ihn zurück.
+        """
+        screen = self.screen
+        font = self.font
+        width = screen.get_width()
+        bar = pygame.draw.rect(screen, GRAY, (0, 0, width, STATUS_BAR_HEIGHT))
+        x_pos = 10
+        for i, p in enumerate(players):
+            status = f"S{i+1}" if p.alive else "G/O"
+            txt = text_cache.render(font, status, p.color)
+            screen.blit(txt, (x_pos, 10))
+            x_pos += 150
+        # Timer (nach der Statusleiste, damit er nicht übermalt wird):
+        # fester Text aus dem Cache, die Sekunden aus dem Ziffern-Atlas
+        timer_label = text_cache.render(font, "Zeit: ", WHITE)
+        screen.blit(timer_label, (width - 200, 10))
+        self.timer_glyphs.draw(screen, f"{int(elapsed)}s", (width - 200 + timer_label.get_width(), 10))
+        return bar
+
+    def present(self, drawn_rects):
+        """
+        Überträgt das Frame an den Bildschirm. Was jetzt gezeichnet wurde ('drawn_rects'),
+        wird im nächsten Frame wieder aus der Trail-Ebene gelöscht.
+        """
+        if self.full_redraw or not self.dirty_rects:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.erase_rects + self.new_trail_rects + drawn_rects)
+        self.erase_rects = drawn_rects
+
+
+# --- Frame-Statistik (Render- und Simulationsrate getrennt) ---
+class FrameStats:
+    """
+    Zählt gezeichnete Frames und Simulations-Ticks und liefert pro Sekunde
+    die Bildrate, die Tickrate und die längste Frame-Zeit.
+    """
+    def __init__(self):
+        self.window_start = time.perf_counter()
+        self.frames = 0
+        self.ticks = 0
+        self.worst_frame = 0.0
+        self.render_fps = 0.0
+        self.sim_hz = 0.0
+        self.worst_frame_ms = 0.0
+
+    def add_tick(self):
+        self.ticks += 1
+
+    def add_frame(self, frame_time):
+        """Gibt True zurück, wenn ein neues Messfenster (1 s) abgeschlossen wurde."""
+        self.frames += 1
+        self.worst_frame = max(self.worst_frame, frame_time)
+        now = time.perf_counter()
+        window = now - self.window_start
+        if window >= 1.0:
+            self.render_fps = self.frames / window
+            self.sim_hz = self.ticks / window
+            self.worst_frame_ms = self.worst_frame * 1000
+            self.window_start = now
+            self.frames = 0
+            self.ticks = 0
+            self.worst_frame = 0.0
+            return True
+        return False
+
+    def text(self):
+        return f"FPS: {self.render_fps:.0f}  Sim: {self.sim_hz:.1f} Hz  max. Frame: {self.worst_frame_ms:.1f} ms"
+
+
 # --- Game-Loop (Zoom wird angewendet) ---
-def game_loop(players, speed, zoom):
+def game_loop(players, speed, zoom, seed=None, replay=None, host=None, simplify=False, world_scale=1.0,
+              decay=None):
+    """
+    Spielt ein Match und gibt den InputRecorder mit der Aufzeichnung zurück.
+    Mit 'replay' (ReplayRunner) wird stattdessen eine Aufzeichnung abgespielt:
+    Links/Rechts springen 10 Sekunden zurück/vor, Leertaste pausiert.
+    Mit 'host' (NetHost) bekommen die LAN-Clients nach jedem Tick den neuen Zustand.
+    Mit 'simplify' werden die Spuren als vereinfachte Linienzüge gespeichert (siehe GameState).
+    Mit 'world_scale' > 1 ist die Welt in jeder Richtung so viel größer als der Bildschirm;
+    die Kamera folgt dann dem ersten lokalen Spieler.
+    Mit 'decay' zerfallen die Spuren nach so vielen Punkten (siehe GameState).
+    """
     # Berechne die Weltgröße, die sich am Zoom-Faktor orientiert:
-    world_width = DESKTOP_W / zoom
-    world_height = DESKTOP_H / zoom
-    play_music("theme.mp3")
+    world_width = DESKTOP_W * world_scale / zoom
+    world_height = DESKTOP_H * world_scale / zoom
+    transition_music("theme.mp3", MUSIC_FADE_MS)
     screen = pygame.display.set_mode((DESKTOP_W, DESKTOP_H), pygame.FULLSCREEN)
     start_time = time.time()
     running = True
-    countdown(screen)
+    # Die eigentliche Simulation läuft im GameState (ohne pygame)
+    if replay is not None:
+        # Spieler, Zustand und Weltgröße kommen aus der Aufzeichnung
+        state = replay.state
+        players = replay.players
+        recorder = None
+    else:
+        state = GameState(players, world_width, world_height, zoom, seed=seed, simplify=simplify, decay=decay)
+        recorder = InputRecorder(players, seed, speed, world_width, world_height, zoom, simplify, decay)
+        if host is not None:
+            host.start(state, speed)
+    # Computergegner lenken vor jedem Tick; ihre Eingaben landen wie alle anderen in der Aufzeichnung
+    bots = None
+    if replay is None and any(p.control_type == "bot" for p in players):
+        bots = BotPlanner(state)
+    # Lenkeingaben mit Zeitstempeln; vor jedem Tick wird die gehaltene Zeit verrechnet
+    input_layer = InputLayer(players) if replay is None else None
+    paused = False
+    seek_to = None
+    # Bei eingeschaltetem Profiler misst die Simulation zusätzlich Drehung/Bewegung/Kollision
+    state.profiler = profiler
+    renderer = FrameRenderer(screen, players, state.world_width, state.world_height, zoom, font)
+    # Bei scrollender Kamera folgt sie dem ersten lokalen Spieler
+    follow = next((p for p in players if p.control_type in ("keyboard", "controller")), players[0])
+    
+    # Fester Zeitschritt: 'speed' Ticks pro Sekunde, gezeichnet wird mit der Bildwiederholrate
+    tick_time = 1.0 / speed
+    render_fps = get_refresh_rate()
+    accumulator = 0.0
+    last_time = time.perf_counter()
+    prev_heads = [(p.head[0], p.head[1]) for p in players]
+    stats = FrameStats()
+    show_stats = False
+    stats_line = stats.text()
+    # Countdown als zeitgesteuerter Zustand: Events und Musik laufen weiter, die Simulation wartet
+    countdown_end = time.perf_counter() + 3 * COUNTDOWN_STEP
     
     while running:
-        screen.fill(BLACK)
-        
         # Optional: Zeichne einen statischen Hintergrund oder einen Rahmen,
         # der immer den gesamten Bildschirm ausfüllt.
         # pygame.draw.rect(screen, DARK_GRAY, (0, 0, DESKTOP_W, 50))
@@ -572,130 +969,381 @@ def game_loop(players, speed, zoom):
         # pygame.draw.rect(screen, DARK_GRAY, (0, DESKTOP_H - 50, DESKTOP_W, 50))
         # pygame.draw.rect(screen, DARK_GRAY, (DESKTOP_W - 50, 0, 50, DESKTOP_H))
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
-            handle_input(event, players)
+        profiler.begin_frame()
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return recorder
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    show_stats = not show_stats
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    renderer.dirty_rects = not renderer.dirty_rects
+                    renderer.full_redraw = True
+                handle_profiler_keys(event)
+                if replay is None:
+                    input_layer.handle(event, time.perf_counter())
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_LEFT:
+                        seek_to = max(0, replay.tick - 10 * speed)
+                    elif event.key == pygame.K_RIGHT:
+                        seek_to = replay.tick + 10 * speed
+                    elif event.key == pygame.K_SPACE:
+                        paused = not paused
+            if host is not None:
+                host.poll()
+            audio.update()
         
-        # Aktualisiere Position und Kollisionsprüfung anhand der Weltgrenzen
-        for p in players:
-            if p.turn_left:
-                p.angle -= p.turn_speed
-            if p.turn_right:
-                p.angle += p.turn_speed
-            
-            # Aktualisiere die Bewegungsrichtung basierend auf dem Winkel
-            p.dx = BLOCK_SIZE * math.cos(p.angle)
-            p.dy = BLOCK_SIZE * math.sin(p.angle)
-            
-            p.update_position(world_width, world_height)
-            p.check_collision(players, zoom)  # Falls du hier den Zoom in der Kollisionsprüfung nutzen möchtest
+        if seek_to is not None:
+            # Rückwärts wird die Aufzeichnung neu aufgebaut und vorgespult, dann auch die Trail-Ebene
+            if replay.seek(seek_to):
+                state = replay.state
+                players = replay.players
+                follow = players[0]
+                renderer.rebuild(players)
+            prev_heads = [(p.head[0], p.head[1]) for p in players]
+            seek_to = None
         
-        elapsed = time.time() - start_time
-        timer_text = font.render(f"Zeit: {int(elapsed)}s", True, WHITE)
-        screen.blit(timer_text, (DESKTOP_W - 200, 10))
+        now = time.perf_counter()
+        if now < countdown_end:
+            with profiler.phase("countdown"):
+                draw_countdown(screen, countdown_end - now)
+                pygame.display.flip()
+            with profiler.phase("wait"):
+                clock.tick(render_fps)
+            profiler.end_frame()
+            # Die Simulationszeit beginnt erst nach dem Countdown
+            last_time = time.perf_counter()
+            renderer.full_redraw = True
+            continue
+        frame_time = now - last_time
+        last_time = now
+        accumulator += min(frame_time, MAX_FRAME_TIME)
+        if paused:
+            accumulator = 0.0
+        # So viele Simulations-Ticks ausführen, wie seit dem letzten Frame fällig sind
+        # (Drehung, Position und Kollisionsprüfung, Eingaben über die Spieler-Flags)
+        with profiler.phase("simulation"):
+            # Müssen mehrere Ticks nachgeholt werden, teilen sie sich das Rechenbudget der Bots
+            ticks_due = max(1, int(accumulator / tick_time))
+            # Beginn des ersten fälligen Ticks in Echtzeit (für die Verrechnung der Eingaben)
+            tick_start = now - accumulator
+            while accumulator >= tick_time:
+                for i, p in enumerate(players):
+                    prev_heads[i] = (p.head[0], p.head[1])
+                if replay is not None:
+                    if not replay.step():
+                        # Ende der Aufzeichnung: letztes Bild stehen lassen
+                        accumulator = 0.0
+                        break
+                else:
+                    input_layer.apply(tick_start, tick_start + tick_time)
+                    tick_start += tick_time
+                    if bots is not None:
+                        bots.update(TOTAL_BUDGET / ticks_due)
+                    recorder.record()
+                    state.step()
+                    if host is not None:
+                        host.broadcast()
+                stats.add_tick()
+                accumulator -= tick_time
+        # Anteil des angebrochenen Ticks für die Interpolation der Köpfe
+        alpha = accumulator / tick_time
+        
+        with profiler.phase("trails"):
+            focus = None
+            if renderer.camera.scrolls:
+                focus = interpolate_head(prev_heads[players.index(follow)], follow.head, alpha)
+            renderer.draw_trails(players, focus)
         
         # Zeichne alle Spielobjekte: Wandle Weltkoordinaten in Bildschirmkoordinaten um.
-        for p in players:
-            draw_snake_line(screen, p, zoom)
-            # Zeichne den Kopf als zusätzlichen Kreis
-            hx = int(p.head[0] * zoom)
-            hy = int(p.head[1] * zoom)
-            pygame.draw.circle(screen, p.color, (hx, hy), int(p.circle_size * zoom))
-        if p.head_image is not None:
-            # Optional: Skaliere das Bild entsprechend
-            head_img = pygame.transform.scale(p.head_image, (int(p.circle_size * 2 * zoom), int(p.circle_size * 2 * zoom)))
-            # Zentriere das Bild am Kopf
-            hx = int(p.head[0] * zoom) - head_img.get_width() // 2
-            hy = int(p.head[1] * zoom) - head_img.get_height() // 2
-            screen.blit(head_img, (hx, hy))
-        else:
-            hx = int(p.head[0] * zoom)
-            hy = int(p.head[1] * zoom)
-            pygame.draw.circle(screen, p.color, (hx, hy), int(p.circle_size * zoom))
-
+        with profiler.phase("heads"):
+            drawn_rects = renderer.draw_heads(players, prev_heads, alpha)
         
-        pygame.draw.rect(screen, GRAY, (0, 0, DESKTOP_W, 50))
-        x_pos = 10
-        for i, p in enumerate(players):
-            status = f"S{i+1}" if p.alive else "G/O"
-            txt = font.render(status, True, p.color)
-            screen.blit(txt, (x_pos, 10))
-            x_pos += 150
+        with profiler.phase("hud"):
+            if replay is not None:
+                elapsed = replay.tick / speed
+            else:
+                elapsed = time.time() - start_time
+            drawn_rects.append(renderer.draw_status_bar(players, elapsed))
+            
+            # Frame-Pacing-Statistik (F3)
+            # Der Text wird nur einmal pro Messfenster neu zusammengesetzt, damit er im Cache bleibt
+            if stats.add_frame(frame_time):
+                stats_line = f"{stats.text()}  Text-Cache: {text_cache.hits} Treffer / {text_cache.misses} Fehlgriffe"
+                if host is not None:
+                    stats_line += f"  {host.stats.text()}"
+                if input_layer is not None:
+                    stats_line += f"  {input_layer.latency_text()}"
+            if show_stats:
+                stats_text = text_cache.render(font, stats_line, WHITE)
+                drawn_rects.append(screen.blit(stats_text, (10, DESKTOP_H - 40)))
         
-        pygame.display.flip()
-        clock.tick(speed)
-
-
-def handle_input(event, players):
-    if event.type == pygame.KEYDOWN:
-        p = players[0]
-        if event.key == pygame.K_LEFT:
-            p.turn_left = True
-        elif event.key == pygame.K_RIGHT:
-            p.turn_right = True
-    elif event.type == pygame.KEYUP:
-        p = players[0]
-        if event.key == pygame.K_LEFT:
-            p.turn_left = False
-        elif event.key == pygame.K_RIGHT:
-            p.turn_right = False
-    if event.type == pygame.JOYBUTTONDOWN:
-        for p in players:
-            if p.controller and event.joy == p.controller.get_instance_id():
-                if event.button == 13:
-                    p.turn_left = True
-                    p.turn_right = False
-                elif event.button == 14:
-                    p.turn_right = True
-                    p.turn_left = False
-    if event.type == pygame.JOYBUTTONUP:
-        for p in players:
-            if p.controller and event.joy == p.controller.get_instance_id():
-                if event.button == 13:
-                    p.turn_left = False
-                elif event.button == 14:
-                    p.turn_right = False
-
-
-def countdown(screen):
-    for i in range(3, 0, -1):
-        screen.fill(BLACK)
-        text = large_font.render(str(i), True, WHITE)
-        screen.blit(text, (DESKTOP_W // 2 - 20, DESKTOP_H // 2 - 50))
-        pygame.display.flip()
-        time.sleep(1/3)  # ca. 0,33 Sekunden pro Zahl
+        # Profiler-Overlay (F5)
+        if profiler.enabled:
+            with profiler.phase("profiler"):
+                drawn_rects.append(profiler.draw_overlay(screen, small_font, text_cache))
+        
+        with profiler.phase("display"):
+            renderer.present(drawn_rects)
+            if input_layer is not None:
+                input_layer.presented(time.perf_counter())
+        with profiler.phase("wait"):
+            clock.tick(render_fps)
+        profiler.end_frame()
+    return recorder
 
 
-def end_screen(winner):
+def handle_profiler_keys(event):
+    """F5 schaltet den Frame-Profiler um, F6 speichert die bisherige Zeitleiste als Chrome-Trace."""
+    if event.type != pygame.KEYDOWN:
+        return
+    if event.key == pygame.K_F5:
+        profiler.toggle()
+    elif event.key == pygame.K_F6:
+        path = f"tron_trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        count = profiler.export_trace(path)
+        print(f"Trace mit {count} Ereignissen gespeichert: {path}")
+
+
+def client_loop(client):
+    """
+    Spielt als Client eines LAN-Hosts: schickt jedes Frame den Lenkzustand der Tastatur
+    und zeigt den Zustand, den der Host per Delta überträgt (simuliert wird nur dort).
+    """
     screen = pygame.display.set_mode((DESKTOP_W, DESKTOP_H), pygame.FULLSCREEN)
+    pygame.display.set_caption("Tron - Client")
+    render_fps = get_refresh_rate()
+    turn_left = turn_right = False
+    trail_layer = None
+    camera = None
+    match = None
+    show_stats = False
+    stats_line = client.stats.text()
+    next_stats = 0.0
     while True:
-        screen.fill(BLACK)
-        if winner:
-            text = large_font.render(f"Spieler {players.index(winner) + 1} gewinnt!", True, winner.color)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return
+                if event.key == pygame.K_LEFT:
+                    turn_left = True
+                elif event.key == pygame.K_RIGHT:
+                    turn_right = True
+                elif event.key == pygame.K_F3:
+                    show_stats = not show_stats
+            elif event.type == pygame.KEYUP:
+                if event.key == pygame.K_LEFT:
+                    turn_left = False
+                elif event.key == pygame.K_RIGHT:
+                    turn_right = False
+        client.poll()
+        client.send_input(turn_left, turn_right)
+        
+        players = client.players
+        if players is None:
+            screen.fill(BLACK)
+            if client.welcomed:
+                message = "Warte auf Spielstart..."
+            else:
+                message = f"Verbinde mit {client.host_addr[0]}:{client.host_addr[1]}..."
+            text = text_cache.render(large_font, message, WHITE)
+            screen.blit(text, text.get_rect(center=(DESKTOP_W // 2, DESKTOP_H // 2)))
         else:
-            text = large_font.render("Zeit abgelaufen!", True, WHITE)
-        screen.blit(text, (DESKTOP_W // 2 - 200, DESKTOP_H // 2 - 50))
-        txt2 = font.render("Drücke ESC für Startmenü", True, WHITE)
-        screen.blit(txt2, (DESKTOP_W // 2 - 150, DESKTOP_H // 2 + 50))
+            zoom = client.zoom
+            if client.match != match:
+                # Neues Match: Trail-Ebene für die neuen Spieler aufbauen
+                match = client.match
+                camera = Camera(screen.get_size(), client.world_width, client.world_height, zoom)
+                trail_layer = TrailLayer(screen.get_size(), zoom)
+                if not camera.scrolls:
+                    trail_layer.rebuild(players)
+            if camera.scrolls:
+                # Größere Welt als der Bildschirm: die Kamera folgt dem eigenen Spieler
+                camera.follow(*players[client.me].head)
+                screen.fill(BLACK)
+                for view in camera.views():
+                    for p in players:
+                        draw_snake_line(screen, p, zoom, view)
+            else:
+                trail_layer.update(players)
+                screen.blit(trail_layer.surface, (0, 0))
+            for p in players:
+                if camera.scrolls:
+                    positions = camera.to_screen(p.head[0], p.head[1], p.circle_size * 2)
+                else:
+                    positions = [(int(p.head[0] * zoom), int(p.head[1] * zoom))]
+                for pos in positions:
+                    pygame.draw.circle(screen, p.color, pos, int(p.circle_size * zoom))
+            pygame.draw.rect(screen, GRAY, (0, 0, DESKTOP_W, STATUS_BAR_HEIGHT))
+            x_pos = 10
+            for i, p in enumerate(players):
+                status = f"S{i+1}" if p.alive else "G/O"
+                if i == client.me:
+                    status += " (du)"
+                screen.blit(text_cache.render(font, status, p.color), (x_pos, 10))
+                x_pos += 150
+            if client.speed and client.tick >= 0:
+                timer = text_cache.render(font, f"Zeit: {client.tick // client.speed}s", WHITE)
+                screen.blit(timer, (DESKTOP_W - 200, 10))
+        
+        # Netzwerk-Statistik (F3), einmal pro Sekunde neu zusammengesetzt
+        if show_stats:
+            now = time.perf_counter()
+            if now >= next_stats:
+                stats_line = client.stats.text(client.speed)
+                next_stats = now + 1.0
+            screen.blit(text_cache.render(font, stats_line, WHITE), (10, DESKTOP_H - 40))
         pygame.display.flip()
-        for event in pygame.event.get():
+        clock.tick(render_fps)
+
+
+def draw_countdown(screen, remaining):
+    """
+    Zeichnet den Countdown (3, 2, 1) für die verbleibende Zeit in Sekunden.
+    Jede Zahl steht ca. 0,33 Sekunden; der Game-Loop läuft währenddessen weiter.
+    """
+    screen.fill(BLACK)
+    number = min(3, int(remaining / COUNTDOWN_STEP) + 1)
+    text = text_cache.render(large_font, str(number), WHITE)
+    screen.blit(text, (DESKTOP_W // 2 - 20, DESKTOP_H // 2 - 50))
+
+
+def end_screen(winner, players):
+    screen = pygame.display.set_mode((DESKTOP_W, DESKTOP_H), pygame.FULLSCREEN)
+    background = pygame.Surface(screen.get_size())
+    background.fill(BLACK)
+    tree = WidgetTree(background)
+    if winner:
+        tree.add(Label(large_font, f"Spieler {players.index(winner) + 1} gewinnt!", winner.color,
+                       topleft=(DESKTOP_W // 2 - 200, DESKTOP_H // 2 - 50)))
+    else:
+        tree.add(Label(large_font, "Zeit abgelaufen!", WHITE, topleft=(DESKTOP_W // 2 - 200, DESKTOP_H // 2 - 50)))
+    tree.add(Label(font, "Drücke ESC für Startmenü", WHITE, topleft=(DESKTOP_W // 2 - 150, DESKTOP_H // 2 + 50)))
+    while True:
+        audio.update()
+        # Der Bildschirm ändert sich nicht: nur beim ersten Mal (oder nach VIDEOEXPOSE) zeichnen
+        if tree.render(screen) is None:
+            pygame.display.flip()
+        for event in wait_events(POLL_MS if audio.pending else IDLE_MS):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return
+            if event.type == pygame.VIDEOEXPOSE:
+                tree.invalidate()
+
+
+def init_subsystems():
+    """
+    Startet nur die Subsysteme, die für das Menü sofort nötig sind (Display und Schriften).
+    Mixer und Joysticks folgen bei der ersten Benutzung.
+    """
+    global DESKTOP_W, DESKTOP_H, font, large_font, button_font, small_font
+    with startup.phase("display"):
+        pygame.display.init()
+        info = pygame.display.Info()
+        DESKTOP_W, DESKTOP_H = info.current_w, info.current_h
+    with startup.phase("fonts"):
+        font = load_font("Arial", 30)
+        large_font = load_font("Arial", 50)
+        button_font = load_font("Arial", int(50 * 0.8))
+        small_font = load_font("Arial", 18)
 
 
 # --- Hauptprogramm ---
-while True:
-    res = start_screen()
-    if res is not None:
-        players, speed, snake_width, zoom, turn_speed = res
-        players = init_players(players, snake_width, turn_speed)
-        game_loop(players, speed, zoom)
-    else:
-        pygame.display.quit()
-        exit()
\ No newline at end of file
+def main(argv=None):
+    global DIRTY_RECTS
+    parser = argparse.ArgumentParser(description="Tron")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Zeit bis zum ersten Menü-Frame und Dauer der Init-Phasen ausgeben")
+    parser.add_argument("--full-flip", action="store_true",
+                        help="Im Spiel immer den ganzen Bildschirm übertragen statt nur geänderter Bereiche")
+    parser.add_argument("--profile", action="store_true",
+                        help="Frame-Profiler von Anfang an einschalten (sonst mit F5)")
+    parser.add_argument("--trace", metavar="DATEI",
+                        help="Profiler einschalten und die Zeitleiste beim Beenden als Chrome-Trace speichern")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Fester Seed für alle Matches (Startaufstellung und Lücken)")
+    parser.add_argument("--record-dir", default="replays",
+                        help="Ordner für die Aufzeichnungen der Matches")
+    parser.add_argument("--no-record", action="store_true", help="Matches nicht aufzeichnen")
+    parser.add_argument("--replay", metavar="DATEI", help="Aufzeichnung abspielen statt zu spielen")
+    parser.add_argument("--seek", type=int, default=0, help="Bei --replay direkt zu diesem Tick springen")
+    parser.add_argument("--host", type=int, nargs="?", const=PORT, default=None, metavar="PORT",
+                        help=f"Als LAN-Host spielen (Standard-Port {PORT}); Clients melden sich im Startmenü an")
+    parser.add_argument("--join", metavar="HOST[:PORT]", help="Als Client bei einem LAN-Host mitspielen")
+    parser.add_argument("--net-loss", type=float, default=0.0,
+                        help="Zum Testen: Anteil ausgehender Pakete, die verworfen werden (0 bis 1)")
+    parser.add_argument("--net-delay", type=float, default=0.0,
+                        help="Zum Testen: Verzögerung ausgehender Pakete in Sekunden")
+    parser.add_argument("--simplify", action="store_true",
+                        help="Spuren als vereinfachte Linienzüge speichern (nicht mit --host)")
+    parser.add_argument("--world-scale", type=float, default=1.0,
+                        help="Welt in jeder Richtung so viel größer als der Bildschirm (die Kamera folgt dem Spieler)")
+    parser.add_argument("--decay", type=int, nargs="?", const=DECAY_LENGTH, default=None, metavar="PUNKTE",
+                        help=f"Spuren zerfallen nach PUNKTE Punkten (Standard {DECAY_LENGTH}; "
+                             "nicht mit --host oder --simplify)")
+    args = parser.parse_args(argv)
+    startup.report = args.startup_report
+    DIRTY_RECTS = not args.full_flip
+    profiler.enabled = args.profile or args.trace is not None
+
+    init_subsystems()
+    if args.join:
+        client = NetClient(parse_address(args.join), Endpoint(loss=args.net_loss, delay=args.net_delay))
+        client_loop(client)
+        client.close()
+        pygame.quit()
+        return
+    if args.decay is not None and (args.simplify or args.decay < 1):
+        parser.error("--decay braucht eine Länge ab 1 und unvereinfachte Spuren (ohne --simplify)")
+    host = None
+    if args.host is not None:
+        if args.simplify:
+            # Die STATE-Pakete übertragen nur neu angehängte Trail-Punkte
+            parser.error("--simplify kann nicht mit --host kombiniert werden")
+        if args.decay is not None:
+            # Ebenso: abgelaufene Punkte würden bei den Clients nie entfernt
+            parser.error("--decay kann nicht mit --host kombiniert werden")
+        if max(DESKTOP_W, DESKTOP_H) * args.world_scale / MIN_ZOOM > MAX_WORLD_SIZE:
+            # Koordinaten werden als uint16 in 1/QUANT Pixel übertragen, größere würden abgeschnitten
+            parser.error(f"--world-scale {args.world_scale:g} ist mit --host zu groß: Die Welt darf "
+                         f"höchstens {MAX_WORLD_SIZE} Pixel breit und hoch sein")
+        host = NetHost(endpoint=Endpoint(("0.0.0.0", args.host), args.net_loss, args.net_delay))
+    if args.replay:
+        recording = Recording.load(args.replay)
+        replay = ReplayRunner(recording, COLORS)
+        replay.seek(args.seek)
+        game_loop(replay.players, recording.speed, recording.zoom, replay=replay)
+        pygame.quit()
+        return
+    while True:
+        players, speed, snake_width, zoom, turn_speed = start_screen(host)
+        if players is None:
+            break
+        seed = args.seed if args.seed is not None else random.getrandbits(32)
+        players = init_players(players, snake_width, turn_speed, seed, args.world_scale)
+        recorder = game_loop(players, speed, zoom, seed, host=host, simplify=args.simplify,
+                             world_scale=args.world_scale, decay=args.decay)
+        if host is not None:
+            host.stop()
+        if recorder is not None and not args.no_record:
+            os.makedirs(args.record_dir, exist_ok=True)
+            path = os.path.join(args.record_dir, f"tron_{time.strftime('%Y%m%d_%H%M%S')}.otr")
+            recorder.recording.save(path)
+            print(f"Match aufgezeichnet ({recorder.recording.ticks} Ticks, Seed {seed}): {path}")
+    if host is not None:
+        host.close()
+    pygame.quit()
+    if args.trace:
+        count = profiler.export_trace(args.trace)
+        print(f"Trace mit {count} Ereignissen gespeichert: {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""
+Widgets für Startmenü und Endbildschirm (Retained Mode).
+
+Die Widgets bleiben zwischen den Frames erhalten und merken sich mit 'dirty', ob sie
+sich seit dem letzten Zeichnen verändert haben. Der WidgetTree zeichnet nur die
+Bereiche neu, in denen sich etwas geändert hat (Hintergrund wiederherstellen, dann
+alle Widgets, die den Bereich berühren, in ihrer Reihenfolge), und gibt diese Bereiche
+für pygame.display.update() zurück.
+
+Die Bildschirme warten mit wait_events() blockierend auf Eingaben. Nur solange eine
+Animation läuft (Blinken eines Buttons, Pulsieren eines Kopfes), wird im Frame-Takt
+aufgewacht; im Leerlauf braucht das Menü so praktisch keine Rechenzeit.
+"""
+import math
+import time
+
+import pygame
+
+from tron_resources import text_cache
+
+WHITE = (255, 255, 255)
+# Wartezeit zwischen zwei Animations-Frames in Millisekunden
+ANIMATION_FRAME_MS = 16
+# Wartezeit, wenn nur etwas abgefragt werden muss (Musik lädt, Netzwerk-Host)
+POLL_MS = 50
+# Wartezeit im Leerlauf
+IDLE_MS = 1000
+
+
+def wait_events(timeout_ms):
+    """
+    Blockiert, bis ein Event kommt oder 'timeout_ms' vergangen sind, und gibt alle
+    anstehenden Events zurück (bei Zeitablauf eine leere Liste).
+    """
+    event = pygame.event.wait(timeout_ms)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    return events
+
+
+class Widget:
+    """Basisklasse: ein Element mit Bildschirmbereich, das sich bei Änderungen als 'dirty' markiert."""
+    def __init__(self):
+        self.dirty = True
+
+    def bounds(self):
+        """Bereich, den das Widget beim Zeichnen höchstens berührt."""
+        return self.rect
+
+    def update(self, now):
+        """Schreitet Animationen fort; gibt True zurück, solange eine Animation läuft."""
+        return False
+
+    def handle_event(self, event):
+        pass
+
+    def draw(self, surface):
+        pass
+
+
+class Label(Widget):
+    """Ein Text, zentriert um 'center' oder mit der linken oberen Ecke bei 'topleft'."""
+    def __init__(self, font, text, color, center=None, topleft=None):
+        super().__init__()
+        self.font = font
+        self.center = center
+        self.topleft = topleft
+        self.text = None
+        self.color = None
+        self.set_text(text, color)
+
+    def set_text(self, text, color=None):
+        """Ändert Text oder Farbe; neu gezeichnet wird nur, wenn sich etwas geändert hat."""
+        color = self.color if color is None else color
+        if text == self.text and color == self.color:
+            return
+        self.text = text
+        self.color = color
+        self.surface = text_cache.render(self.font, text, color)
+        if self.center is not None:
+            self.rect = self.surface.get_rect(center=self.center)
+        else:
+            self.rect = self.surface.get_rect(topleft=self.topleft)
+        self.dirty = True
+
+    def draw(self, surface):
+        surface.blit(self.surface, self.rect)
+
+
+# --- Button (für diskrete Einstellungen) ---
+class Button(Widget):
+    def __init__(self, rect, normal_bg, normal_text_color, blink_bg, blink_text_color, text, callback,
+                 font=None, blink_duration=0.2):
+        super().__init__()
+        self.rect = pygame.Rect(rect)
+        self.normal_bg = normal_bg
+        self.normal_text_color = normal_text_color
+        self.blink_bg = blink_bg
+        self.blink_text_color = blink_text_color
+        self.text = text
+        self.callback = callback
+        self.font = font
+        self.blink_duration = blink_duration
+        self.is_blinking = False
+        self.blink_start_time = 0
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.rect.collidepoint(event.pos):
+                self.is_blinking = True
+                self.blink_start_time = time.time()
+                self.dirty = True
+                if self.callback:
+                    self.callback()
+
+    def update(self, now):
+        if self.is_blinking and (now - self.blink_start_time > self.blink_duration):
+            self.is_blinking = False
+            self.dirty = True
+        return self.is_blinking
+
+    def draw(self, surface):
+        bg = self.blink_bg if self.is_blinking else self.normal_bg
+        text_color = self.blink_text_color if self.is_blinking else self.normal_text_color
+        pygame.draw.rect(surface, bg, self.rect)
+        pygame.draw.rect(surface, WHITE, self.rect, 3)  # Weiße Umrandung
+        text_surf = text_cache.render(self.font, self.text, text_color)
+        text_rect = text_surf.get_rect(center=self.rect.center)
+        surface.blit(text_surf, text_rect)
+
+
+# --- Slider (für kontinuierliche Einstellungen, z. B. Zoom) ---
+class Slider(Widget):
+    def __init__(self, rect, min_value, max_value, initial_value, track_color, knob_color):
+        super().__init__()
+        self.rect = pygame.Rect(rect)  # Der Schienenbereich
+        self.min_value = min_value
+        self.max_value = max_value
+        self.value = initial_value
+        self.track_color = track_color
+        self.knob_color = knob_color
+        self.knob_radius = self.rect.height // 2
+        self.dragging = False
+
+    def bounds(self):
+        # Der Knopf ragt an den Enden um seinen Radius über die Schiene hinaus
+        return self.rect.inflate(self.knob_radius * 2 + 2, 0)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.get_knob_rect().collidepoint(event.pos):
+                self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            rel_x = event.pos[0] - self.rect.x
+            rel_x = max(0, min(self.rect.width, rel_x))
+            fraction = rel_x / self.rect.width
+            value = self.min_value + fraction * (self.max_value - self.min_value)
+            if value != self.value:
+                self.value = value
+                self.dirty = True
+
+    def get_knob_rect(self):
+        fraction = (self.value - self.min_value) / (self.max_value - self.min_value)
+        knob_x = self.rect.x + fraction * self.rect.width
+        knob_rect = pygame.Rect(0, 0, self.knob_radius * 2, self.knob_radius * 2)
+        knob_rect.center = (int(knob_x), self.rect.centery)
+        return knob_rect
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, self.track_color, self.rect)
+        knob_rect = self.get_knob_rect()
+        pygame.draw.ellipse(surface, self.knob_color, knob_rect)
+        pygame.draw.ellipse(surface, WHITE, knob_rect, 2)
+
+
+class HeadMarker(Widget):
+    """
+    Startposition eines Spielers im Menü. Nach der Bestätigung (player.highlighted)
+    pulsiert eine Sekunde lang ein weißer Kreis um den Kopf.
+    """
+    PULSE_DURATION = 1
+
+    def __init__(self, player):
+        super().__init__()
+        self.player = player
+        self.pos = None
+        self.pulse = None
+
+    def bounds(self):
+        # Der Puls wird höchstens 1,5-mal so groß wie der Kopf
+        r = int(self.player.circle_size * 1.5) + 1
+        x, y = self.pos
+        return pygame.Rect(x - r, y - r, 2 * r + 1, 2 * r + 1)
+
+    def update(self, now):
+        p = self.player
+        pos = (int(p.trail[0][0]), int(p.trail[0][1]))
+        if pos != self.pos:
+            # Neu verteilte Startpositionen (Spieler hinzugefügt oder entfernt)
+            self.pos = pos
+            self.dirty = True
+        pulse = None
+        if p.highlighted:
+            elapsed = now - p.highlight_start_time
+            if elapsed < self.PULSE_DURATION:
+                pulse = int(p.circle_size * (1 + 0.5 * math.sin(elapsed * 10)))
+            else:
+                p.highlighted = False
+        if pulse != self.pulse:
+            self.pulse = pulse
+            self.dirty = True
+        return pulse is not None
+
+    def draw(self, surface):
+        if self.pulse is not None:
+            pygame.draw.circle(surface, WHITE, self.pos, self.pulse)
+        pygame.draw.circle(surface, self.player.color, self.pos, self.player.circle_size)
+
+
+class WidgetTree:
+    """
+    Die Widgets eines Bildschirms in Zeichenreihenfolge über einem festen Hintergrund.
+    render() zeichnet nur geänderte Bereiche neu.
+    """
+    def __init__(self, background):
+        self.background = background
+        self.widgets = []
+        self.drawn = {}  # Widget -> zuletzt gezeichneter Bereich
+        self.damage = []  # Bereiche, die neu gezeichnet werden müssen
+        self.full = True
+
+    def add(self, widget, index=None):
+        """Fügt ein Widget hinzu, oben auf oder an Position 'index' der Zeichenreihenfolge."""
+        if index is None:
+            self.widgets.append(widget)
+        else:
+            self.widgets.insert(index, widget)
+        widget.dirty = True
+        return widget
+
+    def remove(self, widget):
+        self.widgets.remove(widget)
+        rect = self.drawn.pop(widget, None)
+        if rect is not None:
+            self.damage.append(rect)
+
+    def invalidate(self):
+        """Beim nächsten render() den ganzen Bildschirm neu zeichnen."""
+        self.full = True
+
+    def handle_event(self, event):
+        for widget in self.widgets:
+            widget.handle_event(event)
+
+    def update(self, now):
+        """Schreitet alle Animationen fort; True, solange mindestens eine läuft."""
+        animating = False
+        for widget in self.widgets:
+            if widget.update(now):
+                animating = True
+        return animating
+
+    def render(self, surface):
+        """
+        Zeichnet alle geänderten Bereiche neu. Gibt die Liste der Bereiche für
+        pygame.display.update() zurück oder None, wenn alles neu gezeichnet wurde
+        (dann pygame.display.flip()).
+        """
+        if self.full:
+            surface.blit(self.background, (0, 0))
+            for widget in self.widgets:
+                widget.draw(surface)
+                widget.dirty = False
+                self.drawn[widget] = widget.bounds()
+            self.full = False
+            self.damage = []
+            return None
+        damage = self.damage
+        for widget in self.widgets:
+            if widget.dirty:
+                old = self.drawn.get(widget)
+                if old is not None:
+                    damage.append(old)
+                new = widget.bounds()
+                damage.append(new)
+                self.drawn[widget] = new
+                widget.dirty = False
+        if not damage:
+            return []
+        # Überlappende Bereiche zusammenfassen, damit nichts doppelt gezeichnet wird
+        rects = []
+        for rect in damage:
+            rect = pygame.Rect(rect)
+            i = rect.collidelist(rects)
+            while i != -1:
+                rect.union_ip(rects.pop(i))
+                i = rect.collidelist(rects)
+            rects.append(rect)
+        clip = surface.get_clip()
+        for rect in rects:
+            surface.set_clip(rect)
+            surface.blit(self.background, rect, rect)
+            for widget in self.widgets:
+                if self.drawn[widget].colliderect(rect):
+                    widget.draw(surface)
+        surface.set_clip(clip)
+        self.damage = []
+        return rects